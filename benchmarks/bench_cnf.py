@@ -0,0 +1,98 @@
+"""Benchmark of the distributive CNF conversion of large constraints.
+
+Run it from the repository root, e.g. before and after a change to flamapy.core.models.ast::
+
+    python benchmarks/bench_cnf.py --terms 2000 --repeat 5
+
+(or ``python -m benchmarks.bench_cnf``); the script puts the repository on ``sys.path``, so
+flamapy need not be installed.
+
+The "recursive" column is the conversion that ``distribute_clauses`` replaced (see
+``recursive_cnf.py``), with its slowdown relative to ``get_clauses``. It is timed
+``--baseline-repeat`` times, since it takes seconds on some constraints; ``0`` skips it. With
+2,000 terms it took 30 ms, 67 ms and 10.3 s on the three constraints, against 6 ms, 13 ms and
+8 ms for ``get_clauses``.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+# Importable without installing flamapy, or from any directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from flamapy.core.models.ast import (
+    AST,
+    ASTOperation,
+    Node,
+    convert_into_cnf,
+    get_clauses,
+)
+from flamapy.core.models.cnf import int_cnf
+
+from benchmarks.recursive_cnf import recursive_clauses
+
+
+def wide_disjunction(terms: int) -> AST:
+    """F0 v F1 v ... (left-nested, as tools generate them)."""
+    node = Node("F0")
+    for i in range(1, terms):
+        node = Node(ASTOperation.OR, node, Node(f"F{i}"))
+    return AST(node)
+
+
+def implication_chain(terms: int) -> AST:
+    """(F0 => F1) ∧ (F1 => F2) ∧ ..."""
+    node = Node(ASTOperation.IMPLIES, Node("F0"), Node("F1"))
+    for i in range(1, terms - 1):
+        implication = Node(ASTOperation.IMPLIES, Node(f"F{i}"), Node(f"F{i + 1}"))
+        node = Node(ASTOperation.AND, node, implication)
+    return AST(node)
+
+
+def excludes_group(terms: int) -> AST:
+    """!(F0 ∧ (F1 v F2 v ...)): one exclusion against a wide group."""
+    group = wide_disjunction(terms - 1).root
+    return AST(Node(ASTOperation.NOT, Node(ASTOperation.AND, Node("G"), group)))
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terms", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline-repeat", type=int, default=1)
+    args = parser.parse_args()
+    # The recursive baseline needs a deep stack for wide constraints.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20 * args.terms))
+
+    for name, build in (("wide disjunction", wide_disjunction),
+                        ("implication chain", implication_chain),
+                        ("negated group", excludes_group)):
+        ast = build(args.terms)
+        clauses = best_of(args.repeat, ast.get_clauses)
+        integers = best_of(args.repeat, lambda ast=ast: int_cnf(ast))
+        tree = best_of(args.repeat, lambda ast=ast: get_clauses(convert_into_cnf(ast)))
+        line = (f"{name:18} {args.terms:6d} terms   get_clauses {clauses * 1000:9.2f} ms"
+                f"   int_cnf {integers * 1000:9.2f} ms   to tree and back {tree * 1000:9.2f} ms")
+        if args.baseline_repeat > 0:
+            if recursive_clauses(ast) != ast.get_clauses():
+                raise AssertionError(f"{name}: the conversions disagree")
+            baseline = best_of(args.baseline_repeat, lambda ast=ast: recursive_clauses(ast))
+            line += f"   recursive {baseline * 1000:9.2f} ms ({baseline / clauses:.0f}x)"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""The recursive distributive CNF conversion that ``distribute_clauses`` replaced.
+
+Kept here as the comparison point of ``bench_cnf.py``, unchanged but for the names and for
+``_to_cnf``, which rewrote the operands of OR nodes in place and now keeps them in locals (nodes
+are immutable). It needs a deep recursion limit on wide constraints.
+"""
+from typing import Any
+
+from flamapy.core.models.ast import AST, ASTOperation, Node
+
+
+def recursive_clauses(ast: AST) -> list[list[Any]]:
+    """Clauses of ``ast`` as ``AST.get_clauses()`` computed them before the iterative pass."""
+    ast = _simplify_formula(ast)
+    ast = _propagate_negation(ast.root)
+    return _get_clauses(_to_cnf(ast))
+
+
+def _simplify_formula(ast: AST) -> AST:
+    logic_op = ast.root.data
+    left = ast.root.left
+    right = ast.root.right
+    if logic_op in (ASTOperation.REQUIRES, ASTOperation.IMPLIES):
+        left = _simplify_formula(AST(left)).root
+        right = _simplify_formula(AST(right)).root
+        result = AST.create_binary_operation(ASTOperation.OR, Node(ASTOperation.NOT, left), right)
+    elif logic_op == ASTOperation.EXCLUDES:
+        left = _simplify_formula(AST(left)).root
+        right = _simplify_formula(AST(right)).root
+        result = AST.create_binary_operation(
+            ASTOperation.OR, Node(ASTOperation.NOT, left), Node(ASTOperation.NOT, right)
+        )
+    elif logic_op == ASTOperation.EQUIVALENCE:
+        new_left = _simplify_formula(
+            AST.create_binary_operation(ASTOperation.IMPLIES, left, right)
+        ).root
+        new_right = _simplify_formula(
+            AST.create_binary_operation(ASTOperation.IMPLIES, right, left)
+        ).root
+        result = AST.create_binary_operation(ASTOperation.AND, new_left, new_right)
+    elif logic_op == ASTOperation.XOR:
+        new_left = _simplify_formula(
+            AST.create_binary_operation(ASTOperation.AND, left, Node(ASTOperation.NOT, right))
+        ).root
+        new_right = _simplify_formula(
+            AST.create_binary_operation(ASTOperation.AND, Node(ASTOperation.NOT, left), right)
+        ).root
+        result = AST.create_binary_operation(ASTOperation.OR, new_left, new_right)
+    elif logic_op in (ASTOperation.AND, ASTOperation.OR):
+        left = _simplify_formula(AST(left)).root
+        right = _simplify_formula(AST(right)).root
+        result = AST.create_binary_operation(logic_op, left, right)
+    elif logic_op == ASTOperation.NOT:
+        left = _simplify_formula(AST(left)).root
+        result = AST.create_unary_operation(ASTOperation.NOT, left)
+    else:
+        result = ast
+    return result
+
+
+def _to_cnf(formula: AST) -> AST:
+    res = formula
+    node = formula.root
+    if node.data == ASTOperation.AND:
+        res = AST.create_binary_operation(
+            ASTOperation.AND, _to_cnf(AST(node.left)).root, _to_cnf(AST(node.right)).root
+        )
+    elif node.data == ASTOperation.OR:
+        left = _to_cnf(AST(node.left)).root
+        right = _to_cnf(AST(node.right)).root
+        if left.data == ASTOperation.AND:
+            res = AST.create_binary_operation(
+                ASTOperation.AND,
+                AST.create_binary_operation(ASTOperation.OR, left.left, right).root,
+                AST.create_binary_operation(ASTOperation.OR, left.right, right).root,
+            )
+            res = _to_cnf(res)
+        elif right.data == ASTOperation.AND:
+            res = AST.create_binary_operation(
+                ASTOperation.AND,
+                AST.create_binary_operation(ASTOperation.OR, left, right.left).root,
+                AST.create_binary_operation(ASTOperation.OR, left, right.right).root,
+            )
+            res = _to_cnf(res)
+        else:
+            res = AST.create_binary_operation(ASTOperation.OR, left, right)
+    return res
+
+
+def _propagate_negation(node: Node, negated: bool = False) -> AST:
+    if node.data == ASTOperation.NOT:
+        return _propagate_negation(node.left, not negated)
+    if node.data in (ASTOperation.AND, ASTOperation.OR):
+        operation = node.data
+        if negated:
+            operation = ASTOperation.OR if operation == ASTOperation.AND else ASTOperation.AND
+        return AST.create_binary_operation(
+            operation,
+            _propagate_negation(node.left, negated).root,
+            _propagate_negation(node.right, negated).root,
+        )
+    if negated:
+        return AST.create_unary_operation(ASTOperation.NOT, node)
+    return AST(node)
+
+
+def _get_clauses(ast: AST) -> list[list[Any]]:
+    node = ast.root
+    result = []
+    if node.is_term():
+        result = [[node.data]]
+    elif node.data == ASTOperation.NOT:
+        result = [["-" + node.left.data]]
+    elif node.data == ASTOperation.OR:
+        result = [_get_clause_from_or_node(node)]
+    elif node.data == ASTOperation.AND:
+        result.extend(_get_clauses(AST(node.left)))
+        result.extend(_get_clauses(AST(node.right)))
+    return result
+
+
+def _get_clause_from_or_node(node: Node) -> list[Any]:
+    clause = []
+    if node.left.is_op() and node.left.data == ASTOperation.OR:
+        clause.extend(_get_clause_from_or_node(node.left))
+    else:
+        clause.append(node.left.data if node.left.is_term() else f"-{node.left.left.data}")
+    if node.right.is_op() and node.right.data == ASTOperation.OR:
+        clause.extend(_get_clause_from_or_node(node.right))
+    else:
+        clause.append(node.right.data if node.right.is_term() else f"-{node.right.left.data}")
+    return clause
@@ -28,6 +28,8 @@ if not PLUGIN_PATHS:
 
 
 # Create symbolic link
+# Plugins that register through the "flamapy.plugins" entry point group are discovered from their
+# installed metadata and do not need to be linked here.
 
 CORE_PLUGIN_DIRECTORY = "flamapy/metamodels/"
 if not os.path.exists(CORE_PLUGIN_DIRECTORY):
@@ -0,0 +1,223 @@
+"""Asyncio facade over :class:`DiscoverMetamodels`.
+
+Analyses are CPU bound and would block the event loop, so :class:`AsyncDiscoverMetamodels`
+runs them on an executor: the loop's default thread pool, a given thread pool (sharing this
+process' registry) or a process pool (whose workers use their own registry, see
+:func:`flamapy.core.batch.worker_discover`; arguments and results must then be picklable).
+
+Every call accepts a ``timeout`` and can be cancelled like any coroutine. Cancelling (or timing
+out) stops waiting at once and drops calls that have not started yet. An analysis that is
+already running on a thread is given a :class:`CancellationToken` with the same timeout, which
+is cancelled along with the call, so it stops at its next cancellation check (see
+:mod:`flamapy.core.cancellation`). On a process pool only the timeout reaches the analysis: an
+explicitly cancelled call runs to its end (or its timeout) in the worker.
+
+The number of analyses in flight per backend (plugin) is limited with semaphores, so a burst
+of requests for one slow solver does not take every worker. An analysis keeps its slot until it
+has actually stopped running, even if its call was cancelled earlier.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Mapping, Optional
+
+from flamapy.core.batch import worker_discover
+from flamapy.core.cancellation import CancellationToken
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.models import VariabilityModel
+
+
+def _call_in_worker(method: str, *args: Any, **kwargs: Any) -> Any:
+    return getattr(worker_discover(), method)(*args, **kwargs)
+
+
+class _Slot:
+    """A backend slot held by an analysis until it has run, or until it is dropped unstarted.
+
+    ``release`` is called exactly once, from the event loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, release: Callable[[], None]) -> None:
+        self._loop = loop
+        self._release = release
+        self._lock = threading.Lock()
+        self._state = "pending"  # then "running" and "done", or "dropped"
+
+    def run(self, function: Callable[[], Any]) -> Any:
+        """Run ``function`` in a worker thread, unless the call was abandoned meanwhile."""
+        with self._lock:
+            if self._state == "dropped":
+                return None
+            self._state = "running"
+        try:
+            return function()
+        finally:
+            self._state = "done"
+            self._give_back()
+
+    def abandon(self) -> None:
+        """The call was cancelled: give the slot back now if the analysis has not started."""
+        with self._lock:
+            if self._state != "pending":
+                return
+            self._state = "dropped"
+        self._release()
+
+    def release_when_done(self, future: "Future[Any]") -> None:
+        """Give the slot back when ``future`` (of a process pool) finishes or is cancelled."""
+        future.add_done_callback(lambda _: self._give_back())
+
+    def _give_back(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # the event loop is closed: there is nobody left to give the slot to
+
+
+class AsyncDiscoverMetamodels:
+    """Async counterparts of the ``DiscoverMetamodels`` analysis and transformation methods.
+
+    ``max_in_flight`` bounds the concurrent analyses per backend, ``backend_limits`` overrides
+    it for specific plugins, and ``timeout`` is the default timeout (seconds) of every call.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        discover: Optional[DiscoverMetamodels] = None,
+        executor: Optional[Executor] = None,
+        max_in_flight: int = 4,
+        backend_limits: Optional[Mapping[str, int]] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.discover = discover if discover is not None else DiscoverMetamodels()
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.backend_limits = dict(backend_limits or {})
+        self.timeout = timeout
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._running: dict[str, int] = {}
+
+    def _semaphore(self, backend: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(backend)
+        if semaphore is None:
+            limit = self.backend_limits.get(backend, self.max_in_flight)
+            semaphore = self._semaphores[backend] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def _offload(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        function: Callable[[], Any]
+        if isinstance(self.executor, ProcessPoolExecutor):
+            function = functools.partial(_call_in_worker, method, *args, **kwargs)
+        else:
+            function = functools.partial(getattr(self.discover, method), *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+    async def _analyse(
+        self,
+        method: str,
+        backend: str,
+        timeout: Optional[float],
+        *args: Any,
+    ) -> Any:
+        timeout = self._timeout(timeout)
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(backend)
+        slot: Optional[_Slot] = None
+        token: Optional[CancellationToken] = None
+        future: Optional[Future[Any]] = None
+
+        def release() -> None:
+            self._running[backend] -= 1
+            semaphore.release()
+
+        async def limited() -> Any:
+            nonlocal slot, token, future
+            await semaphore.acquire()
+            self._running[backend] = self._running.get(backend, 0) + 1
+            slot = _Slot(loop, release)
+            if isinstance(self.executor, ProcessPoolExecutor):
+                # A token cannot reach another process: the worker only gets the timeout.
+                future = self.executor.submit(_call_in_worker, method, *args, timeout=timeout)
+                slot.release_when_done(future)
+                return await asyncio.wrap_future(future)
+            token = CancellationToken(timeout)
+            function = functools.partial(
+                getattr(self.discover, method), *args, cancellation=token
+            )
+            return await loop.run_in_executor(self.executor, slot.run, function)
+
+        try:
+            return await asyncio.wait_for(limited(), timeout)
+        except BaseException:  # cancelled, timed out, or could not be submitted
+            if token is not None:
+                token.cancel()
+            if future is not None:
+                future.cancel()
+            elif slot is not None:
+                slot.abandon()
+            raise
+
+    async def use_operation_from_file(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        operation_name: str,
+        file: str,
+        plugin_name: Optional[str] = None,
+        configuration_file: Optional[str] = None,
+        is_full: Optional[bool] = False,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        backend = self.discover.resolve_plugin(operation_name, file, plugin_name).name
+        return await self._analyse(
+            "use_operation_from_file", backend, timeout,
+            operation_name, file, plugin_name, configuration_file, is_full,
+        )
+
+    async def use_operation_from_vm(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        operation_name: str,
+        vm_orig: VariabilityModel,
+        plugin_name: Optional[str] = None,
+        configuration_file: Optional[str] = None,
+        is_full: Optional[bool] = False,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        backend = self.discover.resolve_plugin(operation_name, vm_orig, plugin_name).name
+        return await self._analyse(
+            "use_operation_from_vm", backend, timeout,
+            operation_name, vm_orig, plugin_name, configuration_file, is_full,
+        )
+
+    async def use_transformation_t2m(
+        self, src: str, dst: str, timeout: Optional[float] = None
+    ) -> VariabilityModel:
+        model: VariabilityModel = await asyncio.wait_for(
+            self._offload("use_transformation_t2m", src, dst), self._timeout(timeout)
+        )
+        return model
+
+    async def use_transformation_m2t(
+        self, src: VariabilityModel, dst: str, timeout: Optional[float] = None
+    ) -> str:
+        text: str = await asyncio.wait_for(
+            self._offload("use_transformation_m2t", src, dst), self._timeout(timeout)
+        )
+        return text
+
+    async def use_transformation_m2m(
+        self, src: VariabilityModel, dst: str, timeout: Optional[float] = None
+    ) -> VariabilityModel:
+        model: VariabilityModel = await asyncio.wait_for(
+            self._offload("use_transformation_m2m", src, dst), self._timeout(timeout)
+        )
+        return model
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return timeout if timeout is not None else self.timeout
+
+    def in_flight(self) -> dict[str, int]:
+        """Analyses currently running (not waiting) per backend."""
+        return {backend: count for backend, count in self._running.items() if count}
+
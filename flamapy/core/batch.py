@@ -0,0 +1,426 @@
+"""Batch analysis of model corpora on a pool of worker processes.
+
+:func:`run_batch` fans ``(file, operation, inputs)`` jobs out to a ``ProcessPoolExecutor``.
+Every worker discovers the plugins once, when it starts, and then runs chunks of jobs through
+``DiscoverMetamodels.use_operation_from_file``. Results are streamed back in job order or as
+they complete. A job that fails, times out, or crashes its worker process (e.g. in a native
+solver) is reported as an error; the rest of the batch goes on.
+
+The module is also a command line tool::
+
+    python -m flamapy.core.batch DeadFeatures models/*.uvl --workers 8 --timeout 60
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from multiprocessing.context import BaseContext
+from types import FrameType
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.exceptions import OperationTimeout
+
+
+LOGGER = logging.getLogger("batch")
+
+# Exit code of a worker killed because a job overran its timeout.
+TIMEOUT_EXIT_CODE = 124
+
+
+@dataclass(frozen=True)
+class Job:
+    """An operation to run on a model file, with the inputs of ``use_operation_from_file``."""
+
+    file: str
+    operation: str
+    plugin_name: Optional[str] = None
+    configuration_file: Optional[str] = None
+    is_full: bool = False
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job: its result, or the error that prevented it."""
+
+    job: Job
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    # The result pickled by the worker, so that sending it back does not serialise it again.
+    _payload: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        payload = self._payload
+        if payload is None:
+            payload = pickle.dumps(self.result, protocol=pickle.HIGHEST_PROTOCOL)
+        return (_unpickle_job_result, (self.job, payload, self.error, self.elapsed))
+
+
+def _unpickle_job_result(job: Job, payload: bytes, error: Optional[str],
+                         elapsed: float) -> JobResult:
+    return JobResult(job, pickle.loads(payload), error, elapsed)
+
+
+# State of a worker process: its DiscoverMetamodels, created once by _init_worker.
+_WORKER: dict[str, DiscoverMetamodels] = {}
+
+
+def set_worker_discover(discover: DiscoverMetamodels) -> None:
+    """Registry used by :func:`run_chunk` in this process (and in processes forked from it)."""
+    _WORKER["discover"] = discover
+
+
+def worker_discover() -> DiscoverMetamodels:
+    """Registry of this process, discovering the plugins on first use if none was set."""
+    if "discover" not in _WORKER:
+        set_worker_discover(DiscoverMetamodels())
+    return _WORKER["discover"]
+
+
+def _init_worker(manifest_path: Optional[str]) -> None:
+    set_worker_discover(DiscoverMetamodels(manifest_path))
+
+
+def _raise_timeout(signum: int, frame: Optional[FrameType]) -> None:
+    raise OperationTimeout()
+
+
+def _run_job(
+    discover: DiscoverMetamodels,
+    job: Job,
+    timeout: Optional[float],
+    kill_grace: Optional[float],
+) -> JobResult:
+    """Run a job, stopping it after ``timeout`` seconds.
+
+    The operation is given the timeout cooperatively (see :mod:`flamapy.core.cancellation`)
+    and, for code that does not poll it, SIGALRM raises OperationTimeout (POSIX only) between
+    Python bytecodes. A call into native code that still has not returned ``kill_grace``
+    seconds later is ended by exiting the worker process.
+    """
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    watchdog = None
+    start = time.perf_counter()
+    try:
+        if timeout is not None:
+            if use_alarm:
+                signal.signal(signal.SIGALRM, _raise_timeout)
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            if kill_grace is not None:
+                watchdog = threading.Timer(timeout + kill_grace, os._exit, (TIMEOUT_EXIT_CODE,))
+                watchdog.daemon = True
+                watchdog.start()
+        result = discover.use_operation_from_file(
+            job.operation, job.file, job.plugin_name, job.configuration_file, job.is_full,
+            timeout=timeout,
+        )
+        job_result = JobResult(job, result, elapsed=time.perf_counter() - start)
+        # Pickled here, once, so that an unpicklable result only fails its own job.
+        job_result._payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        return job_result
+    except OperationTimeout:
+        return JobResult(job, error=f"Timed out after {timeout}s",
+                         elapsed=time.perf_counter() - start)
+    except Exception as exception:  # pylint: disable=broad-except
+        return JobResult(job, error=f"{type(exception).__name__}: {exception}",
+                         elapsed=time.perf_counter() - start)
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def run_chunk(
+    jobs: Sequence[Job],
+    timeout: Optional[float],
+    kill_grace: Optional[float] = None,
+    progress: Optional[str] = None,
+) -> list[JobResult]:
+    """Run jobs in the current worker process, see :func:`set_worker_discover`.
+
+    With ``kill_grace``, a job still running that long after its timeout ends the process.
+    ``progress`` is a file created when the chunk starts, to which every result is appended
+    as soon as it is known, so the results survive a crash of the process.
+    """
+    discover = worker_discover()
+    results = []
+    # pylint: disable-next=consider-using-with
+    log: Any = open(progress, "ab") if progress else nullcontext()
+    with log:
+        for job in jobs:
+            result = _run_job(discover, job, timeout, kill_grace)
+            results.append(result)
+            if progress:
+                pickle.dump(result, log)
+                log.flush()
+    return results
+
+
+def _read_progress(path: str) -> Optional[list[JobResult]]:
+    """Results in the progress file of a chunk, None if the chunk never started."""
+    try:
+        log: IO[bytes] = open(path, "rb")  # pylint: disable=consider-using-with
+    except FileNotFoundError:
+        return None
+    results = []
+    with log:
+        while True:
+            try:
+                results.append(pickle.load(log))
+            except (EOFError, pickle.UnpicklingError, ValueError):
+                break  # the end, or a result cut short by the crash
+    os.remove(path)
+    return results
+
+
+def spawn_executor(
+    max_workers: int,
+    manifest_path: Optional[str] = None,
+    mp_context: Optional[BaseContext] = None,
+) -> ProcessPoolExecutor:
+    """A process pool whose workers discover the plugins once, when they start."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(manifest_path,),
+    )
+
+
+def _chunks(jobs: Iterable[Job], chunksize: int) -> Iterator[list[tuple[int, Job]]]:
+    chunk: list[tuple[int, Job]] = []
+    for index, job in enumerate(jobs):
+        chunk.append((index, job))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BatchRunner:
+    """Runs jobs on a pool of worker processes that discover the plugins once.
+
+    At most one chunk per worker is in flight. Workers append every result to a progress file
+    of their chunk, so when a worker crashes and breaks the pool, the results that were already
+    computed are recovered from those files. Only the jobs that were running at the time (one
+    per started chunk) are run again one by one on a single worker, to find the one that
+    crashed, which is reported as failed; the remaining jobs of the chunks are resubmitted to a
+    fresh pool.
+    """
+
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        max_workers: Optional[int] = None,
+        chunksize: int = 8,
+        timeout: Optional[float] = None,
+        manifest_path: Optional[str] = None,
+        mp_context: Optional[BaseContext] = None,
+        *,
+        executor_factory: Optional[Callable[[int], ProcessPoolExecutor]] = None,
+        kill_grace: Optional[float] = 5.0,
+    ) -> None:
+        """``executor_factory`` builds the pools (given their number of workers) instead of
+        spawning workers that discover the plugins themselves, e.g.
+        :meth:`flamapy.core.zygote.WarmWorkerPool.executor`. A job still running
+        ``kill_grace`` seconds after its timeout is killed with its worker (None: never).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        self.timeout = timeout
+        self.manifest_path = manifest_path
+        self.mp_context = mp_context
+        self.executor_factory = executor_factory
+        self.kill_grace = kill_grace
+
+    def _executor(self, max_workers: int) -> ProcessPoolExecutor:
+        if self.executor_factory is not None:
+            return self.executor_factory(max_workers)
+        return spawn_executor(max_workers, self.manifest_path, self.mp_context)
+
+    def run(self, jobs: Iterable[Job], ordered: bool = True) -> Iterator[JobResult]:
+        """Results of the jobs, in job order or as they complete."""
+        results = self._run_unordered(jobs)
+        if not ordered:
+            yield from (result for _, result in results)
+            return
+        pending: dict[int, JobResult] = {}
+        next_index = 0
+        for index, result in results:
+            pending[index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+
+    def _submit(
+        self, executor: ProcessPoolExecutor, chunk: list[tuple[int, Job]], progress_dir: str
+    ) -> Future[list[JobResult]]:
+        progress = os.path.join(progress_dir, str(chunk[0][0]))
+        try:
+            return executor.submit(run_chunk, [job for _, job in chunk], self.timeout,
+                                   self.kill_grace, progress)
+        except BrokenProcessPool as exception:
+            future: Future[list[JobResult]] = Future()
+            future.set_exception(exception)
+            return future
+
+    def _run_unordered(self, jobs: Iterable[Job]) -> Iterator[tuple[int, JobResult]]:
+        chunks = _chunks(jobs, self.chunksize)
+        retry: deque[list[tuple[int, Job]]] = deque()
+        executor = self._executor(self.max_workers)
+        in_flight: dict[Future[list[JobResult]], list[tuple[int, Job]]] = {}
+        with tempfile.TemporaryDirectory(prefix="flamapy-batch-",
+                                         ignore_cleanup_errors=True) as progress_dir:
+            try:
+                while True:
+                    while len(in_flight) < self.max_workers:
+                        chunk = retry.popleft() if retry else next(chunks, None)
+                        if chunk is None:
+                            break
+                        in_flight[self._submit(executor, chunk, progress_dir)] = chunk
+                    if not in_flight:
+                        return
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    broken: list[list[tuple[int, Job]]] = []
+                    for future in done:
+                        chunk = in_flight.pop(future)
+                        try:
+                            yield from zip((index for index, _ in chunk), future.result())
+                        except BrokenProcessPool:
+                            broken.append(chunk)
+                    if broken:
+                        broken.extend(in_flight.values())
+                        in_flight.clear()
+                        # The workers are gone once the pool has shut down: the progress
+                        # files are complete.
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        recovered, suspects, resubmit = _triage(broken, progress_dir)
+                        yield from recovered
+                        LOGGER.warning("A worker crashed; isolating %d jobs", len(suspects))
+                        yield from self._isolate(suspects)
+                        retry.extend(resubmit)
+                        executor = self._executor(self.max_workers)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _isolate(self, jobs: list[tuple[int, Job]]) -> Iterator[tuple[int, JobResult]]:
+        """Run jobs one at a time on a single worker; a crash can only be the running job's."""
+        executor: Optional[ProcessPoolExecutor] = None
+        try:
+            for index, job in jobs:
+                start = time.perf_counter()
+                try:
+                    if executor is None:
+                        executor = self._executor(1)
+                        # Start the worker first, so that its startup is not timed with the job.
+                        executor.submit(os.getpid).result()
+                        start = time.perf_counter()
+                    [result] = executor.submit(
+                        run_chunk, [job], self.timeout, self.kill_grace
+                    ).result()
+                except BrokenProcessPool:
+                    elapsed = time.perf_counter() - start
+                    if self.timeout is not None and elapsed >= self.timeout:
+                        error = f"Timed out after {self.timeout}s; the worker was killed"
+                    else:
+                        error = "The worker process crashed"
+                    result = JobResult(job, error=error, elapsed=elapsed)
+                    if executor is not None:
+                        executor.shutdown(wait=False)
+                    executor = None
+                yield index, result
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _triage(
+    broken: list[list[tuple[int, Job]]], progress_dir: str
+) -> tuple[list[tuple[int, JobResult]], list[tuple[int, Job]], list[list[tuple[int, Job]]]]:
+    """Split the chunks of a broken pool into the results their progress files recovered, the
+    jobs that were running when it broke (one of them crashed), and the jobs still to run.
+    """
+    recovered: list[tuple[int, JobResult]] = []
+    suspects: list[tuple[int, Job]] = []
+    resubmit: list[list[tuple[int, Job]]] = []
+    for chunk in sorted(broken, key=lambda chunk: chunk[0][0]):
+        done = _read_progress(os.path.join(progress_dir, str(chunk[0][0])))
+        if done is None:  # never started
+            resubmit.append(chunk)
+            continue
+        recovered.extend(zip((index for index, _ in chunk), done))
+        rest = chunk[len(done):]
+        if rest:
+            suspects.append(rest[0])
+            if rest[1:]:
+                resubmit.append(rest[1:])
+    if not suspects and resubmit:
+        # No job was running: the worker crashed outside of them (e.g. when starting).
+        suspects = [item for chunk in resubmit for item in chunk]
+        resubmit = []
+    return recovered, suspects, resubmit
+
+
+def run_batch(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    jobs: Iterable[Job],
+    *,
+    max_workers: Optional[int] = None,
+    chunksize: int = 8,
+    timeout: Optional[float] = None,
+    ordered: bool = True,
+    manifest_path: Optional[str] = None,
+) -> Iterator[JobResult]:
+    """Run the jobs on a process pool; see :class:`BatchRunner`."""
+    runner = BatchRunner(max_workers, chunksize, timeout, manifest_path)
+    return runner.run(jobs, ordered)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m flamapy.core.batch",
+        description="Run an operation over many model files; prints one JSON line per file.",
+    )
+    parser.add_argument("operation")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--plugin", help="plugin (backend) to run the operation with")
+    parser.add_argument("--configuration", help="configuration file for the operation")
+    parser.add_argument("--full", action="store_true", help="the configuration is full")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPUs)")
+    parser.add_argument("--chunksize", type=int, default=8, help="jobs sent to a worker at once")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per job")
+    parser.add_argument("--unordered", action="store_true",
+                        help="print results as they complete")
+    args = parser.parse_args(argv)
+
+    jobs = (Job(file, args.operation, args.plugin, args.configuration, args.full)
+            for file in args.files)
+    failures = 0
+    results = run_batch(jobs, max_workers=args.workers, chunksize=args.chunksize,
+                        timeout=args.timeout, ordered=not args.unordered)
+    for job_result in results:
+        failures += not job_result.ok
+        line = {**asdict(job_result.job), "result": job_result.result,
+                "error": job_result.error, "elapsed": job_result.elapsed}
+        print(json.dumps(line, default=str), flush=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Result buffers that spill to disk beyond a memory budget.
+
+Enumerating operations (e.g. ``Configurations``) accumulate their results in memory; on models
+with millions of products the process runs out of memory before the operation finishes. A
+:class:`ResultBuffer` keeps the items in a list until their approximate size (see
+:func:`flamapy.core.cache.approximate_size`) exceeds its memory budget, then moves them to a
+temporary file of pickles and appends the following items there. The file is read through a
+memory map and an index of item offsets, so the buffer is still a random-access sequence while
+only the items being read are materialised.
+"""
+import mmap
+import pickle
+import tempfile
+from array import array
+from collections.abc import Sequence
+from typing import IO, Any, Iterable, Iterator, Optional, Union, overload
+
+from flamapy.core.cache import approximate_size
+from flamapy.core.config import RESULT_BUFFER_DIR, RESULT_BUFFER_MAX_BYTES
+
+
+# Number of items whose size is measured; the following ones are assumed to have their mean.
+SIZE_SAMPLE = 64
+
+
+class ResultBuffer(Sequence[Any]):
+    """An append-only sequence of picklable items, spilled to disk beyond ``memory_budget``.
+
+    ``memory_budget`` is in bytes (None: never spill); ``directory`` holds the spill file
+    (default: the system temporary directory). The file is deleted on :meth:`close`, when the
+    buffer is collected, or when the process exits. A pickled buffer becomes a plain list.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        memory_budget: Optional[int] = None,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self._items: list[Any] = []
+        self._bytes = 0
+        self._measured = 0
+        self._file: Optional[IO[bytes]] = None
+        self._offsets = array("q", [0])  # start of each spilled item, and end of the last one
+        self._map: Optional[mmap.mmap] = None
+        self.extend(items)
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def append(self, item: Any) -> None:
+        if self._file is not None:
+            self._write(item)
+            return
+        self._items.append(item)
+        if self.memory_budget is None:
+            return
+        if self._measured < SIZE_SAMPLE:
+            self._measured += 1
+            self._bytes += approximate_size(item)
+        else:
+            self._bytes += self._bytes // self._measured
+        if self._bytes > self.memory_budget:
+            self._spill()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def _spill(self) -> None:
+        # pylint: disable-next=consider-using-with
+        self._file = tempfile.TemporaryFile(prefix="flamapy-results-", dir=self.directory)
+        items, self._items = self._items, []
+        for item in items:
+            self._write(item)
+
+    def _write(self, item: Any) -> None:
+        assert self._file is not None
+        data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+    def _mapped(self) -> mmap.mmap:
+        assert self._file is not None
+        end = self._offsets[-1]
+        if self._map is None or len(self._map) < end:
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), end, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _load(self, index: int) -> Any:
+        return pickle.loads(self._mapped()[self._offsets[index]:self._offsets[index + 1]])
+
+    def __len__(self) -> int:
+        if self._file is not None:
+            return len(self._offsets) - 1
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if self._file is None:
+            return self._items[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultBuffer index out of range")
+        return self._load(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._file is None:
+            yield from self._items
+        else:
+            for index in range(len(self)):
+                yield self._load(index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ResultBuffer, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+    def __repr__(self) -> str:
+        where = "on disk" if self.spilled else "in memory"
+        return f"ResultBuffer({len(self)} items {where})"
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "items": len(self),
+            "spilled": self.spilled,
+            "memory_bytes": self._bytes if not self.spilled else 0,
+            "disk_bytes": self._offsets[-1],
+        }
+
+    def close(self) -> None:
+        """Delete the spill file; the buffer is empty afterwards."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._items = []
+        self._bytes = self._measured = 0
+        self._offsets = array("q", [0])
+
+    def __enter__(self) -> "ResultBuffer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def collect(items: Iterable[Any], memory_budget: Optional[int] = None) -> Sequence[Any]:
+    """The items in a list or, with a memory budget (default: the configured one), in a
+    :class:`ResultBuffer`.
+    """
+    budget = memory_budget if memory_budget is not None else RESULT_BUFFER_MAX_BYTES
+    if budget is None:
+        return list(items)
+    return ResultBuffer(items, budget, RESULT_BUFFER_DIR)
+
@@ -0,0 +1,380 @@
+"""Bounded in-memory caches for transformation results and parsed model files.
+
+:class:`LRUCache` is a thread-safe least-recently-used cache bounded both by number of entries
+and by an approximate memory budget, with hit/miss statistics. :data:`M2M_CACHE` keeps the
+results of model-to-model transformations so that running several operations on the same model
+does not rebuild its solver representations every time. It is disabled by default (models are
+mutable, and a cached result assumes its source model is not modified afterwards without a
+call to ``invalidate_fingerprint()``); enable it with :func:`configure_m2m_cache` or the
+``FLAMAPY_M2M_CACHE_ENTRIES`` and ``FLAMAPY_M2M_CACHE_BYTES`` environment variables.
+
+:data:`PARSE_CACHE` does the same for text-to-model transformations: models (and configurations)
+read from the same unchanged file are parsed once. It is disabled by default as well; enable it
+with :func:`configure_parse_cache` or ``FLAMAPY_PARSE_CACHE_ENTRIES``.
+
+:class:`ResultCache` keeps the results of operations run through ``DiscoverMetamodels``, keyed
+by model fingerprint, operation, backend and inputs, with an optional time to live.
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from stat import S_ISREG
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Hashable, Optional, cast
+
+from flamapy.core.config import (
+    M2M_CACHE_MAX_BYTES,
+    M2M_CACHE_MAX_ENTRIES,
+    PARSE_CACHE_MAX_BYTES,
+    PARSE_CACHE_MAX_ENTRIES,
+    PARSE_CACHE_VERIFY_CONTENT,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL,
+)
+from flamapy.core.models import VariabilityModel
+
+
+def approximate_size(obj: Any, max_objects: int = 100_000) -> int:
+    """Approximate deep size in bytes of ``obj`` (containers, instance dicts and slots).
+
+    Objects managed outside the Python heap (e.g. native solver state) are not accounted for.
+    The traversal stops after ``max_objects`` objects to bound its cost on huge models.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    size = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, ModuleType, FunctionType)):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current, 0)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return size
+
+
+def content_hash(path: str) -> str:
+    """sha256 of the content of the file ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entries and by approximate size in bytes.
+
+    ``max_entries=0`` disables the cache; ``max_bytes=None`` means no memory bound.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = approximate_size,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def configure(self, max_entries: int, max_bytes: Optional[int] = None) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._discard(key)
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def keys(self) -> list[Hashable]:
+        """Keys from the least to the most recently used."""
+        with self._lock:
+            return list(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+        }
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+
+class TransformationCache(LRUCache):
+    """Results of m2m transformations keyed by source model fingerprint and transformation.
+
+    Models with the default fingerprint are told apart by instance; models whose plugin hashes
+    their content (e.g. configurations) share the results of equal models.
+    """
+
+    @staticmethod
+    def key(transformation: Any, model: VariabilityModel) -> Hashable:
+        name = getattr(transformation, "qualified_name", None) or (
+            f"{transformation.__module__}.{transformation.__qualname__}"
+        )
+        return (model.fingerprint(), name)
+
+    def lookup(self, transformation: Any, model: VariabilityModel) -> Optional[VariabilityModel]:
+        if not self.enabled:
+            return None
+        return cast(Optional[VariabilityModel], self.get(self.key(transformation, model)))
+
+    def store(self, transformation: Any, model: VariabilityModel, result: Any) -> None:
+        if self.enabled:
+            self.put(self.key(transformation, model), result)
+
+    def transform(self, transformation: Any, model: VariabilityModel) -> Any:
+        """Result of ``transformation(model).transform()``, from the cache when possible."""
+        result = self.lookup(transformation, model)
+        if result is None:
+            result = transformation(model).transform()
+            self.store(transformation, model, result)
+        return result
+
+
+M2M_CACHE = TransformationCache(
+    max_entries=M2M_CACHE_MAX_ENTRIES,
+    max_bytes=M2M_CACHE_MAX_BYTES,
+)
+
+
+def configure_m2m_cache(max_entries: int, max_bytes: Optional[int] = None) -> None:
+    """Resize the shared m2m transformation cache; ``max_entries=0`` disables it."""
+    M2M_CACHE.configure(max_entries, max_bytes)
+
+
+class ParseCache(LRUCache):
+    """Models parsed by t2m transformations keyed by file path and transformation.
+
+    An entry is valid while the file keeps its modification time and size; with
+    ``verify_content`` the sha256 of the file must match as well, which catches rewrites that
+    preserve both (and survives a mere ``touch``). Paths that are not regular files are never
+    cached.
+    """
+
+    def __init__(self, *args: Any, verify_content: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.verify_content = verify_content
+
+    @staticmethod
+    def key(transformation: Any, path: str) -> Hashable:
+        name = getattr(transformation, "qualified_name", None) or (
+            f"{transformation.__module__}.{transformation.__qualname__}"
+        )
+        return (os.path.abspath(path), name)
+
+    def _stamp(self, path: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size) if S_ISREG(stat.st_mode) else None
+
+    def lookup(self, transformation: Any, path: str) -> Optional[VariabilityModel]:
+        if not self.enabled:
+            return None
+        stamp = self._stamp(path)
+        key = self.key(transformation, path)
+        entry = self.get(key) if stamp is not None else None
+        if entry is None:
+            return None
+        cached_stamp, digest, model = entry
+        if self.verify_content:
+            if digest is None or digest != content_hash(path):
+                self.invalidate(key)
+                return None
+        elif cached_stamp != stamp:
+            self.invalidate(key)
+            return None
+        return cast(VariabilityModel, model)
+
+    def store(self, transformation: Any, path: str, model: VariabilityModel) -> None:
+        stamp = self._stamp(path)
+        if not self.enabled or stamp is None:
+            return
+        digest = content_hash(path) if self.verify_content else None
+        self.put(self.key(transformation, path), (stamp, digest, model))
+
+    def transform(self, transformation: Any, path: str) -> VariabilityModel:
+        """Result of ``transformation(path).transform()``, from the cache when possible."""
+        model = self.lookup(transformation, path)
+        if model is None:
+            model = transformation(path).transform()
+            self.store(transformation, path, model)
+        return model
+
+    def invalidate_file(self, path: str) -> None:
+        """Drop the models parsed from ``path`` by any transformation."""
+        path = os.path.abspath(path)
+        self.invalidate_where(lambda key: isinstance(key, tuple) and key[0] == path)
+
+
+def _sizeof_parse_entry(entry: tuple[Any, Any, VariabilityModel]) -> int:
+    return approximate_size(entry[2])
+
+
+PARSE_CACHE = ParseCache(
+    max_entries=PARSE_CACHE_MAX_ENTRIES,
+    max_bytes=PARSE_CACHE_MAX_BYTES,
+    sizeof=_sizeof_parse_entry,
+    verify_content=PARSE_CACHE_VERIFY_CONTENT,
+)
+
+
+def configure_parse_cache(
+    max_entries: int, max_bytes: Optional[int] = None, verify_content: bool = False
+) -> None:
+    """Resize the shared t2m parse cache; ``max_entries=0`` disables it."""
+    PARSE_CACHE.configure(max_entries, max_bytes)
+    PARSE_CACHE.verify_content = verify_content
+
+
+def normalize_input(value: Any) -> Hashable:
+    """Hashable, order-independent form of an operation input (models by fingerprint)."""
+    if isinstance(value, VariabilityModel):
+        return ("model", value.fingerprint())
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(k), normalize_input(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(repr(normalize_input(v)) for v in value)))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_input(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return cast(Hashable, value)
+
+
+class ResultCache(LRUCache):
+    """Results of operations keyed by model, operation, backend and inputs.
+
+    ``ttl`` (seconds) bounds how long a result stays valid; None keeps results until evicted.
+    Cached results are returned as they are, so callers must not modify them.
+    """
+
+    def __init__(self, *args: Any, ttl: Optional[float] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.ttl = ttl
+        self.expirations = 0
+
+    @staticmethod
+    def key(
+        model_key: str,
+        operation: str,
+        backend: Optional[str],
+        inputs: Optional[dict[str, Any]] = None,
+    ) -> Hashable:
+        return (model_key, operation, backend, normalize_input(inputs or {}))
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """(True, result) on a hit, (False, None) on a miss (results may well be None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, result = entry[0]
+                if expires is not None and expires <= time.monotonic():
+                    self._discard(key)
+                    self.expirations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, result
+
+    def store(self, key: Hashable, result: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self.put(key, (expires, result))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**super().get_stats(), "expirations": self.expirations}
+
+
+def default_result_cache() -> ResultCache:
+    """A result cache sized by ``FLAMAPY_RESULT_CACHE_ENTRIES`` and ``FLAMAPY_RESULT_CACHE_TTL``."""
+    return ResultCache(
+        max_entries=RESULT_CACHE_MAX_ENTRIES,
+        ttl=RESULT_CACHE_TTL,
+        sizeof=lambda entry: approximate_size(entry[1]),
+    )
@@ -0,0 +1,103 @@
+"""Cooperative cancellation and timeouts for operations.
+
+An :class:`Operation` cannot be interrupted from outside while it runs. Instead, it carries a
+:class:`CancellationToken` (see ``Operation.set_cancellation``/``set_timeout``) that backends
+poll in their inner loops through ``Operation.check_cancelled()``: once the token's deadline
+passes it raises :class:`OperationTimeout`, and once it is cancelled explicitly (from another
+thread, e.g. when a request is abandoned) :class:`OperationCancelled`.
+
+Code that never polls, such as a long call into a native solver, can only be stopped by
+killing the process running it: :func:`call_with_hard_timeout` runs a function in a forked
+subprocess and kills it if it has not finished some grace time after its timeout.
+"""
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional
+
+from flamapy.core.exceptions import OperationCancelled, OperationTimeout
+
+
+class CancellationToken:
+    """A deadline (monotonic clock) that can also be cancelled explicitly; thread-safe."""
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (None if there is none)."""
+        return max(0.0, self.deadline - time.monotonic()) if self.deadline is not None else None
+
+    def check(self) -> None:
+        """Raise OperationCancelled or OperationTimeout if the work must stop."""
+        if self._cancelled.is_set():
+            raise OperationCancelled()
+        if self.expired:
+            raise OperationTimeout(f"Timed out after {self.timeout}s")
+
+
+def _subprocess_main(
+    connection: Connection, function: Callable[..., Any], args: tuple[Any, ...]
+) -> None:
+    try:
+        connection.send((True, function(*args)))
+    except Exception as exception:  # pylint: disable=broad-except
+        connection.send((False, exception))
+    finally:
+        connection.close()
+
+
+def call_with_hard_timeout(
+    function: Callable[..., Any],
+    *args: Any,
+    timeout: float,
+    grace: float = 1.0,
+) -> Any:
+    """Run ``function(*args)`` in a forked subprocess and return its result.
+
+    The function should stop by itself at ``timeout`` (e.g. through an operation's
+    ``set_timeout``); if it is still running ``grace`` seconds later, the subprocess is killed
+    and OperationTimeout is raised. Exceptions raised by the function are re-raised here.
+    Arguments and results must be picklable.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context("fork").Process(
+        target=_subprocess_main, args=(sender, function, args), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout + grace):
+            raise OperationTimeout(f"Killed after {timeout}s (+{grace}s grace)")
+        try:
+            succeeded, value = receiver.recv()
+        except EOFError as exception:
+            process.join(grace)
+            raise OperationCancelled(
+                f"The subprocess died (exit code {process.exitcode})"
+            ) from exception
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.terminate()
+            process.join(grace)
+            if process.is_alive():
+                process.kill()
+        process.join()
+    if not succeeded:
+        raise value
+    return value
@@ -1,3 +1,43 @@
+import os
+from typing import Optional
+
+
 PLUGIN_PATHS = [
     "flamapy.metamodels",
 ]
+
+# Entry point group through which installed distributions register their plugins.
+PLUGIN_ENTRY_POINT_GROUP = "flamapy.plugins"
+
+# File where DiscoverMetamodels persists its discovery manifest (see flamapy.core.manifest).
+# When unset, every start walks and imports the whole plugin tree.
+DISCOVERY_MANIFEST: Optional[str] = os.environ.get("FLAMAPY_DISCOVERY_MANIFEST") or None
+
+# Bounds of the shared m2m transformation cache (see flamapy.core.cache); 0 entries disables it.
+M2M_CACHE_MAX_ENTRIES = int(os.environ.get("FLAMAPY_M2M_CACHE_ENTRIES", "0"))
+M2M_CACHE_MAX_BYTES: Optional[int] = int(os.environ["FLAMAPY_M2M_CACHE_BYTES"]) if (
+    os.environ.get("FLAMAPY_M2M_CACHE_BYTES")
+) else None
+
+# Bounds of the shared t2m parse cache (see flamapy.core.cache); 0 entries disables it. With
+# FLAMAPY_PARSE_CACHE_VERIFY=1 cached models are also validated against the file's sha256.
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("FLAMAPY_PARSE_CACHE_ENTRIES", "0"))
+PARSE_CACHE_MAX_BYTES: Optional[int] = int(os.environ["FLAMAPY_PARSE_CACHE_BYTES"]) if (
+    os.environ.get("FLAMAPY_PARSE_CACHE_BYTES")
+) else None
+PARSE_CACHE_VERIFY_CONTENT = os.environ.get("FLAMAPY_PARSE_CACHE_VERIFY", "0") == "1"
+
+# Default bounds of the operation result cache of DiscoverMetamodels (see flamapy.core.cache);
+# 0 entries disables it. The TTL is in seconds; unset keeps results until evicted.
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("FLAMAPY_RESULT_CACHE_ENTRIES", "0"))
+RESULT_CACHE_TTL: Optional[float] = float(os.environ["FLAMAPY_RESULT_CACHE_TTL"]) if (
+    os.environ.get("FLAMAPY_RESULT_CACHE_TTL")
+) else None
+
+# Memory budget (bytes) beyond which enumerated results (e.g. all the configurations of a model)
+# spill to a temporary file in FLAMAPY_RESULT_BUFFER_DIR (see flamapy.core.buffers); unset keeps
+# them in memory.
+RESULT_BUFFER_MAX_BYTES: Optional[int] = int(os.environ["FLAMAPY_RESULT_BUFFER_BYTES"]) if (
+    os.environ.get("FLAMAPY_RESULT_BUFFER_BYTES")
+) else None
+RESULT_BUFFER_DIR: Optional[str] = os.environ.get("FLAMAPY_RESULT_BUFFER_DIR") or None
@@ -1,22 +1,52 @@
+import copy
 import inspect
 import logging
+import os
+import time
 from importlib import import_module
+from itertools import islice
+from importlib.metadata import entry_points
 from pkgutil import iter_modules
 from types import ModuleType
-from typing import Any, Optional, Protocol, Type, runtime_checkable, cast
-
-from flamapy.core.config import PLUGIN_PATHS
+from typing import (
+    Any,
+    Collection,
+    Hashable,
+    Iterator,
+    Optional,
+    Protocol,
+    Type,
+    Union,
+    cast,
+    runtime_checkable,
+)
+
+from flamapy.core import manifest
+from flamapy.core.cache import (
+    M2M_CACHE,
+    PARSE_CACHE,
+    ResultCache,
+    content_hash,
+    default_result_cache,
+)
+from flamapy.core.cancellation import CancellationToken
+from flamapy.core.config import DISCOVERY_MANIFEST, PLUGIN_ENTRY_POINT_GROUP, PLUGIN_PATHS
 from flamapy.core.exceptions import OperationNotFound
+from flamapy.core.exceptions import PluginNotFound
 from flamapy.core.exceptions import TransformationNotFound
 from flamapy.core.exceptions import ConfigurationNotFound
+from flamapy.core.lazy import LazyOperation, LazyTransformation, LazyVariabilityModel
 from flamapy.core.models import VariabilityModel
-from flamapy.core.operations import Operation
+from flamapy.core.operations import Configurations, Filter, Metrics, Operation, Sampling
+from flamapy.core.operations.anytime import AnytimeOperation, AnytimeResult, Budget
+from flamapy.core.operations.pagination import Page, PageableOperation
 from flamapy.core.operations.descriptor import OperationDescriptor, collect_descriptors
 from flamapy.core.plugins import Operations, Plugin, Plugins
+from flamapy.core.store import AnalysisStore, measure
 from flamapy.core.transformations import Transformation
 from flamapy.core.transformations.text_to_model import TextToModel
 from flamapy.core.transformations.model_to_model import ModelToModel
-from flamapy.core.utils import filename_matches_extension
+from flamapy.core.utils import filename_extensions
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
 
 
@@ -29,6 +59,39 @@ class OperationWithConfiguration(Protocol):
         pass
 
 
+def iter_result(
+    operation: Operation, limit: Optional[int] = None, offset: int = 0
+) -> Iterator[Any]:
+    """Iterate over the result of an executed operation, streaming products if possible."""
+    if isinstance(operation, Configurations):
+        return operation.iter_configurations(limit, offset)
+    if isinstance(operation, Filter):
+        return operation.iter_filter_products(limit, offset)
+    if isinstance(operation, Sampling):
+        return operation.iter_sample(limit, offset)
+    result = operation.get_result()
+    # Only collections are unpacked: a Configuration, for example, is a single result.
+    items = result if isinstance(result, (list, tuple, set, frozenset, Iterator)) else [result]
+    stop = offset + limit if limit is not None else None
+    return islice(items, offset, stop)
+
+
+def _cancellation_token(
+    timeout: Optional[float], cancellation: Optional[CancellationToken]
+) -> CancellationToken:
+    if cancellation is None:
+        return CancellationToken(timeout)
+    if timeout is not None:
+        raise ValueError("Pass either a timeout or a cancellation token, not both")
+    return cancellation
+
+
+def _checked(items: Iterator[Any], cancellation: CancellationToken) -> Iterator[Any]:
+    for item in items:
+        cancellation.check()
+        yield item
+
+
 def filter_modules_from_plugin_paths() -> list[ModuleType]:
     results: list[ModuleType] = []
     for path in PLUGIN_PATHS:
@@ -40,9 +103,48 @@ def filter_modules_from_plugin_paths() -> list[ModuleType]:
     return results
 
 
+def filter_plugins_from_entry_points() -> list[Any]:
+    """Objects registered under the ``flamapy.plugins`` entry point group.
+
+    Each one is either a plugin package, which is then walked like the packages under
+    ``PLUGIN_PATHS``, or a plugin declaration: a mapping (or a callable returning one) in the
+    format of :func:`flamapy.core.manifest.describe_plugin`. Declared plugins are registered
+    from metadata alone, without walking or importing their modules.
+    """
+    results: list[Any] = []
+    for entry_point in entry_points(group=PLUGIN_ENTRY_POINT_GROUP):
+        try:
+            results.append(entry_point.load())
+        except ImportError:
+            LOGGER.exception("Could not load the plugin entry point %s", entry_point.value)
+    return results
+
+
 class DiscoverMetamodels:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        manifest_path: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        store: Optional[AnalysisStore] = None,
+    ) -> None:
+        """Discover the installed plugins.
+
+        Plugins registered through entry points (see :func:`filter_plugins_from_entry_points`)
+        take precedence; the packages under ``PLUGIN_PATHS`` are walked for the rest.
+        ``manifest_path`` (default: ``$FLAMAPY_DISCOVERY_MANIFEST``) enables the persistent
+        discovery manifest, see :mod:`flamapy.core.manifest`.
+        ``result_cache`` keeps the results of ``use_operation_from_vm``/``_from_file``; by
+        default it is sized by ``$FLAMAPY_RESULT_CACHE_ENTRIES`` (disabled when unset).
+        ``store`` persists the results of ``use_operation_from_file`` so that interrupted runs
+        over a corpus can be resumed, see :mod:`flamapy.core.store`.
+        """
+        self.result_cache = result_cache if result_cache is not None else default_result_cache()
+        self.store = store
+        self.registered_plugins = filter_plugins_from_entry_points()
         self.module_paths = filter_modules_from_plugin_paths()
+        self.manifest_path = manifest_path or DISCOVERY_MANIFEST
+        # Seconds each plugin module took to import during the last walk of the plugin packages.
+        self.import_times: dict[str, float] = {}
         self.plugins: Plugins = self.discover()
 
     def search_classes(self, module: ModuleType) -> list[Any]:
@@ -51,7 +153,9 @@ class DiscoverMetamodels:
             if ispkg:
                 classes += self.search_classes(import_module(file_name))
             else:
+                start = time.perf_counter()
                 _file = import_module(file_name)
+                self.import_times[file_name] = time.perf_counter() - start
                 classes += [
                     member
                     for member in inspect.getmembers(_file, inspect.isclass)
@@ -61,47 +165,97 @@ class DiscoverMetamodels:
         return classes
 
     def discover(self) -> Plugins:
+        plugins = self.discover_from_entry_points()
+        registered = {plugin.module.__name__ for plugin in plugins}
+        plugins.extend(self.discover_from_plugin_paths(exclude=registered))
+        plugins.get_index()  # build the lookup indexes before the registry is used
+        return plugins
+
+    def discover_from_entry_points(self) -> Plugins:
+        """Plugins registered through the ``flamapy.plugins`` entry point group."""
+        plugins = Plugins()
+        for registered in self.registered_plugins:
+            if isinstance(registered, ModuleType):
+                plugins.append(self.discover_plugin(registered))
+                continue
+            declaration = registered() if callable(registered) else registered
+            try:
+                plugins.append(manifest.load_plugin(declaration))
+            except (ImportError, KeyError):
+                LOGGER.exception("Invalid plugin declaration %s", declaration)
+        return plugins
+
+    def discover_from_plugin_paths(self, exclude: Collection[str] = ()) -> Plugins:
+        """Plugins found under ``PLUGIN_PATHS``, skipping the plugin packages in ``exclude``.
+
+        Uses the discovery manifest when one is configured.
+        """
+        if not self.manifest_path:
+            return self.discover_from_modules(exclude)
+
+        signature = manifest.plugin_signature(self.module_paths, exclude)
+        entries = manifest.read_manifest(self.manifest_path, signature)
+        if entries is not None:
+            try:
+                return Plugins(manifest.load_plugin(entry) for entry in entries)
+            except (ImportError, KeyError):
+                LOGGER.warning("Stale discovery manifest %s, rediscovering", self.manifest_path)
+
+        plugins = self.discover_from_modules(exclude)
+        manifest.write_manifest(
+            self.manifest_path, signature, [manifest.describe_plugin(plugin) for plugin in plugins]
+        )
+        return plugins
+
+    def discover_from_modules(self, exclude: Collection[str] = ()) -> Plugins:
+        """Walk and import every module of the plugin packages."""
         plugins = Plugins()
         for pkg in self.module_paths:
             for _, plugin_name, ispkg in iter_modules(pkg.__path__, pkg.__name__ + "."):
-                if not ispkg:
+                if not ispkg or plugin_name in exclude:
                     continue
-                module = import_module(plugin_name)
-                plugin = Plugin(module=module)
-
-                classes = self.search_classes(module)
-
-                for _, _class in classes:
-                    if not _class.__module__.startswith(module.__package__):
-                        continue  # Exclude modules not in current package
-                    inherit = _class.mro()
-
-                    if Operation in inherit:
-                        plugin.append_operation(_class)
-                    elif Transformation in inherit:
-                        plugin.append_transformations(_class)
-                    elif VariabilityModel in inherit:
-                        plugin.variability_model = _class
-                plugins.append(plugin)
+                plugins.append(self.discover_plugin(import_module(plugin_name)))
         return plugins
 
+    def discover_plugin(self, module: ModuleType) -> Plugin:
+        """Build a plugin by importing and inspecting every module of its package."""
+        plugin = Plugin(module=module)
+
+        classes = self.search_classes(module)
+
+        for _, _class in classes:
+            if not _class.__module__.startswith(module.__package__):
+                continue  # Exclude modules not in current package
+            inherit = _class.mro()
+            import_time = self.import_times.get(_class.__module__, 0.0)
+
+            if Operation in inherit:
+                plugin.append_operation(LazyOperation.from_class(_class, import_time))
+            elif Transformation in inherit:
+                plugin.append_transformations(LazyTransformation.from_class(_class, import_time))
+            elif VariabilityModel in inherit:
+                plugin.variability_model = LazyVariabilityModel.from_class(_class, import_time)
+        return plugin
+
     def reload(self) -> None:
+        # The new registry (with its indexes) replaces the old one in a single assignment.
         self.plugins = self.discover()
 
     def get_operations(self) -> list[Type[Operation]]:
-        """Get the operations for all modules"""
-        operations: list[Type[Operation]] = []
+        """Get the operations for all modules (this imports every operation module)"""
+        return [operation.load() for operation in self.get_operation_entries()]
+
+    def get_operation_entries(self) -> list[LazyOperation]:
+        """Get the lazy operation entries for all modules, without importing them"""
+        operations: list[LazyOperation] = []
         for plugin in self.plugins:
             operations += plugin.operations
         return operations
 
     def get_name_operations(self) -> list[str]:
-        operations = []
-        for operation in self.get_operations():
-            operations.append(operation.__name__)
-            base = operation.__base__.__name__ if operation.__base__ else ""
-            if base != "ABC":
-                operations.append(base)
+        operations: list[str] = []
+        for operation in self.get_operation_entries():
+            operations.extend(operation.names)
 
         return operations
 
@@ -113,45 +267,38 @@ class DiscoverMetamodels:
         return collect_descriptors(self.get_operations())
 
     def get_transformations(self) -> list[Type[Transformation]]:
-        """Get transformations for all modules"""
-        transformations: list[Type[Transformation]] = []
+        """Get transformations for all modules (this imports every transformation module)"""
+        return [transformation.load() for transformation in self.get_transformation_entries()]
+
+    def get_transformation_entries(self, kind: Optional[str] = None) -> list[LazyTransformation]:
+        """Get the lazy transformation entries of the given kind ('t2m', 'm2t', 'm2m' or all)"""
+        transformations: list[LazyTransformation] = []
         for plugin in self.plugins:
-            transformations += plugin.transformations
+            transformations += [t for t in plugin.transformations if kind in (None, t.kind)]
         return transformations
 
     def get_transformations_t2m(self) -> list[Type[TextToModel]]:
         """Get t2m transformations for all modules"""
-
-        transformations: list[Type[TextToModel]] = []
-        for plugin in self.plugins:
-            transformations += [t for t in plugin.transformations if issubclass(t, TextToModel)]
-        return transformations
+        return [t.load() for t in self.get_transformation_entries("t2m")]
 
     def get_transformations_m2m(self) -> list[Type[ModelToModel]]:
         """Get m2m transformations for all modules"""
+        return [t.load() for t in self.get_transformation_entries("m2m")]
 
-        transformations: list[Type[ModelToModel]] = []
-        for plugin in self.plugins:
-            transformations += [t for t in plugin.transformations if issubclass(t, ModelToModel)]
-        return transformations
+    def get_import_stats(self) -> dict[str, Any]:
+        """How many plugin modules were imported so far and how much import time was avoided."""
+        return self.plugins.get_import_stats()
 
     def get_operations_by_plugin(self, plugin_name: str) -> Operations:
         return self.plugins.get_operations_by_plugin_name(plugin_name)
 
     def get_plugins_with_operation(self, operation_name: str) -> list[Plugin]:
-        return [
-            plugin
-            for plugin in self.plugins
-            if operation_name in self.get_name_operations_by_plugin(plugin.name)
-        ]
+        return self.plugins.get_plugins_with_operation(operation_name)
 
     def get_name_operations_by_plugin(self, plugin_name: str) -> list[str]:
-        operations = []
+        operations: list[str] = []
         for operation in self.get_operations_by_plugin(plugin_name):
-            operations.append(operation.__name__)
-            base = operation.__base__.__name__ if operation.__base__ else ""
-            if base != "ABC":
-                operations.append(base)
+            operations.extend(operation.names)
 
         return operations
 
@@ -175,147 +322,373 @@ class DiscoverMetamodels:
 
     def get_operation(self, src: VariabilityModel, operation_name: str) -> Operation:
         plugin = self.plugins.get_plugin_by_variability_model(src)
-        return plugin.get_operation(operation_name)
+        return self.__get_plugin_operation(plugin, operation_name)
 
     def use_operation(self, src: VariabilityModel, operation_name: str) -> Operation:
         plugin = self.plugins.get_plugin_by_variability_model(src)
-        operation = plugin.get_operation(operation_name)
+        operation = self.__get_plugin_operation(plugin, operation_name)
         return plugin.use_operation(operation, src)
 
+    def __get_plugin_operation(self, plugin: Plugin, operation_name: str) -> Operation:
+        operation = plugin.get_operation(operation_name)
+        if isinstance(operation, Metrics):
+            # Metrics aggregates its implementations through Metrics.__subclasses__() and
+            # ModelToModel.__subclasses__(), so every one of them has to be imported.
+            for entry in self.get_operation_entries():
+                if entry.base == Metrics.__name__:
+                    entry.load()
+            for transformation in self.get_transformation_entries("m2m"):
+                transformation.load()
+        return operation
+
     # pylint: disable=too-many-arguments
-    def use_operation_from_vm(
+    def use_operation_from_vm(  # noqa: PLR0913
         self,
         operation_name: str,
         vm_orig: VariabilityModel,
         plugin_name: Optional[str] = None,
         configuration_file: Optional[str] = None,
         is_full: Optional[bool] = False,
+        *,
+        timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
+        cancellation: Optional[CancellationToken] = None,
     ) -> Any:
-        if operation_name not in self.get_name_operations():
+        """Run an operation on a model; ``timeout`` (seconds, the whole call) is enforced
+        cooperatively, raising OperationTimeout (see :mod:`flamapy.core.cancellation`).
+        Instead of a timeout, a ``cancellation`` token (with its own deadline, if any) lets
+        another thread stop the call with ``cancel()``, raising OperationCancelled.
+
+        With a ``budget``, an anytime operation (see :mod:`flamapy.core.operations.anytime`)
+        stops when the budget is spent, and the call returns its best result so far as an
+        ``AnytimeResult``; such results are not cached.
+        """
+        cancellation = _cancellation_token(timeout, cancellation)
+        if not self.plugins.has_operation(operation_name):
             raise OperationNotFound()
-        vm_temp = vm_orig
-        if plugin_name is not None:
-            plugin = self.plugins.get_plugin_by_name(plugin_name)
-            # vm_temp = plugin.use_transformation_t2m(file)
-        else:
-            # vm_temp = self.__transform_to_model_from_file(file)
-            plugin = self.plugins.get_plugin_by_extension(vm_orig.get_extension())
-
-            if operation_name not in self.get_name_operations_by_plugin(plugin.name):
-                transformation_way = self.__search_transformation_way(plugin, operation_name)
-
-                for _, dst in transformation_way:
-                    _plugin = self.plugins.get_plugin_by_extension(dst)
-                    vm_temp = _plugin.use_transformation_m2m(vm_temp, dst)
-                    plugin = _plugin
-
-        operation = plugin.get_operation(operation_name)
-        if isinstance(operation, OperationWithConfiguration):
-            if configuration_file is None:
-                raise ConfigurationNotFound()
-            configuration = self.__transform_to_model_from_file(configuration_file)
-            configuration = cast(Configuration, configuration)
-            is_full_value = is_full if is_full is not None else False
-            configuration.set_full(is_full_value)
-            operation.set_configuration(configuration)
-
-        operation = plugin.use_operation(operation, vm_temp)
-
-        return operation.get_result()
+        cache_key = None if budget is not None else self.__result_key(
+            operation_name, vm_orig, plugin_name, configuration_file, is_full
+        )
+        if cache_key is not None:
+            found, result = self.result_cache.lookup(cache_key)
+            if found:
+                return result
+        plugin, operation, model = self.__prepare_operation(
+            operation_name, vm_orig, plugin_name, configuration_file, is_full,
+            cancellation=cancellation,
+        )
+        result = self.__run_operation(plugin, operation, model, budget)
+        if cache_key is not None:
+            self.result_cache.store(cache_key, result)
+        return result
 
     # pylint: disable=too-many-arguments
-    def use_operation_from_file(
+    def use_operation_from_file(  # noqa: PLR0913
         self,
         operation_name: str,
         file: str,
         plugin_name: Optional[str] = None,
         configuration_file: Optional[str] = None,
         is_full: Optional[bool] = False,
+        *,
+        timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
+        cancellation: Optional[CancellationToken] = None,
     ) -> Any:
-        if operation_name not in self.get_name_operations():
+        """Run an operation on a model file; ``timeout``, ``cancellation`` and ``budget`` as in
+        use_operation_from_vm.
+        """
+        cancellation = _cancellation_token(timeout, cancellation)
+        if not self.plugins.has_operation(operation_name):
             raise OperationNotFound()
+        if budget is not None:
+            return self.__run_operation(*self.__prepare_operation(
+                operation_name, file, plugin_name, configuration_file, is_full,
+                cancellation=cancellation,
+            ), budget)
+        cache_key = self.__result_key(
+            operation_name, file, plugin_name, configuration_file, is_full
+        )
+        if cache_key is not None:
+            found, result = self.result_cache.lookup(cache_key)
+            if not found and self.store is not None:
+                found, result = self.store.lookup(cache_key)
+                if found:
+                    self.result_cache.store(cache_key, result)
+            if found:
+                return result
+
+        with measure(self.store is not None and self.store.track_memory) as measurement:
+            result = self.__run_operation(*self.__prepare_operation(
+                operation_name, file, plugin_name, configuration_file, is_full,
+                cancellation=cancellation,
+            ))
+        if cache_key is not None:
+            self.result_cache.store(cache_key, result)
+            if self.store is not None:
+                self.store.record(cache_key, file, result, measurement)
+        return result
 
+    # pylint: disable=too-many-arguments
+    def stream_operation(  # noqa: PLR0913
+        self,
+        operation_name: str,
+        source: Union[str, VariabilityModel],
+        plugin_name: Optional[str] = None,
+        configuration_file: Optional[str] = None,
+        is_full: Optional[bool] = False,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        timeout: Optional[float] = None,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Iterator[Any]:
+        """Run an operation on a model or model file and iterate over its result.
+
+        Configurations, Filter and Sampling yield their products one by one (see
+        ``Configurations.iter_configurations``), so memory stays bounded when their
+        implementation enumerates lazily; other results are iterated after being computed.
+        ``offset`` items are skipped and at most ``limit`` are yielded. Streamed results are
+        not cached. ``timeout`` also covers the time spent consuming the iterator.
+        """
+        cancellation = _cancellation_token(timeout, cancellation)
+        if not self.plugins.has_operation(operation_name):
+            raise OperationNotFound()
+        plugin, operation, model = self.__prepare_operation(
+            operation_name, source, plugin_name, configuration_file, is_full,
+            cancellation=cancellation,
+        )
+        operation = plugin.use_operation(operation, model)
+        return _checked(iter_result(operation, limit, offset), cancellation)
+
+    # pylint: disable=too-many-arguments
+    def page_operation(  # noqa: PLR0913
+        self,
+        operation_name: str,
+        source: Union[str, VariabilityModel],
+        plugin_name: Optional[str] = None,
+        configuration_file: Optional[str] = None,
+        is_full: Optional[bool] = False,
+        *,
+        page_size: int,
+        cursor: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Page:
+        """One page of the result of a pageable operation (Configurations, Filter, Sampling).
+
+        ``cursor`` is the ``next_cursor`` of the previous page (None for the first one); see
+        :mod:`flamapy.core.operations.pagination`. Pages are not cached.
+        """
+        cancellation = _cancellation_token(timeout, cancellation)
+        if not self.plugins.has_operation(operation_name):
+            raise OperationNotFound()
+        plugin, operation, model = self.__prepare_operation(
+            operation_name, source, plugin_name, configuration_file, is_full,
+            cancellation=cancellation,
+        )
+        descriptor = getattr(operation, "facade", None)
+        if not isinstance(operation, PageableOperation) or (
+            isinstance(descriptor, OperationDescriptor) and not descriptor.pageable
+        ):
+            raise ValueError(f"The results of {operation_name} cannot be paged")
+        operation.set_cursor(cursor)  # before executing, so that it can resume natively
+        executed = cast(PageableOperation, plugin.use_operation(operation, model))
+        executed.cursor_state = operation.cursor_state  # execute may return a new operation
+        return executed.get_page(page_size)
+
+    # pylint: disable=too-many-arguments
+    def __prepare_operation(  # noqa: PLR0913
+        self,
+        operation_name: str,
+        source: Union[str, VariabilityModel],
+        plugin_name: Optional[str],
+        configuration_file: Optional[str],
+        is_full: Optional[bool],
+        *,
+        cancellation: CancellationToken,
+    ) -> tuple[Plugin, Operation, VariabilityModel]:
+        """The plugin, operation and (transformed) model that run ``operation_name``."""
         if plugin_name is not None:
             plugin = self.plugins.get_plugin_by_name(plugin_name)
-            vm_temp = plugin.use_transformation_t2m(file)
+            if isinstance(source, str):
+                vm_temp = plugin.use_transformation_t2m(source)
+            else:
+                vm_temp = source
         else:
-            vm_temp = self.__transform_to_model_from_file(file)
+            if isinstance(source, str):
+                vm_temp = self.__transform_to_model_from_file(source)
+            else:
+                vm_temp = source
             plugin = self.plugins.get_plugin_by_extension(vm_temp.get_extension())
 
-            if operation_name not in self.get_name_operations_by_plugin(plugin.name):
-                transformation_way = self.__search_transformation_way(plugin, operation_name)
-
-                for _, dst in transformation_way:
-                    _plugin = self.plugins.get_plugin_by_extension(dst)
-                    vm_temp = _plugin.use_transformation_m2m(vm_temp, dst)
-                    plugin = _plugin
+            if not plugin.operations.has_name(operation_name):
+                plugin, vm_temp = self.__transform_for_operation(plugin, vm_temp, operation_name)
 
-        operation = plugin.get_operation(operation_name)
+        operation = self.__get_plugin_operation(plugin, operation_name)
         if isinstance(operation, OperationWithConfiguration):
             if configuration_file is None:
                 raise ConfigurationNotFound()
-            configuration = self.__transform_to_model_from_file(configuration_file)
-            configuration = cast(Configuration, configuration)
+            parsed = self.__transform_to_model_from_file(configuration_file)
+            # The parsed configuration may be shared through PARSE_CACHE, so is_full is set on
+            # a copy of it.
+            configuration = copy.copy(cast(Configuration, parsed))
             is_full_value = is_full if is_full is not None else False
             configuration.set_full(is_full_value)
             operation.set_configuration(configuration)
 
-        operation = plugin.use_operation(operation, vm_temp)
-        return operation.get_result()
+        operation.set_cancellation(cancellation)
+        cancellation.check()
+        return plugin, operation, vm_temp
 
-    def __transform_to_model_from_file(self, file: str) -> VariabilityModel:
-        t2m_transformations = self.get_transformations_t2m()
-        # Prefer the most specific matching extension (e.g. 'uvl.json' over 'json').
-        candidates = [
-            t2m
-            for t2m in t2m_transformations
-            if filename_matches_extension(file, t2m.get_source_extension())
+    @staticmethod
+    def __run_operation(
+        plugin: Plugin,
+        operation: Operation,
+        model: VariabilityModel,
+        budget: Optional[Budget] = None,
+    ) -> Any:
+        if budget is None:
+            return plugin.use_operation(operation, model).get_result()
+        if isinstance(operation, AnytimeOperation):
+            operation.set_budget(budget.seconds, budget.iterations)
+        operation = plugin.use_operation(operation, model)
+        if isinstance(operation, AnytimeOperation):
+            return operation.get_best_result()
+        return AnytimeResult(operation.get_result(), complete=True)
+
+    def plan_route(
+        self, operation_name: str, source: Union[str, VariabilityModel]
+    ) -> list[tuple[str, str]]:
+        """The m2m conversions, as (source, destination) extensions, that running
+        ``operation_name`` on a model (or model extension) ``source`` would go through.
+        """
+        extension = source if isinstance(source, str) else source.get_extension()
+        return [
+            (str(m2m.source), str(m2m.destination))
+            for m2m in self.plugins.plan_route(extension, operation_name)
         ]
-        if not candidates:
-            raise TransformationNotFound()
-        t2m = max(candidates, key=lambda t: len(t.get_source_extension()))
 
-        return t2m(file).transform()
-
-    def __search_transformation_way(
-        self, plugin: Plugin, operation_name: str
-    ) -> list[tuple[str, str]]:
+    # pylint: disable=too-many-arguments
+    def __result_key(
+        self,
+        operation_name: str,
+        source: Union[str, VariabilityModel],
+        plugin_name: Optional[str],
+        configuration_file: Optional[str],
+        is_full: Optional[bool],
+    ) -> Optional[Hashable]:
+        """Key of the result of running the operation on ``source`` (a model or a file), or None
+        if it must not be cached: the cache is disabled, the operation is not deterministic (its
+        ``cacheable`` attribute, or that of its facade descriptor, is False), or
+        the request cannot be resolved (running it will raise the appropriate error).
+
+        Files are identified by content, so the key is computed without parsing them.
         """
-        Search way to reach plugin with operation_name using m2m transformations
+        if not (self.result_cache.enabled or self.store is not None) or (
+            configuration_file is not None and not os.path.isfile(configuration_file)
+        ):
+            return None
+        try:
+            source_key = self.__source_key(source, plugin_name)
+            if source_key is None:
+                return None
+            model_key, extension = source_key
+            plugin = self.__resolve_plugin(extension, operation_name, plugin_name)
+            operation = plugin.operations.search_by_name(operation_name).load()
+        except (NotImplementedError, OperationNotFound, PluginNotFound):
+            return None
+        if not getattr(operation, "cacheable", True):
+            return None
+        descriptor = getattr(operation, "facade", None)
+        if isinstance(descriptor, OperationDescriptor):
+            if not descriptor.cacheable:
+                return None
+            operation_name = descriptor.name
+        inputs: dict[str, Any] = {"is_full": bool(is_full)}
+        if configuration_file is not None:
+            inputs["configuration"] = content_hash(configuration_file)
+        return ResultCache.key(model_key, operation_name, plugin.name, inputs)
+
+    def __source_key(
+        self, source: Union[str, VariabilityModel], plugin_name: Optional[str]
+    ) -> Optional[tuple[str, str]]:
+        """(key, extension) of a model, or of the model a file would be parsed into."""
+        if not isinstance(source, str):
+            return source.fingerprint(), source.get_extension()
+        extension = self.__file_model_extension(source)
+        if not os.path.isfile(source) or (plugin_name is None and extension is None):
+            return None
+        key = f"{'.'.join(filename_extensions(source)[:1])}:{content_hash(source)}"
+        return key, extension or ""
+
+    def __file_model_extension(self, file: str) -> Optional[str]:
+        """Extension of the model the file would be parsed into, without parsing it."""
+        t2m = self.plugins.get_t2m_transformations(file)
+        # The model is read by the most specific t2m, which builds the model of its own plugin.
+        return next(
+            (plugin.get_extension() for plugin in self.plugins
+             if t2m and t2m[0] in plugin.transformations and plugin.variability_model_entry),
+            None,
+        )
+
+    def resolve_plugin(
+        self,
+        operation_name: str,
+        source: Union[str, VariabilityModel],
+        plugin_name: Optional[str] = None,
+    ) -> Plugin:
+        """The plugin that would run the operation on ``source`` (a model or a model file),
+        without parsing or transforming anything.
         """
-        way: list[tuple[str, str]] = []
-
-        plugins_with_operation = self.get_plugins_with_operation(operation_name)
-        m2m_transformations = self.get_transformations_m2m()
-
-        input_extension = plugin.get_extension()
-
-        def __search_recursive_way(
-            input_extension: str, output_extension: str, tmp_way: list[tuple[str, str]]
-        ) -> list[tuple[str, str]]:
-            for m2m in m2m_transformations:
-                in_m2m = m2m.get_source_extension()
-                out_m2m = m2m.get_destination_extension()
-
-                if out_m2m == output_extension:
-                    _next = (in_m2m, out_m2m)
-
-                    if _next in tmp_way:
-                        continue
-
-                    tmp_way.insert(0, _next)
-
-                    if input_extension == in_m2m:
-                        return tmp_way
-
-                    return __search_recursive_way(input_extension, in_m2m, tmp_way)
+        if not self.plugins.has_operation(operation_name):
+            raise OperationNotFound()
+        if plugin_name is not None:
+            return self.plugins.get_plugin_by_name(plugin_name)
+        extension = (
+            source.get_extension() if not isinstance(source, str)
+            else self.__file_model_extension(source)
+        )
+        if extension is None:
+            raise TransformationNotFound()
+        return self.__resolve_plugin(extension, operation_name, None)
 
-            return tmp_way
+    def __resolve_plugin(
+        self, extension: str, operation_name: str, plugin_name: Optional[str]
+    ) -> Plugin:
+        """The plugin that would run the operation on a model with the given extension."""
+        if plugin_name is not None:
+            return self.plugins.get_plugin_by_name(plugin_name)
+        plugin = self.plugins.get_plugin_by_extension(extension)
+        route = self.plugins.plan_route(extension, operation_name)
+        if route:
+            plugin = self.plugins.get_plugin_by_extension(str(route[-1].destination))
+        return plugin
+
+    def __transform_for_operation(
+        self, plugin: Plugin, model: VariabilityModel, operation_name: str
+    ) -> tuple[Plugin, VariabilityModel]:
+        """Convert ``model`` along the planned route to a plugin implementing the operation."""
+        for m2m in self.plugins.plan_route(plugin.get_extension(), operation_name):
+            source, destination = str(m2m.source), str(m2m.destination)
+            cached = M2M_CACHE.lookup(m2m, model)
+            if cached is None:
+                start = time.perf_counter()
+                transformed = m2m(model).transform()
+                self.plugins.record_transformation_cost(
+                    source, destination, time.perf_counter() - start
+                )
+                M2M_CACHE.store(m2m, model, transformed)
+                model = transformed
+            else:
+                model = cached
+            plugin = self.plugins.get_plugin_by_extension(destination)
+        return plugin, model
 
-        for _plugin in plugins_with_operation:
-            output_extension = _plugin.get_extension()
-            way = __search_recursive_way(input_extension, output_extension, [])
-            if way and output_extension == way[-1][1]:
-                return way
+    def __transform_to_model_from_file(self, file: str) -> VariabilityModel:
+        # Prefer the most specific matching extension (e.g. 'uvl.json' over 'json').
+        candidates = self.plugins.get_t2m_transformations(file)
+        if not candidates:
+            raise TransformationNotFound()
 
-        raise NotImplementedError("Way to execute operation not found")
+        return PARSE_CACHE.transform(candidates[0], file)
@@ -28,3 +28,15 @@ class DuplicatedFeature(FlamaException):
 
 class ConfigurationNotFound(FlamaException):
     pass
+
+
+class InvalidCursor(FlamaException):
+    pass
+
+
+class OperationCancelled(FlamaException):
+    pass
+
+
+class OperationTimeout(OperationCancelled):
+    pass
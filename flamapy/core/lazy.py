@@ -0,0 +1,214 @@
+"""Lightweight stand-ins for plugin classes that import their module only on first use.
+
+A plugin registers operations, transformations and its variability model. When discovery comes
+from the manifest (see :mod:`flamapy.core.manifest`) only the module path, the class name and
+the metadata needed for dispatch (extensions, base operation name) are known; the class itself,
+and with it the plugin's solver dependencies, is imported the first time an entry is resolved.
+"""
+import time
+from importlib import import_module
+from typing import Any, Optional
+
+from flamapy.core.transformations import (
+    ModelToModel,
+    ModelToText,
+    TextToModel,
+)
+
+
+class LazyClass:
+    """A plugin class identified by module path and qualified name."""
+
+    def __init__(
+        self,
+        module: str,
+        name: str,
+        _class: Optional[type] = None,
+        import_time: float = 0.0,
+    ) -> None:
+        self.module = module
+        self.name = name
+        # Seconds the module took to import during the last full discovery (an estimate of
+        # what is saved while the entry stays unresolved).
+        self.import_time = import_time
+        self.load_time: Optional[float] = 0.0 if _class is not None else None
+        self._class = _class
+
+    @property
+    def class_name(self) -> str:
+        return self.name.rsplit(".", maxsplit=1)[-1]
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.module}.{self.name}"
+
+    @property
+    def loaded(self) -> bool:
+        return self._class is not None
+
+    def load(self) -> Any:
+        """Import the module (if needed) and return the class."""
+        if self._class is None:
+            start = time.perf_counter()
+            resolved: Any = import_module(self.module)
+            for part in self.name.split("."):
+                resolved = getattr(resolved, part)
+            self.load_time = time.perf_counter() - start
+            self._class = resolved
+        return self._class
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"module": self.module, "name": self.name, "import_time": self.import_time}
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "lazy"
+        return f"{self.__class__.__name__}({self.qualified_name}, {state})"
+
+
+class LazyOperation(LazyClass):
+    """An operation, with the name of the interface it implements (e.g. 'CoreFeatures')."""
+
+    def __init__(self, module: str, name: str, base: str, **kwargs: Any) -> None:
+        super().__init__(module, name, **kwargs)
+        self.base = base
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Names the operation can be requested by."""
+        return (self.class_name, self.base) if self.base != "ABC" else (self.class_name,)
+
+    @classmethod
+    def from_class(cls, _class: type, import_time: float = 0.0) -> "LazyOperation":
+        base = _class.__base__.__name__ if _class.__base__ else ""
+        return cls(_class.__module__, _class.__qualname__, base, _class=_class,
+                   import_time=import_time)
+
+    @classmethod
+    def from_dict(cls, entry: dict[str, Any]) -> "LazyOperation":
+        return cls(entry["module"], entry["name"], entry["base"],
+                   import_time=entry.get("import_time", 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**super().to_dict(), "base": self.base}
+
+
+class LazyTransformation(LazyClass):
+    """A transformation, with its kind ('t2m', 'm2t' or 'm2m'), extensions and declared cost."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        module: str,
+        name: str,
+        kind: Optional[str],
+        source: Optional[str],
+        destination: Optional[str],
+        *,
+        cost: float = 1.0,
+        **kwargs: Any,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        super().__init__(module, name, **kwargs)
+        self.kind = kind
+        self.source = source
+        self.destination = destination
+        self.cost = cost
+
+    def get_source_extension(self) -> Optional[str]:
+        return self.source
+
+    def get_destination_extension(self) -> Optional[str]:
+        return self.destination
+
+    @classmethod
+    def from_class(cls, _class: type, import_time: float = 0.0) -> "LazyTransformation":
+        kind = None
+        if issubclass(_class, TextToModel):
+            kind = "t2m"
+        elif issubclass(_class, ModelToText):
+            kind = "m2t"
+        elif issubclass(_class, ModelToModel):
+            kind = "m2m"
+        source = getattr(_class, "get_source_extension", None)
+        destination = getattr(_class, "get_destination_extension", None)
+        return cls(
+            _class.__module__,
+            _class.__qualname__,
+            kind,
+            source() if source else None,
+            destination() if destination else None,
+            cost=getattr(_class, "cost", 1.0),
+            _class=_class,
+            import_time=import_time,
+        )
+
+    @classmethod
+    def from_dict(cls, entry: dict[str, Any]) -> "LazyTransformation":
+        return cls(entry["module"], entry["name"], entry["kind"], entry.get("source"),
+                   entry.get("destination"), cost=entry.get("cost", 1.0),
+                   import_time=entry.get("import_time", 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **super().to_dict(),
+            "kind": self.kind,
+            "source": self.source,
+            "destination": self.destination,
+            "cost": self.cost,
+        }
+
+
+class LazyVariabilityModel(LazyClass):
+    """A plugin's variability model class, with its extension."""
+
+    def __init__(self, module: str, name: str, extension: str, **kwargs: Any) -> None:
+        super().__init__(module, name, **kwargs)
+        self.extension = extension
+
+    def get_extension(self) -> str:
+        return self.extension
+
+    def is_model_class_of(self, model: Any) -> bool:
+        """Whether ``model`` is an instance of this class, without importing it."""
+        qualified_name = self.qualified_name
+        return any(
+            f"{_class.__module__}.{_class.__qualname__}" == qualified_name
+            for _class in type(model).__mro__
+        )
+
+    @classmethod
+    def from_class(cls, _class: Any, import_time: float = 0.0) -> "LazyVariabilityModel":
+        return cls(_class.__module__, _class.__qualname__, _class.get_extension(),
+                   _class=_class, import_time=import_time)
+
+    @classmethod
+    def from_dict(cls, entry: dict[str, Any]) -> "LazyVariabilityModel":
+        return cls(entry["module"], entry["name"], entry["extension"],
+                   import_time=entry.get("import_time", 0.0))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**super().to_dict(), "extension": self.extension}
+
+
+def import_stats(entries: list[LazyClass]) -> dict[str, Any]:
+    """Summary of which plugin modules were imported and how much import time was avoided.
+
+    ``avoided_import_time`` adds up the import times measured during the last full discovery
+    for the modules that are still unresolved; it is an estimate, as modules share imports.
+    """
+    loaded: dict[str, float] = {}
+    pending: dict[str, float] = {}
+    for entry in entries:
+        if entry.loaded:
+            loaded[entry.module] = loaded.get(entry.module, 0.0) + (entry.load_time or 0.0)
+        else:
+            pending[entry.module] = max(pending.get(entry.module, 0.0), entry.import_time)
+    pending = {module: cost for module, cost in pending.items() if module not in loaded}
+    return {
+        "loaded_modules": len(loaded),
+        "pending_modules": len(pending),
+        "import_time": sum(loaded.values()),
+        "avoided_import_time": sum(pending.values()),
+    }
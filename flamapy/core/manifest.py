@@ -0,0 +1,132 @@
+"""Persistent discovery manifest, so a warm start does not import the whole plugin tree.
+
+Discovering plugins means walking every package under ``PLUGIN_PATHS``, importing every module
+and inspecting its classes. The manifest stores the outcome of that walk (plugins, operations,
+transformations with their extensions, and variability models) in a single JSON file, together
+with a signature of everything that could change it: the plugin package paths, the mtime and
+size of their source files, and the installed flamapy distributions. As long as the signature
+matches, discovery reads the file and registers lazy entries (see :mod:`flamapy.core.lazy`)
+without importing any plugin module beyond the plugin packages themselves.
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Collection, Optional
+
+from flamapy.core.lazy import LazyOperation, LazyTransformation, LazyVariabilityModel
+from flamapy.core.plugins import Plugin
+
+
+LOGGER = logging.getLogger("manifest")
+
+MANIFEST_VERSION = 1
+
+
+def _source_files(path: str) -> list[str]:
+    files: list[str] = []
+    for root, dirs, names in os.walk(path, followlinks=True):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(".py"))
+    return files
+
+
+def _installed_distributions() -> list[str]:
+    """Names (with versions) of the installed flamapy distributions.
+
+    Reading the ``*.dist-info`` directory names is much cheaper than querying
+    ``importlib.metadata`` for every installed distribution.
+    """
+    found = set()
+    for entry in sys.path:
+        if not os.path.isdir(entry):
+            continue
+        for name in os.listdir(entry):
+            if name.lower().startswith("flamapy") and name.endswith((".dist-info", ".egg-info")):
+                found.add(name)
+    return sorted(found)
+
+
+def plugin_signature(modules: list[ModuleType], exclude: Collection[str] = ()) -> str:
+    """Signature of the plugin packages: paths, source mtimes/sizes and installed versions.
+
+    ``exclude`` lists the plugin packages left out of the walk (registered elsewhere).
+    """
+    digest = hashlib.sha256(f"manifest-v{MANIFEST_VERSION}".encode())
+    for excluded in sorted(exclude):
+        digest.update(f"exclude:{excluded}".encode())
+    for module in sorted(modules, key=lambda m: m.__name__):
+        digest.update(module.__name__.encode())
+        for path in sorted(module.__path__):
+            for file in _source_files(path):
+                stat = os.stat(file)
+                digest.update(f"{file}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    for distribution in _installed_distributions():
+        digest.update(distribution.encode())
+    return digest.hexdigest()
+
+
+def describe_plugin(plugin: Plugin) -> dict[str, Any]:
+    """Serializable description of a discovered plugin, as stored in the manifest."""
+    variability_model = plugin.variability_model_entry
+    return {
+        "name": plugin.name,
+        "module": plugin.module.__name__,
+        "variability_model": variability_model.to_dict() if variability_model else None,
+        "operations": [operation.to_dict() for operation in plugin.operations],
+        "transformations": [
+            transformation.to_dict() for transformation in plugin.transformations
+        ],
+    }
+
+
+def load_plugin(entry: dict[str, Any]) -> Plugin:
+    """Rebuild a Plugin from its manifest description.
+
+    Only the plugin package itself is imported; operations, transformations and the variability
+    model stay lazy until they are used.
+    """
+    plugin = Plugin(module=import_module(entry["module"]))
+    for operation in entry.get("operations", []):
+        plugin.append_operation(LazyOperation.from_dict(operation))
+    for transformation in entry.get("transformations", []):
+        plugin.append_transformations(LazyTransformation.from_dict(transformation))
+    if entry.get("variability_model") is not None:
+        plugin.variability_model = LazyVariabilityModel.from_dict(entry["variability_model"])
+    return plugin
+
+
+def read_manifest(path: str, signature: str) -> Optional[list[dict[str, Any]]]:
+    """Plugin descriptions stored in ``path``, or None if missing, unreadable or stale."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("signature") != signature:
+        return None
+    plugins: list[dict[str, Any]] = manifest["plugins"]
+    return plugins
+
+
+def write_manifest(path: str, signature: str, plugins: list[dict[str, Any]]) -> None:
+    """Atomically write the manifest; failures (e.g. a read-only image) are only logged."""
+    manifest = {"version": MANIFEST_VERSION, "signature": signature, "plugins": plugins}
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+        ) as file:
+            json.dump(manifest, file)
+        try:
+            os.replace(file.name, path)
+        except OSError:
+            os.unlink(file.name)
+            raise
+    except OSError:
+        LOGGER.warning("Could not write the discovery manifest %s", path, exc_info=True)
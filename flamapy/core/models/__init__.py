@@ -1,4 +1,17 @@
 from .variability_model import VariabilityModel, VariabilityElement  # pylint: disable=cyclic-import
-from .ast import AST, ASTOperation, NodeType  # pylint: disable=cyclic-import
+from .ast import AST, ASTOperation, Node, NodeKind, NodeType  # pylint: disable=cyclic-import
+from .cnf import CNFBuilder, IntCNF, VariableMap, int_cnf  # pylint: disable=cyclic-import
 
-__all__ = ["AST", "ASTOperation", "NodeType", "VariabilityElement", "VariabilityModel"]
+__all__ = [
+    "AST",
+    "ASTOperation",
+    "CNFBuilder",
+    "IntCNF",
+    "Node",
+    "NodeKind",
+    "NodeType",
+    "VariabilityElement",
+    "VariabilityModel",
+    "VariableMap",
+    "int_cnf",
+]
@@ -1,5 +1,7 @@
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from enum import Enum
+from operator import attrgetter
+from weakref import KeyedRef
 
 from flamapy.core.exceptions import FlamaException
 
@@ -78,36 +80,162 @@ class NodeType(Enum):
     OPERATOR = "Operator"
 
 
+class NodeKind(Enum):
+    """Shape of a node, computed once when the node is created."""
+    TERM = "Term"                  # a leaf that is not an operation
+    COMPOUND_TERM = "Compound"     # a non-operation with operands
+    UNARY = "Unary"                # NOT
+    BINARY = "Binary"              # any other operation
+    AGGREGATE = "Aggregate"        # SUM, AVG, LEN, FLOOR, CEIL
+
+
+_OPERATION_KINDS = frozenset({NodeKind.UNARY, NodeKind.BINARY, NodeKind.AGGREGATE})
+
+
+def _node_kind(data: Any, left: Optional["Node"]) -> NodeKind:
+    if isinstance(data, ASTOperation):
+        if data == ASTOperation.NOT:
+            return NodeKind.UNARY
+        if data in AGGREGATION_OPERATORS:
+            return NodeKind.AGGREGATE
+        return NodeKind.BINARY
+    return NodeKind.TERM if left is None else NodeKind.COMPOUND_TERM
+
+
+_set = object.__setattr__
+
+# Live nodes by (payload type, payload, node type, operands): enum members and operands are
+# keyed by identity, since they are canonical, which keeps lookups cheap. Entries are dropped
+# when their node is collected.
+_INTERNED: dict[tuple[Any, ...], "KeyedRef[tuple[Any, ...], Node]"] = {}
+
+
+def _forget(reference: "KeyedRef[tuple[Any, ...], Node]") -> None:
+    if _INTERNED.get(reference.key) is reference:
+        del _INTERNED[reference.key]
+
+
+def _payload_hash(payload: Any) -> int:
+    try:
+        return hash(payload)
+    except TypeError:  # unhashable payload, e.g. a list of values
+        return hash(repr(payload))
+
+
 class Node:
-    def __init__(
-        self,
+    """An immutable, hash-consed node of an AST.
+
+    Creating a node that is structurally equal to a live one returns that node, so identical
+    subformulas (across all the constraints of a model) are stored once, and nodes can be
+    compared, hashed and used as keys of memoised transformations in constant time. Nodes
+    cannot be modified; build a new node instead.
+    """
+
+    __slots__ = ("__weakref__", "_hash", "data", "kind", "left", "node_type", "right")
+
+    data: Any
+    left: "Node"
+    right: "Node"
+    node_type: Optional[NodeType]
+    kind: NodeKind
+    _hash: int
+
+    def __new__(
+        cls,
         data: Any,
         left: "Node" = None,  # type: ignore[assignment]
         right: "Node" = None,  # type: ignore[assignment]
         node_type: Optional[NodeType] = None,
-    ):
-        self.data = data
-        self.left = left
-        self.right = right
-        self.node_type = node_type
+    ) -> "Node":
+        payload = id(data) if isinstance(data, Enum) else data
+        key = (type(data), payload, id(node_type), id(left), id(right))
+        try:
+            reference = _INTERNED.get(key)
+        except TypeError:  # unhashable payload: the node is not interned
+            return cls.__create(data, left, right, node_type, payload)
+        node = reference() if reference is not None else None
+        if node is None:
+            node = cls.__create(data, left, right, node_type, payload)
+            _INTERNED[key] = KeyedRef(node, _forget, key)
+        return node
+
+    @classmethod
+    def __create(  # pylint: disable=too-many-arguments
+        cls,
+        data: Any,
+        left: "Node",
+        right: "Node",
+        node_type: Optional[NodeType],
+        payload: Any,
+    ) -> "Node":
+        node = object.__new__(cls)
+        _set(node, "data", data)
+        _set(node, "left", left)
+        _set(node, "right", right)
+        _set(node, "node_type", node_type)
+        _set(node, "kind", _node_kind(data, left))
+        # Structural, so that equal nodes that were not interned (unhashable payloads, or a
+        # race between threads) still hash alike; enum members hash by identity.
+        _set(node, "_hash", hash((
+            type(data), _payload_hash(payload), id(node_type),
+            left._hash if left is not None else 0, right._hash if right is not None else 0,
+        )))
+        return node
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Node is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Node is immutable; cannot delete {name!r}")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Node, (self.data, self.left, self.right, self.node_type))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Node):
+            return NotImplemented
+        # Interned nodes are equal only if identical; the walk covers nodes with payloads
+        # that could not be interned. It uses a stack, so deep formulas are fine.
+        stack = [(self, other)]
+        while stack:
+            first, second = stack.pop()
+            if first is second:
+                continue
+            if first is None or second is None or first._hash != second._hash:
+                return False
+            if (type(first.data) is not type(second.data) or first.data != second.data
+                    or first.node_type != second.node_type):
+                return False
+            stack.append((first.left, second.left))
+            stack.append((first.right, second.right))
+        return True
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def is_term(self) -> bool:
-        return not self.is_op()
+        return self.kind not in _OPERATION_KINDS
 
     def is_op(self) -> bool:
-        return isinstance(self.data, ASTOperation)
+        return self.kind in _OPERATION_KINDS
 
     def is_unary_op(self) -> bool:
-        return self.is_op() and self.data in [ASTOperation.NOT]
+        return self.kind is NodeKind.UNARY
 
     def is_unique_term(self) -> bool:
-        return not self.is_op() and self.left is None
+        return self.kind is NodeKind.TERM
 
     def is_binary_op(self) -> bool:
-        return not self.is_unique_term() and not self.is_unary_op() and not self.is_aggregate_op()
+        return self.kind is NodeKind.BINARY or self.kind is NodeKind.COMPOUND_TERM
 
     def is_aggregate_op(self) -> bool:
-        return self.is_op() and self.data in AGGREGATION_OPERATORS
+        return self.kind is NodeKind.AGGREGATE
 
     def is_feature(self) -> bool:
         """Return True if this node is explicitly marked as a feature reference."""
@@ -197,22 +325,24 @@ class AST:
         Tseytin transformation; the returned clauses may contain fresh auxiliary
         variables. Use :meth:`get_clauses_with_aux` when those auxiliary variable names
         are needed (e.g. to register them as non-feature solver variables).
+        ``method='plaisted_greenbaum'`` is the smaller, polarity-aware Tseytin variant with
+        n-ary AND/OR gates; it is equisatisfiable but does not preserve the number of models.
         """
-        if method == 'tseytin':
-            clauses, _ = tseytin_cnf(self)
+        if method in TSEYTIN_METHODS:
+            clauses, _ = tseytin_cnf(self, **TSEYTIN_METHODS[method])
             return clauses
-        ast = self.to_cnf()
-        return get_clauses(ast)
+        return distribute_clauses(self.root, _name_literal)
 
     def get_clauses_with_aux(self, method: str = 'tseytin') -> tuple[list[list[Any]], list[str]]:
         """Return ``(clauses, aux_names)`` for the given CNF ``method``.
 
-        For ``'tseytin'`` this exposes the auxiliary variable names introduced by the
-        encoding. For ``'distributive'`` the auxiliary list is always empty.
+        For ``'tseytin'`` and ``'plaisted_greenbaum'`` this exposes the auxiliary variable
+        names introduced by the encoding. For ``'distributive'`` the auxiliary list is always
+        empty.
         """
-        if method == 'tseytin':
-            return tseytin_cnf(self)
-        return get_clauses(self.to_cnf()), []
+        if method in TSEYTIN_METHODS:
+            return tseytin_cnf(self, **TSEYTIN_METHODS[method])
+        return distribute_clauses(self.root, _name_literal), []
 
     def get_operators(self) -> list[ASTOperation]:
         operators = []
@@ -257,9 +387,8 @@ def convert_into_nnf(ast: AST) -> AST:
 
 
 def convert_into_cnf(ast: AST) -> AST:
-    ast = simplify_formula(ast)
-    ast = propagate_negation(ast.root)
-    return to_cnf(ast)
+    clauses = distribute_clauses(ast.root, _node_literal)
+    return AST(_balanced(ASTOperation.AND, [_balanced(ASTOperation.OR, c) for c in clauses]))
 
 
 def simplify_formula(ast: AST) -> AST:
@@ -268,54 +397,67 @@ def simplify_formula(ast: AST) -> AST:
 
     Adapted from [Büning, Hans Kleine, and Theodor Lettmann.
     Propositional logic: deduction and algorithms. Vol. 48. Cambridge University Press, 1999.]
+
+    The tree is walked with an explicit stack, so arbitrarily deep formulas do not hit the
+    recursion limit. Both sides of '<=>' and 'XOR' are simplified once and shared by the two
+    halves of their expansion.
     """
-    logic_op = ast.root.data
-    left = ast.root.left
-    right = ast.root.right
+    results: list[Node] = []
+    stack: list[tuple[Node, bool]] = [(ast.root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        logic_op = node.data
+        if logic_op not in _SIMPLIFIED_OPERATORS:
+            results.append(node)
+        elif not children_done:
+            stack.append((node, True))
+            if logic_op != ASTOperation.NOT:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+        elif logic_op == ASTOperation.NOT:
+            results.append(Node(ASTOperation.NOT, results.pop()))
+        else:
+            right = results.pop()
+            left = results.pop()
+            results.append(_simplify_binary(logic_op, left, right))
+    return AST(results.pop())
+
+
+_SIMPLIFIED_OPERATORS = frozenset({
+    ASTOperation.REQUIRES,
+    ASTOperation.IMPLIES,
+    ASTOperation.EXCLUDES,
+    ASTOperation.EQUIVALENCE,
+    ASTOperation.XOR,
+    ASTOperation.AND,
+    ASTOperation.OR,
+    ASTOperation.NOT,
+})
+
+
+def _simplify_binary(logic_op: ASTOperation, left: Node, right: Node) -> Node:
+    """The simplification of ``left logic_op right``, given simplified operands."""
     if logic_op in (ASTOperation.REQUIRES, ASTOperation.IMPLIES):
         # Replace P => Q with !P v Q.
-        left = simplify_formula(AST(left)).root
-        right = simplify_formula(AST(right)).root
-        result = AST.create_binary_operation(ASTOperation.OR, Node(ASTOperation.NOT, left), right)
-    elif logic_op == ASTOperation.EXCLUDES:
+        return Node(ASTOperation.OR, Node(ASTOperation.NOT, left), right)
+    if logic_op == ASTOperation.EXCLUDES:
         # Replace P EXCLUDES Q with !P v !Q.
-        left = simplify_formula(AST(left)).root
-        right = simplify_formula(AST(right)).root
-        result = AST.create_binary_operation(
-            ASTOperation.OR, Node(ASTOperation.NOT, left), Node(ASTOperation.NOT, right)
-        )
-    elif logic_op == ASTOperation.EQUIVALENCE:
+        return Node(ASTOperation.OR, Node(ASTOperation.NOT, left), Node(ASTOperation.NOT, right))
+    if logic_op == ASTOperation.EQUIVALENCE:
         # Replace P <=> Q with P => Q ∧ Q => P.
-        new_left = simplify_formula(
-            AST.create_binary_operation(ASTOperation.IMPLIES, left, right)
-        ).root
-        new_right = simplify_formula(
-            AST.create_binary_operation(ASTOperation.IMPLIES, right, left)
-        ).root
-        result = AST.create_binary_operation(ASTOperation.AND, new_left, new_right)
-    elif logic_op == ASTOperation.XOR:
+        return Node(
+            ASTOperation.AND,
+            Node(ASTOperation.OR, Node(ASTOperation.NOT, left), right),
+            Node(ASTOperation.OR, Node(ASTOperation.NOT, right), left),
+        )
+    if logic_op == ASTOperation.XOR:
         # Replace P XOR Q with (P ∧ !Q) v (!P ∧ Q).
-        new_left = simplify_formula(
-            AST.create_binary_operation(ASTOperation.AND, left, Node(ASTOperation.NOT, right))
-        ).root
-        new_right = simplify_formula(
-            AST.create_binary_operation(ASTOperation.AND, Node(ASTOperation.NOT, left), right)
-        ).root
-        result = AST.create_binary_operation(ASTOperation.OR, new_left, new_right)
-    elif logic_op == ASTOperation.AND:
-        left = simplify_formula(AST(left)).root
-        right = simplify_formula(AST(right)).root
-        result = AST.create_binary_operation(ASTOperation.AND, left, right)
-    elif logic_op == ASTOperation.OR:
-        left = simplify_formula(AST(left)).root
-        right = simplify_formula(AST(right)).root
-        result = AST.create_binary_operation(ASTOperation.OR, left, right)
-    elif logic_op == ASTOperation.NOT:
-        left = simplify_formula(AST(left)).root
-        result = AST.create_unary_operation(ASTOperation.NOT, left)
-    else:
-        result = ast
-    return result
+        return Node(
+            ASTOperation.OR,
+            Node(ASTOperation.AND, left, Node(ASTOperation.NOT, right)),
+            Node(ASTOperation.AND, Node(ASTOperation.NOT, left), right),
+        )
+    return Node(logic_op, left, right)  # AND, OR
 
 
 def to_cnf(formula: AST) -> AST:
@@ -324,32 +466,7 @@ def to_cnf(formula: AST) -> AST:
     Adapted and fixed from [Alexander Knüppel. The Role of Complex Constraints in Feature Modeling.
     Master's Thesis. 2016].
     """
-    res = formula
-    node = formula.root
-    if node.data == ASTOperation.AND:
-        res = AST.create_binary_operation(
-            ASTOperation.AND, to_cnf(AST(node.left)).root, to_cnf(AST(node.right)).root
-        )
-    elif node.data == ASTOperation.OR:
-        node.left = to_cnf(AST(node.left)).root
-        node.right = to_cnf(AST(node.right)).root
-        if node.left.data == ASTOperation.AND:
-            res = AST.create_binary_operation(
-                ASTOperation.AND,
-                AST.create_binary_operation(ASTOperation.OR, node.left.left, node.right).root,
-                AST.create_binary_operation(ASTOperation.OR, node.left.right, node.right).root,
-            )
-            res = to_cnf(res)
-        elif node.right.data == ASTOperation.AND:
-            res = AST.create_binary_operation(
-                ASTOperation.AND,
-                AST.create_binary_operation(ASTOperation.OR, node.left, node.right.left).root,
-                AST.create_binary_operation(ASTOperation.OR, node.left, node.right.right).root,
-            )
-            res = to_cnf(res)
-        else:
-            res = AST.create_binary_operation(ASTOperation.OR, node.left, node.right)
-    return res
+    return convert_into_cnf(formula)
 
 
 def to_nnf(ast: AST) -> AST:
@@ -364,45 +481,155 @@ def to_nnf(ast: AST) -> AST:
 
 
 def propagate_negation(node: Node, negated: bool = False) -> AST:
-    result = None
-    if node.data == ASTOperation.NOT:
-        negated = not negated
-        result = propagate_negation(node.left, negated)
-    elif node.data == ASTOperation.AND:
-        if negated:
-            result = AST.create_binary_operation(
-                ASTOperation.OR,
-                propagate_negation(node.left, negated).root,
-                propagate_negation(node.right, negated).root,
-            )
+    results: list[Node] = []
+    stack: list[tuple[Node, bool, bool]] = [(node, negated, False)]
+    while stack:
+        current, negated, children_done = stack.pop()
+        if current.data == ASTOperation.NOT:
+            stack.append((current.left, not negated, False))
+        elif current.data in (ASTOperation.AND, ASTOperation.OR):
+            if not children_done:
+                stack.append((current, negated, True))
+                stack.append((current.right, negated, False))
+                stack.append((current.left, negated, False))
+            else:
+                right = results.pop()
+                left = results.pop()
+                results.append(Node(_DUAL[current.data] if negated else current.data,
+                                    left, right))
+        elif negated:
+            results.append(Node(ASTOperation.NOT, current))
         else:
-            result = AST.create_binary_operation(
-                ASTOperation.AND,
-                propagate_negation(node.left, negated).root,
-                propagate_negation(node.right, negated).root,
-            )
-    elif node.data == ASTOperation.OR:
-        if negated:
-            result = AST.create_binary_operation(
-                ASTOperation.AND,
-                propagate_negation(node.left, negated).root,
-                propagate_negation(node.right, negated).root,
-            )
+            results.append(current)
+    return AST(results.pop())
+
+
+_DUAL = {ASTOperation.AND: ASTOperation.OR, ASTOperation.OR: ASTOperation.AND}
+
+# Instructions of distribute_clauses, besides (node, negated, in_clause) evaluations.
+_CONCAT = "concat"
+_PRODUCT = "product"
+
+
+def distribute_clauses(
+    root: Node, literal: Callable[[Node, bool, bool], list[list[Any]]]
+) -> list[list[Any]]:
+    """The clauses of the distributive CNF of a formula, in a single iterative pass.
+
+    Simplification, negation normal form and distribution are fused: every node is evaluated
+    with its polarity (``negated``) and, instead of rewriting the tree, the clause lists of its
+    operands are concatenated (a conjunction) or multiplied (a disjunction: every clause of the
+    left operand joined with every clause of the right one). The clauses, and the literals in
+    them, come out in the order of the classic recursive simplify/NNF/distribute pipeline.
+
+    ``literal(node, negated, in_clause)`` gives the clauses of an atom (any node that is not a
+    propositional connective); ``in_clause`` tells whether it is below a disjunction.
+    """
+    values: list[list[list[Any]]] = []
+    work: list[Any] = [(root, False, False)]
+    while work:
+        item = work.pop()
+        if item is _CONCAT:
+            right = values.pop()
+            values[-1].extend(right)
+        elif item is _PRODUCT:
+            right = values.pop()
+            values.append(_product(values.pop(), right))
         else:
-            result = AST.create_binary_operation(
-                ASTOperation.OR,
-                propagate_negation(node.left, negated).root,
-                propagate_negation(node.right, negated).root,
-            )
-    elif negated:
-        result = AST.create_unary_operation(ASTOperation.NOT, node)
-    else:
-        result = AST(node)
-    return result
+            node, negated, in_clause = item
+            program = _clause_program(node, negated, in_clause)
+            if program is None:
+                values.append(literal(node, negated, in_clause))
+            else:
+                work.extend(reversed(program))
+    return values.pop()
+
+
+def _product(left: list[list[Any]], right: list[list[Any]]) -> list[list[Any]]:
+    # The clause lists are owned by the evaluation, so they can be extended in place.
+    if len(right) == 1:
+        for clause in left:
+            clause.extend(right[0])
+        return left
+    return [clause + other for clause in left for other in right]
+
+
+# Clause programs of the connectives by (operation, negated): postfix sequences of operand
+# evaluations, (operand, negated) with 0 the left operand and 1 the right one, and of _CONCAT
+# (conjunction) or _PRODUCT (disjunction) instructions.
+_Program = tuple[Any, ...]
+_P, _Q, _NOT_P, _NOT_Q = (0, False), (1, False), (0, True), (1, True)
+_CLAUSE_PROGRAMS: dict[tuple[ASTOperation, bool], _Program] = {
+    (ASTOperation.AND, False): (_P, _Q, _CONCAT),
+    (ASTOperation.AND, True): (_NOT_P, _NOT_Q, _PRODUCT),
+    (ASTOperation.OR, False): (_P, _Q, _PRODUCT),
+    (ASTOperation.OR, True): (_NOT_P, _NOT_Q, _CONCAT),
+    # P => Q == !P v Q
+    (ASTOperation.IMPLIES, False): (_NOT_P, _Q, _PRODUCT),
+    (ASTOperation.IMPLIES, True): (_P, _NOT_Q, _CONCAT),
+    (ASTOperation.REQUIRES, False): (_NOT_P, _Q, _PRODUCT),
+    (ASTOperation.REQUIRES, True): (_P, _NOT_Q, _CONCAT),
+    # P EXCLUDES Q == !P v !Q
+    (ASTOperation.EXCLUDES, False): (_NOT_P, _NOT_Q, _PRODUCT),
+    (ASTOperation.EXCLUDES, True): (_P, _Q, _CONCAT),
+    # P <=> Q == (!P v Q) ∧ (!Q v P)
+    (ASTOperation.EQUIVALENCE, False): (_NOT_P, _Q, _PRODUCT, _NOT_Q, _P, _PRODUCT, _CONCAT),
+    (ASTOperation.EQUIVALENCE, True): (_P, _NOT_Q, _CONCAT, _Q, _NOT_P, _CONCAT, _PRODUCT),
+    # P XOR Q == (P ∧ !Q) v (!P ∧ Q)
+    (ASTOperation.XOR, False): (_P, _NOT_Q, _CONCAT, _NOT_P, _Q, _CONCAT, _PRODUCT),
+    (ASTOperation.XOR, True): (_NOT_P, _Q, _PRODUCT, _P, _NOT_Q, _PRODUCT, _CONCAT),
+}
+
+
+def _clause_program(node: Node, negated: bool, in_clause: bool) -> Optional[list[Any]]:
+    """Postfix program computing the clauses of a connective, None for an atom."""
+    if node.data == ASTOperation.NOT:
+        return [(node.left, not negated, in_clause)]
+    program = _CLAUSE_PROGRAMS.get((node.data, negated))
+    if program is None:
+        return None
+    # Operands keep the context of a plain conjunction; those of a disjunction join clauses.
+    operand_in_clause = in_clause or _PRODUCT in program
+    operands = (node.left, node.right)
+    return [
+        step if isinstance(step, str) else (operands[step[0]], step[1], operand_in_clause)
+        for step in program
+    ]
+
+
+def _node_literal(node: Node, negated: bool, in_clause: bool) -> list[list[Any]]:
+    return [[Node(ASTOperation.NOT, node) if negated else node]]
+
+
+def _name_literal(node: Node, negated: bool, in_clause: bool) -> list[list[Any]]:
+    # Mirrors get_clauses on the tree the NNF/CNF conversion would build.
+    if negated:
+        return [[f"-{node.data}"]] if in_clause else [["-" + node.data]]
+    if node.is_term():
+        return [[node.data]]
+    if in_clause:
+        return [[f"-{node.left.data}"]]
+    return []
+
+
+def _balanced(op: ASTOperation, nodes: list[Node]) -> Node:
+    """``nodes`` joined with ``op`` in order, as a balanced tree (shallow for huge CNFs)."""
+    while len(nodes) > 1:
+        pairs = [Node(op, nodes[i], nodes[i + 1]) for i in range(0, len(nodes) - 1, 2)]
+        if len(nodes) % 2:
+            pairs.append(nodes[-1])
+        nodes = pairs
+    return nodes[0]
 
 
 TSEYTIN_AUX_PREFIX = "__tseytin_"
 
+# CNF methods that encode with gates, and their tseytin_cnf options.
+TSEYTIN_METHODS: dict[str, dict[str, bool]] = {
+    'tseytin': {},
+    'plaisted_greenbaum': {'polarity_aware': True, 'flatten': True},
+}
+
 
 def _negate_literal(literal: Any) -> Any:
     """Flip the sign of a CNF literal that uses the ``"-name"`` string convention."""
@@ -411,14 +638,16 @@ def _negate_literal(literal: Any) -> Any:
     return "-" + str(literal)
 
 
-def _tseytin_gate_clauses(op: ASTOperation, gate: Any, a: Any, b: Any) -> list[list[Any]]:
+def _tseytin_gate_clauses(
+    op: ASTOperation, gate: Any, a: Any, b: Any, negate: Callable[[Any], Any] = _negate_literal
+) -> list[list[Any]]:
     """Biconditional clauses encoding ``gate <=> (a op b)`` for a binary logical ``op``.
 
     ``a`` and ``b`` are literals; ``gate`` is the fresh auxiliary literal. Encoding each
     connective directly (rather than expanding it first) is what keeps the transformation
-    linear in the formula size.
+    linear in the formula size. ``negate`` flips a literal (``operator.neg`` for integers).
     """
-    g, na, nb, ng = gate, _negate_literal(a), _negate_literal(b), _negate_literal(gate)
+    g, na, nb, ng = gate, negate(a), negate(b), negate(gate)
     if op == ASTOperation.AND:
         return [[ng, a], [ng, b], [g, na, nb]]
     if op == ASTOperation.OR:
@@ -437,7 +666,142 @@ def _tseytin_gate_clauses(op: ASTOperation, gate: Any, a: Any, b: Any) -> list[l
     )
 
 
-def tseytin_cnf(ast: AST) -> tuple[list[list[Any]], list[str]]:
+def _nary_gate_clauses(
+    op: ASTOperation, gate: Any, operands: list[Any], negate: Callable[[Any], Any]
+) -> list[list[Any]]:
+    """Biconditional clauses encoding ``gate <=> op(operands)`` for an n-ary AND or OR."""
+    g, ng = gate, negate(gate)
+    if op == ASTOperation.AND:
+        return [[ng, operand] for operand in operands] + [[g, *map(negate, operands)]]
+    return [[g, negate(operand)] for operand in operands] + [[ng, *operands]]
+
+
+# Polarity of the operands of a connective relative to its own: 1 the same, -1 the opposite,
+# 0 both (the connective needs the operand to be true and false).
+_OPERAND_POLARITY: dict[ASTOperation, tuple[int, int]] = {
+    ASTOperation.AND: (1, 1),
+    ASTOperation.OR: (1, 1),
+    ASTOperation.IMPLIES: (-1, 1),
+    ASTOperation.REQUIRES: (-1, 1),
+    ASTOperation.EXCLUDES: (-1, -1),
+    ASTOperation.EQUIVALENCE: (0, 0),
+    ASTOperation.XOR: (0, 0),
+}
+_FLATTENED_OPERATORS = frozenset({ASTOperation.AND, ASTOperation.OR})
+
+
+def _chain_operands(node: Node) -> list[Node]:
+    """Operands of the maximal chain of ``node``'s associative operator, left to right."""
+    operands = []
+    stack = [node.right, node.left]
+    while stack:
+        child = stack.pop()
+        if child.is_binary_op() and child.data == node.data:
+            stack.append(child.right)
+            stack.append(child.left)
+        else:
+            operands.append(child)
+    return operands
+
+
+def _operands(node: Node, polarity: int, flatten: bool) -> list[tuple[Node, int]]:
+    """Operands of a binary connective to encode, with their polarities."""
+    signs = _OPERAND_POLARITY.get(node.data)
+    if signs is None or not node.is_binary_op():
+        raise FlamaException(
+            f"Operation '{node.data}' is not a propositional connective supported by the "
+            f"Tseytin transformation."
+        )
+    if flatten and node.data in _FLATTENED_OPERATORS:
+        return [(operand, polarity) for operand in _chain_operands(node)]
+    return [(node.left, polarity * signs[0]), (node.right, polarity * signs[1])]
+
+
+def _gate_clauses(
+    op: ASTOperation, gate: Any, operands: list[Any], polarity: int, negate: Callable[[Any], Any]
+) -> list[list[Any]]:
+    """Clauses of ``gate <=> op(operands)``; only those of ``gate => ...`` for a positive
+    ``polarity``, of ``... => gate`` for a negative one.
+    """
+    if len(operands) == 2:  # noqa: PLR2004
+        clauses = _tseytin_gate_clauses(op, gate, operands[0], operands[1], negate)
+    else:
+        clauses = _nary_gate_clauses(op, gate, operands, negate)
+    if polarity:
+        # Every clause starts with the gate literal: negated in those of gate => op(...).
+        side = negate(gate) if polarity > 0 else gate
+        clauses = [clause for clause in clauses if clause[0] == side]
+    return clauses
+
+
+def _shared_gate(gates: dict[tuple[Node, int], Any], node: Node, polarity: int) -> Any:
+    """Gate already encoding ``node`` with ``polarity`` (or both), None if there is none."""
+    gate = gates.get((node, polarity))
+    if gate is None and polarity:
+        gate = gates.get((node, 0))
+    return gate
+
+
+def _tseytin_encode(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    root: Node,
+    new_gate: Callable[[], Any],
+    add_clause: Callable[[list[Any]], None],
+    *,
+    term: Callable[[Node], Any] = attrgetter('data'),
+    negate: Callable[[Any], Any] = _negate_literal,
+    gates: Optional[dict[tuple[Node, int], Any]] = None,
+    polarity_aware: bool = False,
+    flatten: bool = False,
+) -> Any:
+    """Encode ``root`` with a gate per connective, in a post-order walk; return its literal.
+
+    ``term`` gives the literal of a variable and ``new_gate`` allocates the gate literals;
+    their clauses are passed to ``add_clause``. With ``gates``, a connective found there (by
+    node and polarity, or encoded for both polarities) reuses its gate, and the new gates are
+    added to it.
+
+    ``polarity_aware`` is the Plaisted-Greenbaum encoding: a gate that only occurs positively
+    (negatively) gets only the clauses of ``gate => subformula`` (``subformula => gate``).
+    Polarities are 1, -1, or 0 for both. ``flatten`` encodes a chain of ANDs (ORs) as a
+    single n-ary gate.
+    """
+    values: list[Any] = []
+    # (node, polarity, None) evaluates a node; (node, polarity, n) builds its gate from the
+    # literals of its n operands, on top of ``values``.
+    work: list[tuple[Node, int, Optional[int]]] = [(root, 1 if polarity_aware else 0, None)]
+    while work:
+        node, polarity, arity = work.pop()
+        if arity is not None:
+            operands = values[-arity:]
+            del values[-arity:]
+            if node.data == ASTOperation.NOT:
+                values.append(negate(operands[0]))
+                continue
+            gate = new_gate()
+            for clause in _gate_clauses(node.data, gate, operands, polarity, negate):
+                add_clause(clause)
+            if gates is not None:
+                gates[(node, polarity)] = gate
+            values.append(gate)
+        elif node.is_term():
+            values.append(term(node))
+        elif node.data == ASTOperation.NOT:
+            work.append((node, polarity, 1))
+            work.append((node.left, -polarity, None))
+        else:
+            gate = _shared_gate(gates, node, polarity) if gates is not None else None
+            if gate is not None:
+                values.append(gate)
+                continue
+            children = _operands(node, polarity, flatten)
+            work.append((node, polarity, len(children)))
+            work.extend((child, sign, None) for child, sign in reversed(children))
+    return values.pop()
+
+
+def tseytin_cnf(
+    ast: AST, *, polarity_aware: bool = False, flatten: bool = False
+) -> tuple[list[list[Any]], list[str]]:
     """Return an equisatisfiable CNF of ``ast`` using the Tseytin transformation.
 
     Unlike the distributive :func:`to_cnf`, this produces a CNF whose size is linear
@@ -448,6 +812,13 @@ def tseytin_cnf(ast: AST) -> tuple[list[list[Any]], list[str]]:
     original formula extends to exactly one model of the encoding; this preserves model
     counts and configuration enumeration (once auxiliary variables are projected out).
 
+    ``flatten=True`` encodes chains of ANDs (ORs) as one n-ary gate instead of a ladder of
+    binary ones, which preserves model counts too. ``polarity_aware=True`` is the
+    Plaisted-Greenbaum variant: every gate only gets the implication its polarity needs,
+    which roughly halves the clauses but keeps only satisfiability (a model of the formula
+    may extend to several models of the encoding). Use it for analyses that only solve for
+    satisfiability, such as satisfiable, dead or core features, not for counting.
+
     Returns a tuple ``(clauses, aux_names)`` where ``clauses`` is a list of clauses
     (each a list of literals in the same ``"-name"`` string convention as
     :func:`get_clauses`) and ``aux_names`` lists every auxiliary variable name
@@ -459,55 +830,45 @@ def tseytin_cnf(ast: AST) -> tuple[list[list[Any]], list[str]]:
     """
     clauses: list[list[Any]] = []
     aux_names: list[str] = []
-    counter = [0]
 
-    def literal_of(node: Node) -> Any:
-        if node.is_term():
-            return node.data
-        if node.data == ASTOperation.NOT:
-            # Negation of a single literal is free; no gate needed.
-            return _negate_literal(literal_of(node.left))
-        left_lit = literal_of(node.left)
-        right_lit = literal_of(node.right)
-        counter[0] += 1
-        gate = f"{TSEYTIN_AUX_PREFIX}{counter[0]}"
-        aux_names.append(gate)
-        clauses.extend(_tseytin_gate_clauses(node.data, gate, left_lit, right_lit))
-        return gate
-
-    root_literal = literal_of(ast.root)
+    def new_gate() -> str:
+        aux_names.append(f"{TSEYTIN_AUX_PREFIX}{len(aux_names) + 1}")
+        return aux_names[-1]
+
+    root_literal = _tseytin_encode(
+        ast.root, new_gate, clauses.append, polarity_aware=polarity_aware, flatten=flatten
+    )
     clauses.append([root_literal])  # assert the whole formula is true
     return clauses, aux_names
 
 
 def get_clauses(ast: AST) -> list[list[Any]]:
     """Return the list of clauses represented by the AST root node in conjunctive normal form."""
-    node = ast.root
     result = []
-    if node.is_term():
-        result = [[node.data]]
-    elif node.data == ASTOperation.NOT:
-        result = [["-" + node.left.data]]
-    elif node.data == ASTOperation.OR:
-        result = [get_clause_from_or_node(node)]
-    elif node.data == ASTOperation.AND:  # Each AND gives us two clauses
-        result.extend(get_clauses(AST(node.left)))
-        result.extend(get_clauses(AST(node.right)))
+    stack = [ast.root]
+    while stack:
+        node = stack.pop()
+        if node.is_term():
+            result.append([node.data])
+        elif node.data == ASTOperation.NOT:
+            result.append(["-" + node.left.data])
+        elif node.data == ASTOperation.OR:
+            result.append(get_clause_from_or_node(node))
+        elif node.data == ASTOperation.AND:  # Each AND gives us two clauses
+            stack.append(node.right)
+            stack.append(node.left)
     return result
 
 
 def get_clause_from_or_node(node: Node) -> list[Any]:
     clause = []
-    if node.left.is_op() and node.left.data == ASTOperation.OR:
-        # recursive OR belongs to the same clause
-        clause.extend(get_clause_from_or_node(node.left))
-    else:
-        term = node.left.data if node.left.is_term() else f"-{node.left.left.data}"
-        clause.append(term)
-    if node.right.is_op() and node.right.data == ASTOperation.OR:
-        # recursive OR belongs to the same clause
-        clause.extend(get_clause_from_or_node(node.right))
-    else:
-        term = node.right.data if node.right.is_term() else f"-{node.right.left.data}"
-        clause.append(term)
+    stack = [node.right, node.left]
+    while stack:
+        child = stack.pop()
+        if child.is_op() and child.data == ASTOperation.OR:
+            # nested OR belongs to the same clause
+            stack.append(child.right)
+            stack.append(child.left)
+        else:
+            clause.append(child.data if child.is_term() else f"-{child.left.data}")
     return clause
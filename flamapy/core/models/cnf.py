@@ -0,0 +1,339 @@
+"""Integer CNF: clauses as DIMACS literals in flat arrays.
+
+:meth:`AST.get_clauses` returns clauses of feature names, negated with a ``"-"`` prefix, and
+every solver backend maps those strings to its own integers afterwards. For big models that
+allocates millions of short-lived strings. :func:`int_cnf` instead numbers the variables in a
+:class:`VariableMap` (shared by all the constraints of a model) and appends the clauses to an
+:class:`IntCNF`, whose literals are the signed variable numbers of DIMACS in one
+``array('i')`` and whose clauses are delimited by an array of offsets. Tseytin auxiliaries are
+allocated as numbers, and have no name unless one is asked for.
+
+:class:`CNFBuilder` encodes all the constraints of a model into one clause database, sharing
+the auxiliary numbering and the gates of repeated subformulas across constraints, and keeps
+track of the clauses that define each gate.
+"""
+import bisect
+import operator
+from array import array
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.core.models.ast import (
+    AST,
+    TSEYTIN_AUX_PREFIX,
+    TSEYTIN_METHODS,
+    Node,
+    _tseytin_encode,
+    distribute_clauses,
+)
+
+
+class VariableMap:
+    """Bidirectional map between variable names and DIMACS variable numbers (from 1).
+
+    Auxiliary variables are numbered in the same sequence but have no name.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[Optional[str]] = [None]  # indexed by number; 0 is not a variable
+        for name in names:
+            self.id_of(name)
+
+    def id_of(self, name: str) -> int:
+        """Number of ``name``, allocating the next one if it has none yet."""
+        var = self._ids.get(name)
+        if var is None:
+            var = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return var
+
+    def get(self, name: str) -> Optional[int]:
+        """Number of ``name``, None if it has none."""
+        return self._ids.get(name)
+
+    def new_aux(self) -> int:
+        """Allocate a fresh auxiliary variable."""
+        self._names.append(None)
+        return len(self._names) - 1
+
+    def name_of(self, var: int) -> Optional[str]:
+        """Name of variable ``var`` (of either sign), None for an auxiliary variable."""
+        return self._names[abs(var)]
+
+    def is_aux(self, var: int) -> bool:
+        return self._names[abs(var)] is None
+
+    def literal(self, text: str) -> int:
+        """DIMACS literal of a literal in the ``"-name"`` convention of ``get_clauses``."""
+        if text.startswith("-"):
+            return -self.id_of(text[1:])
+        return self.id_of(text)
+
+    def names(self) -> dict[str, int]:
+        """The named variables and their numbers."""
+        return dict(self._ids)
+
+    def aux_ids(self) -> list[int]:
+        return [var for var in range(1, len(self._names)) if self._names[var] is None]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def _truncate(self, count: int) -> None:
+        """Forget the variables numbered above ``count``, named or auxiliary."""
+        for name in self._names[count + 1:]:
+            if name is not None:
+                del self._ids[name]
+        del self._names[count + 1:]
+
+    def __len__(self) -> int:
+        """Number of variables, auxiliary ones included (the largest variable number)."""
+        return len(self._names) - 1
+
+    def __repr__(self) -> str:
+        return f"VariableMap({len(self._ids)} named, {len(self) - len(self._ids)} auxiliary)"
+
+
+class IntCNF:
+    """Clauses of DIMACS literals over the variables of a :class:`VariableMap`.
+
+    ``literals`` holds the literals of all the clauses in order, and clause ``i`` is
+    ``literals[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, variables: Optional[VariableMap] = None) -> None:
+        self.variables = variables if variables is not None else VariableMap()
+        self.literals = array("i")
+        self.offsets = array("q", [0])
+
+    def add_clause(self, literals: Iterable[int]) -> None:
+        self.literals.extend(literals)
+        self.offsets.append(len(self.literals))
+
+    def add_clauses(self, clauses: Iterable[Iterable[int]]) -> None:
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def clause(self, index: int) -> "array[int]":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IntCNF clause index out of range")
+        return self.literals[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator["array[int]"]:
+        literals, offsets = self.literals, self.offsets
+        for index in range(len(offsets) - 1):
+            yield literals[offsets[index]:offsets[index + 1]]
+
+    def to_lists(self) -> list[list[int]]:
+        return [clause.tolist() for clause in self]
+
+    def to_names(self) -> list[list[str]]:
+        """The clauses in the ``"-name"`` convention of ``get_clauses``; auxiliary variables
+        are named after :data:`TSEYTIN_AUX_PREFIX` and their number.
+        """
+        variables = self.variables
+        names = [""] + [
+            variables.name_of(var) or f"{TSEYTIN_AUX_PREFIX}{var}"
+            for var in range(1, len(variables) + 1)
+        ]
+        return [
+            [names[literal] if literal > 0 else "-" + names[-literal] for literal in clause]
+            for clause in self
+        ]
+
+    def to_dimacs(self) -> str:
+        lines = [f"p cnf {len(self.variables)} {len(self)}"]
+        lines.extend(" ".join(map(str, clause)) + " 0" for clause in self)
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        return f"IntCNF({len(self)} clauses, {len(self.variables)} variables)"
+
+
+def int_cnf(
+    ast: AST,
+    method: str = 'distributive',
+    variables: Optional[VariableMap] = None,
+    cnf: Optional[IntCNF] = None,
+) -> IntCNF:
+    """The clauses of ``ast`` as DIMACS literals, appended to ``cnf`` (default: a new one over
+    ``variables``, by default a new map).
+
+    ``method`` is ``'distributive'``, ``'tseytin'`` or ``'plaisted_greenbaum'``, as in
+    :meth:`AST.get_clauses`; the clauses are those of ``get_clauses``, in the same order. Pass
+    the same ``cnf`` for all the constraints of a model to number their variables consistently.
+
+    Raises :class:`FlamaException` if the formula contains a non-propositional operator.
+    """
+    if cnf is None:
+        cnf = IntCNF(variables)
+    if method in TSEYTIN_METHODS:
+        _tseytin_into(cnf, ast.root, **TSEYTIN_METHODS[method])
+    else:
+        cnf.add_clauses(distribute_clauses(ast.root, _int_literal_of(cnf.variables)))
+    return cnf
+
+
+def _not_propositional(node: Node) -> FlamaException:
+    return FlamaException(f"'{node.data}' is not a propositional variable or connective.")
+
+
+def _int_literal_of(variables: VariableMap) -> Callable[[Node, bool, bool], list[list[int]]]:
+    def literal(node: Node, negated: bool, in_clause: bool) -> list[list[int]]:
+        if not node.is_term():
+            raise _not_propositional(node)
+        var = variables.id_of(node.data)
+        return [[-var if negated else var]]
+    return literal
+
+
+def _tseytin_into(
+    cnf: IntCNF,
+    root: Node,
+    gates: Optional[dict[tuple[Node, int], int]] = None,
+    new_gate: Optional[Callable[[], int]] = None,
+    /,
+    **options: bool,
+) -> None:
+    """Append the Tseytin encoding of ``root`` (see :func:`tseytin_cnf`, and its ``options``)
+    to ``cnf``, with the gates numbered in the order ``tseytin_cnf`` names them.
+
+    With ``gates``, a connective found there reuses its gate instead of being encoded again,
+    and the new gates are added to it. ``new_gate`` allocates the gates (default: new
+    auxiliary variables); the clauses defining a gate are added right after allocating it.
+    The last clause asserts ``root``.
+    """
+    variables = cnf.variables
+    root_literal = _tseytin_encode(
+        root, new_gate or variables.new_aux, cnf.add_clause,
+        term=lambda node: variables.id_of(node.data), negate=operator.neg, gates=gates,
+        **options,
+    )
+    cnf.add_clause((root_literal,))
+
+
+class CNFBuilder:
+    """Tseytin encoding of all the constraints of a model into a single :class:`IntCNF`.
+
+    Auxiliary variables are numbered once for the whole model, and a subformula that occurs
+    in several constraints (or twice in one) is encoded by a single gate: nodes are
+    hash-consed, so the gate of a subformula is found with a dictionary lookup.
+
+    Each constraint adds one clause asserting its root, and the clauses defining the gates it
+    does not share with earlier constraints. Gate definitions are recorded apart from the
+    constraints: :meth:`clauses_of` gives the clauses that encode a constraint on their own,
+    shared definitions included, and :meth:`constraint_of` maps the clause asserting a
+    constraint back to it.
+
+    ``method`` is ``'tseytin'`` (full biconditionals, which preserve the number of models) or
+    ``'plaisted_greenbaum'`` (polarity-aware, n-ary gates; for satisfiability only), see
+    :func:`tseytin_cnf`. Polarity-aware gates are shared between occurrences of the same
+    polarity, or with a gate encoded for both.
+    """
+
+    def __init__(
+        self, variables: Optional[VariableMap] = None, method: str = 'tseytin'
+    ) -> None:
+        if method not in TSEYTIN_METHODS:
+            raise ValueError(f"Unknown Tseytin method: {method!r}")
+        self.cnf = IntCNF(variables)
+        self.method = method
+        self.labels: list[Any] = []
+        self._roots = array("q")  # clause asserting each constraint
+        self._gates: dict[tuple[Node, int], int] = {}
+        self._definitions: dict[int, range] = {}  # clauses defining each gate
+
+    @property
+    def variables(self) -> VariableMap:
+        return self.cnf.variables
+
+    def add(self, ast: AST, label: Any = None) -> int:
+        """Encode a constraint and return its index; ``label`` identifies it in ``labels``.
+
+        Raises :class:`FlamaException`, adding nothing, if it is not propositional.
+        """
+        cnf, variables = self.cnf, self.variables
+        clauses, count, gates = len(cnf), len(variables), len(self._gates)
+        new_gates: list[tuple[int, int]] = []  # each gate and its first clause
+
+        def new_gate() -> int:
+            gate = variables.new_aux()
+            new_gates.append((gate, len(cnf)))
+            return gate
+
+        try:
+            _tseytin_into(cnf, ast.root, self._gates, new_gate, **TSEYTIN_METHODS[self.method])
+        except FlamaException:
+            self._rollback(clauses, count, gates)
+            raise
+        root = len(cnf) - 1
+        ends = [start for _, start in new_gates[1:]] + [root]
+        for (gate, start), end in zip(new_gates, ends):
+            self._definitions[gate] = range(start, end)
+        self._roots.append(root)
+        self.labels.append(label)
+        return len(self.labels) - 1
+
+    def add_all(self, asts: Iterable[AST]) -> list[int]:
+        return [self.add(ast) for ast in asts]
+
+    def _rollback(self, clauses: int, variables: int, gates: int) -> None:
+        cnf = self.cnf
+        del cnf.literals[cnf.offsets[clauses]:]
+        del cnf.offsets[clauses + 1:]
+        self.variables._truncate(variables)  # pylint: disable=protected-access
+        for node in list(self._gates)[gates:]:
+            del self._gates[node]
+
+    def clauses_of(self, constraint: int) -> list[int]:
+        """Indices in ``cnf`` of the clauses that encode a constraint on their own: the clause
+        asserting it and the definitions of the gates it depends on (see
+        :meth:`gate_clauses_of`), in order.
+        """
+        root = self._roots[constraint]
+        return [*self.gate_clauses_of(constraint), root]
+
+    def gate_clauses_of(self, constraint: int) -> list[int]:
+        """Indices in ``cnf`` of the clauses defining the gates a constraint depends on,
+        including the gates it shares with other constraints.
+        """
+        cnf, definitions = self.cnf, self._definitions
+        clauses: list[int] = []
+        seen: set[int] = set()
+        pending = [abs(cnf.clause(self._roots[constraint])[0])]
+        while pending:
+            gate = pending.pop()
+            if gate in seen or gate not in definitions:
+                continue
+            seen.add(gate)
+            clauses.extend(definitions[gate])
+            pending.extend(
+                abs(literal) for clause in definitions[gate] for literal in cnf.clause(clause)
+            )
+        return sorted(clauses)
+
+    def constraint_of(self, clause: int) -> Optional[int]:
+        """Index of the constraint that a clause of ``cnf`` asserts, None if the clause
+        defines a gate (which may be shared).
+        """
+        if not 0 <= clause < len(self.cnf):
+            raise IndexError("CNFBuilder clause index out of range")
+        constraint = bisect.bisect_left(self._roots, clause)
+        if constraint < len(self._roots) and self._roots[constraint] == clause:
+            return constraint
+        return None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "constraints": len(self.labels),
+            "clauses": len(self.cnf),
+            "variables": len(self.variables),
+            "gates": len(self._gates),
+            "literals": len(self.cnf.literals),
+        }
@@ -1,3 +1,4 @@
+import uuid
 from abc import ABC, abstractmethod
 
 
@@ -7,6 +8,32 @@ class VariabilityModel(ABC):
     def get_extension() -> str:
         """Plugin file extension"""
 
+    def fingerprint(self) -> str:
+        """Key identifying the content of the model, memoised on the instance.
+
+        Caches (transformations, results) and worker routing use it to tell whether two model
+        objects are the same. The memo is bound to the instance, so copies compute their own;
+        call `invalidate_fingerprint` after modifying the model in place.
+        """
+        memo = self.__dict__.get("_fingerprint")
+        if memo is None or memo[0] != id(self):
+            memo = (id(self), self.compute_fingerprint())
+            self.__dict__["_fingerprint"] = memo
+        fingerprint: str = memo[1]
+        return fingerprint
+
+    def compute_fingerprint(self) -> str:
+        """Compute the fingerprint of the model.
+
+        The default is a token unique to the instance, so distinct objects never share cached
+        results. Plugins override it with a hash of the model's content to deduplicate equal
+        models.
+        """
+        return f"{self.get_extension()}:{uuid.uuid4().hex}"
+
+    def invalidate_fingerprint(self) -> None:
+        self.__dict__.pop("_fingerprint", None)
+
 
 class VariabilityElement:
     def __init__(self, name: str) -> None:
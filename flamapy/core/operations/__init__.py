@@ -1,4 +1,5 @@
 from .abstract_operation import Operation
+from .anytime import AnytimeOperation, AnytimeResult, Budget  # pylint: disable=cyclic-import
 from .average_branching_factor import AverageBranchingFactor  # pylint: disable=cyclic-import
 from .commonality import Commonality  # pylint: disable=cyclic-import
 from .core_features import CoreFeatures  # pylint: disable=cyclic-import
@@ -22,11 +23,15 @@ from .attribute_optimization import (  # pylint: disable=cyclic-import
     OptimizationGoal,
 )
 from .descriptor import Input, OperationDescriptor, collect_descriptors
+from .pagination import Page, PageableOperation  # pylint: disable=cyclic-import
 
 __all__ = [
+    "AnytimeOperation",
+    "AnytimeResult",
     "AtomicSets",
     "AttributeOptimization",
     "AverageBranchingFactor",
+    "Budget",
     "Commonality",
     "Configurations",
     "ConfigurationsNumber",
@@ -43,6 +48,8 @@ __all__ = [
     "Operation",
     "OperationDescriptor",
     "OptimizationGoal",
+    "Page",
+    "PageableOperation",
     "Sampling",
     "Satisfiable",
     "SatisfiableConfiguration",
@@ -1,10 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
+from flamapy.core.cancellation import CancellationToken
 from flamapy.core.models import VariabilityModel
 
 
 class Operation(ABC):
+    # Polled by long-running backends through check_cancelled(); None means no limit.
+    cancellation: Optional[CancellationToken] = None
+    # False for operations whose result changes between runs (e.g. random estimates), so that
+    # the facade never serves them from the result cache or the analysis store.
+    cacheable: bool = True
+
     @abstractmethod
     def execute(self, model: VariabilityModel) -> "Operation":
         pass
@@ -12,3 +19,21 @@ class Operation(ABC):
     @abstractmethod
     def get_result(self) -> Any:
         pass
+
+    def set_cancellation(self, cancellation: Optional[CancellationToken]) -> None:
+        self.cancellation = cancellation
+
+    def set_timeout(self, timeout: Optional[float]) -> CancellationToken:
+        """Give the operation ``timeout`` seconds from now (None: no deadline)."""
+        token = CancellationToken(timeout)
+        self.set_cancellation(token)
+        return token
+
+    def check_cancelled(self) -> None:
+        """Raise OperationTimeout/OperationCancelled if the operation must stop.
+
+        Backends call it regularly in their inner loops (e.g. once per enumerated
+        configuration or solver call); it is cheap when no token is set.
+        """
+        if self.cancellation is not None:
+            self.cancellation.check()
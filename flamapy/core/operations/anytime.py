@@ -0,0 +1,122 @@
+"""Anytime protocol for long-running search operations.
+
+An :class:`AnytimeOperation` can be given a budget (seconds and/or iterations) with
+``set_budget``. Its implementation then stops searching when the budget is spent, instead of
+running to completion, and :meth:`AnytimeOperation.get_best_result` returns the best result
+found so far as an :class:`AnytimeResult`, together with an indicator of its quality: bounds,
+a confidence, or an optimality gap, depending on the operation.
+
+Implementations drive the protocol from their search loop::
+
+    while not self.budget_exhausted():
+        ...
+        self.report(best_so_far, lower_bound=..., upper_bound=...)
+    self.report(best, complete=True)
+
+Operations whose implementation does not support the protocol still run to completion, and
+``get_best_result`` wraps their final result as a complete one.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from flamapy.core.operations.abstract_operation import Operation
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Time (seconds) and/or number of iterations an anytime operation may spend."""
+
+    seconds: Optional[float] = None
+    iterations: Optional[int] = None
+
+
+@dataclass
+class AnytimeResult:
+    """Best result found within a budget.
+
+    ``complete`` is True when the search finished (the result is exact or optimal). Otherwise
+    the bounds enclose the exact value (e.g. the number of configurations, or the optimal
+    objective value), and ``confidence`` is the probability that they do, for estimates.
+    """
+
+    value: Any
+    complete: bool = False
+    lower_bound: Optional[float] = None
+    upper_bound: Optional[float] = None
+    confidence: Optional[float] = None
+    iterations: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def gap(self) -> Optional[float]:
+        """Relative optimality gap, ``(upper - lower) / max(|upper|, |lower|)``."""
+        if self.complete:
+            return 0.0
+        if self.lower_bound is None or self.upper_bound is None:
+            return None
+        scale = max(abs(self.lower_bound), abs(self.upper_bound))
+        return (self.upper_bound - self.lower_bound) / scale if scale else 0.0
+
+
+class AnytimeOperation(Operation):
+    """An operation that can return its best result so far when given a budget."""
+
+    budget: Optional[Budget] = None
+    _best: Optional[AnytimeResult] = None
+    _iterations: int = 0
+    _started: Optional[float] = None
+    _stopped: bool = False
+
+    def set_budget(self, seconds: Optional[float] = None,
+                   iterations: Optional[int] = None) -> None:
+        """Limit the search; the time budget starts now, so set it just before executing."""
+        self.budget = Budget(seconds, iterations)
+        self._best = None
+        self._iterations = 0
+        self._started = time.monotonic()
+        self._stopped = False
+
+    def budget_exhausted(self) -> bool:
+        """Count an iteration of the search and tell whether it must stop now.
+
+        A cancelled or expired cancellation token (see :meth:`Operation.check_cancelled`) also
+        ends the search, keeping the best result so far.
+        """
+        self._iterations += 1
+        token = self.cancellation
+        if token is not None and (token.cancelled or token.expired):
+            self._stopped = True
+        elif self.budget is not None:
+            budget, started = self.budget, self._started
+            self._stopped = (
+                (budget.iterations is not None and self._iterations > budget.iterations)
+                or (budget.seconds is not None and started is not None
+                    and time.monotonic() - started >= budget.seconds)
+            )
+        return self._stopped
+
+    def report(  # pylint: disable=too-many-arguments
+        self,
+        value: Any,
+        *,
+        complete: bool = False,
+        lower_bound: Optional[float] = None,
+        upper_bound: Optional[float] = None,
+        confidence: Optional[float] = None,
+    ) -> None:
+        """Record ``value`` as the best result so far (the implementation decides "best")."""
+        started = self._started if self._started is not None else time.monotonic()
+        self._best = AnytimeResult(
+            value, complete, lower_bound, upper_bound, confidence,
+            iterations=self._iterations, elapsed=time.monotonic() - started,
+        )
+
+    def get_best_result(self) -> AnytimeResult:
+        """The best result found so far; the final result if the implementation is not
+        anytime-aware (incomplete if the budget ran out before anything was reported).
+        """
+        if self._best is None:
+            return AnytimeResult(self.get_result(), complete=not self._stopped,
+                                 iterations=self._iterations)
+        return self._best
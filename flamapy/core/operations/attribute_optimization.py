@@ -2,7 +2,7 @@ from abc import abstractmethod
 from enum import Enum
 from typing import Any
 
-from flamapy.core.operations import Operation
+from flamapy.core.operations.anytime import AnytimeOperation
 from flamapy.core.operations.descriptor import OperationDescriptor, Input
 
 
@@ -29,11 +29,15 @@ def _attribute_optimization_result(result: Any) -> Any:
     return [item[0] if isinstance(item, tuple) else item for item in result]
 
 
-class AttributeOptimization(Operation):
+class AttributeOptimization(AnytimeOperation):
     """Return the configuration(s) that optimize the given numeric feature attribute(s).
 
     Attributes are identified by name and mapped to an :class:`OptimizationGoal`. The
     objective for each attribute is the sum of its values over the selected features.
+
+    Under a budget (see :class:`AnytimeOperation`), the best result is the best
+    configuration(s) found so far; for a single objective, the bounds are the objective value
+    of that configuration and the best value still possible, so ``gap`` is the optimality gap.
     """
 
     facade = OperationDescriptor(
@@ -1,11 +1,27 @@
 from abc import abstractmethod
+from itertools import islice
+from typing import Any, Iterator, Optional, Sequence, Union
 
-from flamapy.core.operations import Operation
+from flamapy.core.buffers import collect
 from flamapy.core.operations.descriptor import OperationDescriptor
+from flamapy.core.operations.pagination import PAGE_INPUTS, Page, PageableOperation
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
 
 
-class Configurations(Operation):
+class Configurations(PageableOperation):
+    """The configurations (products) of a model.
+
+    Implementations override ``iter_configurations`` to enumerate lazily, so that models with
+    millions of products can be streamed with bounded memory (``execute`` then only prepares
+    the enumeration), or ``get_configurations`` to return them all at once. Results can be
+    paged with cursors (see :mod:`flamapy.core.operations.pagination`).
+
+    ``get_result`` returns ``get_configurations``, which collects the enumeration into a
+    buffer that spills to disk beyond the configured memory budget (see
+    :mod:`flamapy.core.buffers`). Implementations that override ``get_configurations`` or
+    ``get_result`` to return their own list opt out of spilling.
+    """
+
     facade = OperationDescriptor(
         doc=(
             'These are the individual outcomes that can be produced from a feature model.\n'
@@ -15,15 +31,39 @@ class Configurations(Operation):
             '``backend`` selects the analysis plugin ("sat", "bdd" or "z3"); defaults to\n'
             'bdd.'
         ),
-        returns='Union[None, List[Configuration]]',
+        returns='Union[None, List[Configuration], Page]',
         name='configurations', operation='Configurations', default_backend='bdd',
         selectable_backend=True,
+        pageable=True,
+        inputs=PAGE_INPUTS,
     )
 
     @abstractmethod
     def __init__(self) -> None:
         pass
 
-    @abstractmethod
-    def get_configurations(self) -> list[Configuration]:
-        pass
+    def iter_configurations(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> Iterator[Configuration]:
+        """The configurations from ``offset`` on, at most ``limit`` of them."""
+        if type(self).get_configurations is Configurations.get_configurations:
+            raise NotImplementedError(
+                f"{type(self).__name__} must override iter_configurations or get_configurations"
+            )
+        stop = offset + limit if limit is not None else None
+        return islice(self.get_configurations(), offset, stop)
+
+    def get_configurations(self) -> Sequence[Configuration]:
+        """All the configurations, materialised in a list (or, beyond the configured memory
+        budget, in a ResultBuffer spilled to disk, see :mod:`flamapy.core.buffers`).
+        """
+        return collect(self.iter_configurations())
+
+    def get_result(self) -> Union[Sequence[Configuration], Page]:
+        """The configurations or, with a page size, the page after the cursor."""
+        if self.page_size is not None:
+            return self.get_page()
+        return self.get_configurations()
+
+    def iter_from_cursor(self) -> Iterator[Any]:
+        return self.iter_configurations(offset=self.cursor_state.get("offset", 0))
@@ -1,10 +1,16 @@
 from abc import abstractmethod
 from typing import Any
 
-from flamapy.core.operations import Operation
+from flamapy.core.operations.anytime import AnytimeOperation
 
 
-class ErrorDiagnosis(Operation):
+class ErrorDiagnosis(AnytimeOperation):
+    """Diagnosis messages explaining the errors of a model.
+
+    Under a budget (see :class:`AnytimeOperation`), the best result is the messages found so
+    far; ``lower_bound`` is the number of elements checked and ``upper_bound`` their total.
+    """
+
     @abstractmethod
     def __init__(self) -> None:
         pass
@@ -1,9 +1,17 @@
 from abc import abstractmethod
 
-from flamapy.core.operations import Operation
+from flamapy.core.operations.anytime import AnytimeOperation
 
 
-class EstimatedConfigurationsNumber(Operation):
+class EstimatedConfigurationsNumber(AnytimeOperation):
+    """Estimate of the number of configurations of a model.
+
+    Under a budget (see :class:`AnytimeOperation`), the best result is the current estimate,
+    with ``lower_bound``/``upper_bound`` enclosing the exact number with ``confidence``.
+    """
+
+    cacheable = False
+
     @abstractmethod
     def __init__(self) -> None:
         pass
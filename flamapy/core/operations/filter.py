@@ -1,11 +1,20 @@
 from abc import abstractmethod
-from typing import Any
+from itertools import islice
+from typing import Any, Iterator, Optional, Sequence, Union
 
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
-from flamapy.core.operations import Operation
+from flamapy.core.buffers import collect
+from flamapy.core.operations.pagination import Page, PageableOperation
 
 
-class Filter(Operation):
+class Filter(PageableOperation):
+    """The products of a model that match a (partial) configuration.
+
+    As for :class:`Configurations`, implementations override either ``iter_filter_products``
+    (to stream) or ``get_filter_products``, results can be paged with cursors, and
+    ``get_result`` spills to disk unless an implementation returns its own list.
+    """
+
     @abstractmethod
     def __init__(self) -> None:
         pass
@@ -14,6 +23,26 @@ class Filter(Operation):
     def set_configuration(self, configuration: Configuration) -> None:
         pass
 
-    @abstractmethod
-    def get_filter_products(self) -> list[Any]:
-        pass
+    def iter_filter_products(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> Iterator[Any]:
+        """The matching products from ``offset`` on, at most ``limit`` of them."""
+        if type(self).get_filter_products is Filter.get_filter_products:
+            raise NotImplementedError(
+                f"{type(self).__name__} must override iter_filter_products or get_filter_products"
+            )
+        stop = offset + limit if limit is not None else None
+        return islice(self.get_filter_products(), offset, stop)
+
+    def get_filter_products(self) -> Sequence[Any]:
+        """All the matching products, materialised as by Configurations.get_configurations."""
+        return collect(self.iter_filter_products())
+
+    def get_result(self) -> Union[Sequence[Any], Page]:
+        """The matching products or, with a page size, the page after the cursor."""
+        if self.page_size is not None:
+            return self.get_page()
+        return self.get_filter_products()
+
+    def iter_from_cursor(self) -> Iterator[Any]:
+        return self.iter_filter_products(offset=self.cursor_state.get("offset", 0))
@@ -4,6 +4,7 @@ import json
 
 from typing import Any, Optional, Collection, Type
 
+from flamapy.core.cache import M2M_CACHE
 from flamapy.core.exceptions import FlamaException
 from flamapy.core.transformations.model_to_model import ModelToModel
 from flamapy.core.operations import Operation
@@ -41,6 +42,7 @@ class Metrics(Operation, metaclass=ABCMeta):
         # Identifying all implementations of MetricsOperation
 
         for subclass in Metrics.__subclasses__():
+            self.check_cancelled()
             # We first have to identify the metamodels that are being used and
             # transform this model to the correspointing metamodel
             metrics_operation = subclass()  # type: ignore
@@ -50,15 +52,17 @@ class Metrics(Operation, metaclass=ABCMeta):
                 # Then we calculate the metrics for each metamodel
                 sub_metric = subclass()  # type: ignore
                 sub_metric.filter = self.filter
+                sub_metric.cancellation = self.cancellation
                 self.result.extend(sub_metric.calculate_metamodel_metrics(model))
             else:
                 # If not, search a transformation, transform and call the calutation
                 m_to_m = self._search_transformations(
                     self.model.__class__.get_extension(), metrics_operation.model_type_extension
                 )
-                dest_model = m_to_m(self.model).transform()
+                dest_model = M2M_CACHE.transform(m_to_m, self.model)
                 sub_metric = subclass()  # type: ignore
                 sub_metric.filter = self.filter
+                sub_metric.cancellation = self.cancellation
                 self.result.extend(sub_metric.calculate_metamodel_metrics(dest_model))
         return self
 
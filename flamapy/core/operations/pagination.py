@@ -0,0 +1,111 @@
+"""Cursor-based pagination of enumeration results.
+
+A :class:`PageableOperation` returns its result one :class:`Page` at a time. Every page carries
+an opaque cursor (URL-safe base64 of a small JSON document) from which the next page resumes,
+so a server or CLI client can browse the configurations of a model without keeping the
+operation alive between requests.
+
+The cursor holds the enumeration state the operation needs to resume. By default it is the
+number of items already returned, which resumes by skipping them; implementations with a
+native enumeration state (the blocking clauses of a SAT enumeration, the position in the paths
+of a BDD) override :meth:`PageableOperation.next_cursor_state` to store it, and
+:meth:`PageableOperation.iter_from_cursor` to resume from it without re-enumerating the
+previous pages. A :class:`~flamapy.core.operations.Sampling` cursor also stores the seed its
+sample is drawn from.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterator, Optional
+
+from flamapy.core.exceptions import InvalidCursor
+from flamapy.core.operations.abstract_operation import Operation
+from flamapy.core.operations.descriptor import Input
+
+
+CURSOR_VERSION = 1
+
+# Facade inputs of the pageable operations; without a page_size the whole result is returned.
+PAGE_INPUTS = (
+    Input('page_size', int, default=None, setter='set_page_size'),
+    Input('cursor', str, default=None, setter='set_cursor'),
+)
+
+
+@dataclass
+class Page:
+    """Some items of a result, and the cursor of the next page (None on the last page)."""
+
+    items: list[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(operation: str, state: dict[str, Any]) -> str:
+    """Cursor resuming ``operation`` (a name) from a JSON-serialisable state."""
+    document = {"v": CURSOR_VERSION, "op": operation, "state": state}
+    payload = json.dumps(document, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(operation: str, cursor: str) -> dict[str, Any]:
+    """The state stored in a cursor of ``operation``; InvalidCursor if it is not one."""
+    try:
+        document = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, binascii.Error) as exception:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}") from exception
+    if not isinstance(document, dict) or document.get("v") != CURSOR_VERSION:
+        raise InvalidCursor("Unsupported cursor version")
+    if document.get("op") != operation:
+        raise InvalidCursor(f"The cursor belongs to {document.get('op')}, not {operation}")
+    state = document.get("state")
+    if not isinstance(state, dict):
+        raise InvalidCursor("The cursor has no state")
+    return state
+
+
+class PageableOperation(Operation):
+    """An operation whose result can be returned page by page, see :meth:`get_page`.
+
+    With a page size (the ``page_size`` facade input), ``get_result`` returns the page after
+    the cursor instead of the whole result. An implementation whose ``execute`` returns
+    another operation carries ``page_size`` and ``cursor_state`` over to it.
+    """
+
+    page_size: Optional[int] = None
+    cursor_state: dict[str, Any] = {}  # replaced by set_cursor, never mutated
+
+    @classmethod
+    def cursor_name(cls) -> str:
+        """Name stored in the cursors, so they cannot be replayed on another operation."""
+        for klass in cls.__mro__:
+            if PageableOperation in klass.__bases__:
+                return klass.__name__
+        return cls.__name__
+
+    def set_page_size(self, page_size: Optional[int]) -> None:
+        self.page_size = page_size
+
+    def set_cursor(self, cursor: Optional[str]) -> None:
+        """Resume after the page that returned ``cursor`` (None: from the start)."""
+        self.cursor_state = decode_cursor(self.cursor_name(), cursor) if cursor else {}
+
+    def iter_from_cursor(self) -> Iterator[Any]:
+        """Items of the result from the position stored in ``cursor_state`` on."""
+        raise NotImplementedError
+
+    def next_cursor_state(self, returned: int) -> dict[str, Any]:
+        """State of the cursor after ``returned`` more items."""
+        return {"offset": self.cursor_state.get("offset", 0) + returned}
+
+    def get_page(self, page_size: Optional[int] = None) -> Page:
+        """The next ``page_size`` items (default: ``set_page_size``) of the executed operation."""
+        size = page_size if page_size is not None else self.page_size
+        if size is None or size < 1:
+            raise ValueError("The page size must be a positive integer")
+        items = list(islice(self.iter_from_cursor(), size + 1))
+        if len(items) <= size:
+            return Page(items)
+        items = items[:size]
+        return Page(items, encode_cursor(self.cursor_name(), self.next_cursor_state(size)))
@@ -1,15 +1,36 @@
+import random
 from abc import abstractmethod
+from itertools import islice
+from typing import Any, Iterator, Optional, Sequence, Union
 
 from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
-from flamapy.core.operations import Operation
+from flamapy.core.buffers import collect
+from flamapy.core.exceptions import InvalidCursor
+from flamapy.core.operations.anytime import AnytimeOperation
 from flamapy.core.operations.descriptor import OperationDescriptor, Input
+from flamapy.core.operations.pagination import PAGE_INPUTS, Page, PageableOperation
 
 
-class Sampling(Operation):
+class Sampling(AnytimeOperation, PageableOperation):
     """Sampling is the selection of a subset (i.e., a sample) of products
     (or configurations) from within a variability model.
+
+    Under a budget (see :class:`AnytimeOperation`), the best result is the part of the sample
+    drawn so far; ``lower_bound`` is its size and ``upper_bound`` the requested size.
+
+    As for :class:`Configurations`, implementations override either ``iter_sample`` (to draw
+    the sample lazily) or ``get_sample``, and ``get_result`` spills the sample to disk beyond
+    the configured memory budget unless an implementation returns its own list.
+
+    The sample can be paged with cursors (see :mod:`flamapy.core.operations.pagination`).
+    A cursor stores the ``seed`` of the sample and a position in it, and resuming draws the
+    sample again from that seed, so implementations must draw the same sample for the same
+    ``seed`` (e.g. from ``random.Random(self.seed)``). A cursor without a seed is rejected.
     """
 
+    cacheable = False
+    seed: Optional[int] = None
+
     facade = OperationDescriptor(
         doc=(
             'Returns a random sample of valid configurations of the given size. When\n'
@@ -19,12 +40,16 @@ class Sampling(Operation):
             'implement (deterministic/enumerating) sampling; "sharpsat" provides almost-\n'
             'uniform sampling via the optional flamapy-sharpsat plugin.'
         ),
-        returns='Union[None, List[Configuration]]',
+        returns='Union[None, List[Configuration], Page]',
         name='sampling', operation='Sampling', default_backend='bdd',
         selectable_backend=True,
+        cacheable=False,
+        pageable=True,
         inputs=(
             Input('size', int, required=True, setter='set_sample_size'),
             Input('with_replacement', bool, default=False, setter='set_with_replacement'),
+            Input('seed', int, default=None, setter='set_seed'),
+            *PAGE_INPUTS,
         ),
     )
 
@@ -44,6 +69,50 @@ class Sampling(Operation):
     def set_partial_configuration(self, partial_configuration: Configuration) -> None:
         "From which the sample is built (default empty configuration)."
 
-    @abstractmethod
-    def get_sample(self) -> list[Configuration]:
-        """Return a sample of configurations."""
+    def iter_sample(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> Iterator[Configuration]:
+        """The configurations of the sample from ``offset`` on, at most ``limit`` of them."""
+        if type(self).get_sample is Sampling.get_sample:
+            raise NotImplementedError(
+                f"{type(self).__name__} must override iter_sample or get_sample"
+            )
+        stop = offset + limit if limit is not None else None
+        return islice(self.get_sample(), offset, stop)
+
+    def get_sample(self) -> Sequence[Configuration]:
+        """Return a sample of configurations, collected as by Configurations.get_configurations."""
+        return collect(self.iter_sample())
+
+    def get_result(self) -> Union[Sequence[Configuration], Page]:
+        """The sample or, with a page size, the page after the cursor."""
+        if self.page_size is not None:
+            return self.get_page()
+        return self.get_sample()
+
+    def set_seed(self, seed: Optional[int]) -> None:
+        """Seed of the random choices of the sample (default None: not reproducible)."""
+        self.seed = seed
+
+    def set_cursor(self, cursor: Optional[str]) -> None:
+        """Resume after the page that returned ``cursor``, drawing the sample from its seed.
+
+        Without a cursor, a seed is chosen (unless one was set) so that the pages can resume.
+        """
+        super().set_cursor(cursor)
+        if not self.cursor_state:
+            if self.seed is None:
+                self.seed = random.getrandbits(63)
+            return
+        seed = self.cursor_state.get("seed")
+        if not isinstance(seed, int):
+            raise InvalidCursor("The cursor does not store the seed of the sample")
+        self.seed = seed
+
+    def iter_from_cursor(self) -> Iterator[Any]:
+        return self.iter_sample(offset=self.cursor_state.get("offset", 0))
+
+    def next_cursor_state(self, returned: int) -> dict[str, Any]:
+        if self.seed is None:
+            raise ValueError("Set a seed or a cursor before executing a sample to be paged")
+        return {**super().next_cursor_state(returned), "seed": self.seed}
@@ -0,0 +1,107 @@
+"""Planning of model-to-model transformation chains.
+
+The m2m transformations of all plugins form a graph whose nodes are model extensions. To run an
+operation on a model whose plugin does not implement it, the model is converted along the
+cheapest path to the extension of a plugin that does. Edge costs are the measured durations of
+the transformations when known. Declared ``cost`` values have no unit, so the other edges are
+estimated in seconds by scaling their declared cost with the ratio of the measured durations to
+the declared costs of the measured edges (before any measurement, declared costs are compared
+as they are).
+"""
+import heapq
+import itertools
+from typing import Collection, Iterable, Optional
+
+from flamapy.core.lazy import LazyTransformation
+
+
+# Weight of a new measurement in the running average of a transformation's duration.
+MEASUREMENT_WEIGHT = 0.3
+
+
+class TransformationPlanner:
+    def __init__(self, transformations: Iterable[LazyTransformation]) -> None:
+        self.edges: dict[str, list[LazyTransformation]] = {}
+        for transformation in transformations:
+            if transformation.source is None or transformation.destination is None:
+                continue
+            self.edges.setdefault(transformation.source, []).append(transformation)
+        self.measured_costs: dict[tuple[str, str], float] = {}
+        # Declared cost of every edge (the cheapest transformation, if there are several).
+        self.declared_costs: dict[tuple[str, str], float] = {}
+        for source, outgoing in self.edges.items():
+            for transformation in outgoing:
+                edge = (source, str(transformation.destination))
+                cost = self.declared_costs.get(edge, transformation.cost)
+                self.declared_costs[edge] = min(cost, transformation.cost)
+
+    def seconds_per_cost_unit(self) -> float:
+        """Estimated duration of a unit of declared cost, from the measured edges."""
+        declared = sum(self.declared_costs.get(edge, 0.0) for edge in self.measured_costs)
+        if declared <= 0:
+            return 1.0
+        return sum(self.measured_costs.values()) / declared
+
+    def edge_cost(self, transformation: LazyTransformation, scale: Optional[float] = None) -> float:
+        """Measured duration of an edge, or its declared cost times ``scale`` (default:
+        :meth:`seconds_per_cost_unit`).
+        """
+        edge = (str(transformation.source), str(transformation.destination))
+        measured = self.measured_costs.get(edge)
+        if measured is not None:
+            return measured
+        if scale is None:
+            scale = self.seconds_per_cost_unit()
+        return transformation.cost * scale
+
+    def record_cost(self, source: str, destination: str, seconds: float) -> bool:
+        """Record a measured duration of the ``source -> destination`` transformation.
+
+        Returns True when this is the first measurement of the edge, i.e. when previously
+        planned routes may no longer be the cheapest (later measurements refine the durations,
+        and the scale of the declared costs, without re-planning).
+        """
+        edge = (source, destination)
+        previous = self.measured_costs.get(edge)
+        if previous is None:
+            self.measured_costs[edge] = seconds
+            return True
+        self.measured_costs[edge] = previous + MEASUREMENT_WEIGHT * (seconds - previous)
+        return False
+
+    def plan(
+        self, source: str, targets: Collection[str]
+    ) -> Optional[list[LazyTransformation]]:
+        """Cheapest chain of transformations from ``source`` to any of the ``targets``.
+
+        Returns an empty list if ``source`` is already a target, and None if no target is
+        reachable.
+        """
+        if source in targets:
+            return []
+        counter = itertools.count()  # tie-breaker, keeps the heap from comparing routes
+        queue: list[tuple[float, int, str, list[LazyTransformation]]] = [
+            (0.0, next(counter), source, [])
+        ]
+        settled: set[str] = set()
+        scale = self.seconds_per_cost_unit()
+        while queue:
+            cost, _, extension, route = heapq.heappop(queue)
+            if extension in settled:
+                continue
+            if extension in targets:
+                return route
+            settled.add(extension)
+            for transformation in self.edges.get(extension, ()):
+                destination = str(transformation.destination)
+                if destination not in settled:
+                    heapq.heappush(
+                        queue,
+                        (
+                            cost + self.edge_cost(transformation, scale),
+                            next(counter),
+                            destination,
+                            [*route, transformation],
+                        ),
+                    )
+        return None
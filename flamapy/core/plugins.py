@@ -1,66 +1,174 @@
+from dataclasses import dataclass, field
 from types import ModuleType
-from typing import Any, Callable, Type, cast
+from typing import Any, Callable, Iterable, Optional, Type, TypeVar, Union
 from collections import UserList
 
+from flamapy.core.cache import M2M_CACHE, PARSE_CACHE
 from flamapy.core.exceptions import (
     OperationNotFound,
     PluginNotFound,
     TransformationNotFound,
 )
+from flamapy.core.lazy import (
+    LazyClass,
+    LazyOperation,
+    LazyTransformation,
+    LazyVariabilityModel,
+    import_stats,
+)
 from flamapy.core.models import VariabilityModel
 from flamapy.core.operations import Operation
-from flamapy.core.transformations import (
-    TextToModel,
-    Transformation,
-    ModelToText,
-    ModelToModel,
-)
-from flamapy.core.utils import filename_matches_extension
+from flamapy.core.planner import TransformationPlanner
+from flamapy.core.transformations import Transformation
+from flamapy.core.utils import filename_extensions, filename_matches_extension
+
+
+_T = TypeVar("_T")
+
+
+class IndexedList(UserList[_T]):
+    """A list that keeps lookup indexes over its items and drops them whenever it changes.
+
+    Subclasses build their index lazily in ``_build_index``.
+    """
+
+    _index: Any = None
+
+    def _build_index(self) -> Any:
+        raise NotImplementedError
+
+    def get_index(self) -> Any:
+        index = self._index
+        if index is None:
+            index = self._index = self._build_index()
+        return index
+
+    def invalidate_index(self) -> None:
+        self._index = None
+
+    def __setitem__(self, i: Any, item: Any) -> None:
+        super().__setitem__(i, item)
+        self.invalidate_index()
+
+    def __delitem__(self, i: Any) -> None:
+        super().__delitem__(i)
+        self.invalidate_index()
+
+    def __iadd__(self, other: Iterable[_T]) -> Any:
+        result = super().__iadd__(other)
+        self.invalidate_index()
+        return result
+
+    def append(self, item: _T) -> None:
+        super().append(item)
+        self.invalidate_index()
+
+    def insert(self, i: int, item: _T) -> None:
+        super().insert(i, item)
+        self.invalidate_index()
+
+    def pop(self, i: int = -1) -> _T:
+        item = super().pop(i)
+        self.invalidate_index()
+        return item
+
+    def remove(self, item: _T) -> None:
+        super().remove(item)
+        self.invalidate_index()
+
+    def clear(self) -> None:
+        super().clear()
+        self.invalidate_index()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.invalidate_index()
+
+    def sort(self, *args: Any, **kwds: Any) -> None:
+        super().sort(*args, **kwds)
+        self.invalidate_index()
 
+    def extend(self, other: Iterable[_T]) -> None:
+        super().extend(other)
+        self.invalidate_index()
 
-class Transformations(UserList[Type[Transformation]]):
-    data: list[Type[Transformation]]
 
+class Transformations(UserList[LazyTransformation]):
+    data: list[LazyTransformation]
 
-class Operations(UserList[Type[Operation]]):
-    data: list[Type[Operation]]
 
-    def search_by_name(self, name: str) -> Type[Operation]:
-        candidates: filter[Type[Operation]] = filter(
-            lambda op: name in [op.__name__, op.__base__.__name__ if op.__base__ else ""], self.data
-        )
+class Operations(IndexedList[LazyOperation]):
+    data: list[LazyOperation]
 
-        operation = next(candidates, None)
+    def _build_index(self) -> dict[str, LazyOperation]:
+        index: dict[str, LazyOperation] = {}
+        for operation in self.data:
+            for name in operation.names:
+                index.setdefault(name, operation)
+        return index
+
+    def has_name(self, name: str) -> bool:
+        return name in self.get_index()
+
+    def search_by_name(self, name: str) -> LazyOperation:
+        operation: Optional[LazyOperation] = self.get_index().get(name)
         if not operation:
             raise OperationNotFound(f"Operation '{name}' not found.")
         return operation
 
 
 class Plugin:
+    """A metamodel plugin: its variability model, operations and transformations.
+
+    Operations and transformations are kept as lazy entries (see :mod:`flamapy.core.lazy`);
+    their modules are imported only when an operation or transformation is actually used.
+    """
+
     def __init__(self, module: ModuleType) -> None:
         self.module: ModuleType = module
-        self.variability_model: VariabilityModel = None  # type: ignore
+        self.variability_model_entry: Optional[LazyVariabilityModel] = None
         self.operations: Operations = Operations()
         self.transformations: Transformations = Transformations()
 
+    @property
+    def variability_model(self) -> Any:
+        """The variability model class of the plugin (imported on access), or None."""
+        if self.variability_model_entry is None:
+            return None
+        return self.variability_model_entry.load()
+
+    @variability_model.setter
+    def variability_model(
+        self, variability_model: Union[Type[VariabilityModel], LazyVariabilityModel]
+    ) -> None:
+        if not isinstance(variability_model, LazyVariabilityModel):
+            variability_model = LazyVariabilityModel.from_class(variability_model)
+        self.variability_model_entry = variability_model
+
     def __get_transformation(
         self, filter_transformation: Callable[..., bool]
-    ) -> Type[Transformation]:
+    ) -> LazyTransformation:
         candidates = filter(filter_transformation, self.transformations)
         transformation = next(candidates, None)
         if not transformation:
             raise TransformationNotFound
         return transformation
 
-    def append_operation(self, operation: Type[Operation]) -> None:
+    def append_operation(self, operation: Union[Type[Operation], LazyOperation]) -> None:
+        if not isinstance(operation, LazyOperation):
+            operation = LazyOperation.from_class(operation)
         self.operations.append(operation)
 
-    def append_transformations(self, transformation: Type[Transformation]) -> None:
+    def append_transformations(
+        self, transformation: Union[Type[Transformation], LazyTransformation]
+    ) -> None:
+        if not isinstance(transformation, LazyTransformation):
+            transformation = LazyTransformation.from_class(transformation)
         self.transformations.append(transformation)
 
     def get_operation(self, name: str) -> Operation:
-        operation = self.operations.search_by_name(name)
-        return operation()
+        operation: Operation = self.operations.search_by_name(name)()
+        return operation
 
     def use_operation(self, operation: Operation, src: VariabilityModel) -> Operation:
         return operation.execute(model=src)
@@ -70,87 +178,210 @@ class Plugin:
         candidates = [
             transformation
             for transformation in self.transformations
-            if issubclass(transformation, TextToModel)
-            and filename_matches_extension(src, transformation.get_source_extension())
+            if transformation.kind == "t2m"
+            and filename_matches_extension(src, str(transformation.source))
         ]
         if not candidates:
             raise TransformationNotFound
-        transformation = max(candidates, key=lambda t: len(t.get_source_extension()))
-        result = transformation(src)
-        return result.transform()
+        transformation = max(candidates, key=lambda t: len(str(t.source)))
+        return PARSE_CACHE.transform(transformation, src)
 
     def use_transformation_m2t(self, src: VariabilityModel, dst: str) -> str:
         # Prefer the most specific matching extension (e.g. 'uvl.json' over 'json').
         candidates = [
             transformation
             for transformation in self.transformations
-            if issubclass(transformation, ModelToText)
-            and filename_matches_extension(dst, transformation.get_destination_extension())
+            if transformation.kind == "m2t"
+            and filename_matches_extension(dst, str(transformation.destination))
         ]
         if not candidates:
             raise TransformationNotFound
-        transformation = max(candidates, key=lambda t: len(t.get_destination_extension()))
+        transformation = max(candidates, key=lambda t: len(str(t.destination)))
         result = transformation(path=dst, source_model=src)
-        return result.transform()
+        text: str = result.transform()
+        return text
 
     def use_transformation_m2m(self, src: VariabilityModel, dst: str) -> VariabilityModel:
-        def filter_transformations(transformation: Type[Transformation]) -> bool:
+        def filter_transformations(transformation: LazyTransformation) -> bool:
             return (
-                issubclass(transformation, ModelToModel)
-                and transformation.get_destination_extension() == dst
-                and transformation.get_source_extension() == src.get_extension()
+                transformation.kind == "m2m"
+                and transformation.destination == dst
+                and transformation.source == src.get_extension()
             )
 
-        transformation: Type[ModelToModel] = cast(
-            Type[ModelToModel], self.__get_transformation(filter_transformations)
-        )
-        result = transformation(src)
-        return result.transform()
+        transformation = self.__get_transformation(filter_transformations)
+        model: VariabilityModel = M2M_CACHE.transform(transformation, src)
+        return model
 
     def get_extension(self) -> str:
-        return self.variability_model.get_extension()
+        if self.variability_model_entry is None:
+            raise AttributeError(f"Plugin '{self.name}' has no variability model")
+        return self.variability_model_entry.get_extension()
 
     @property
     def name(self) -> str:
         return self.module.__name__.split(".")[-1]
 
+    def get_entries(self) -> list[LazyClass]:
+        entries: list[LazyClass] = [*self.operations, *self.transformations]
+        if self.variability_model_entry is not None:
+            entries.append(self.variability_model_entry)
+        return entries
+
     def get_stats(self) -> dict[str, Any]:
         return {
             "amount_operations": len(self.operations),
             "amount_transformations": len(self.transformations),
-            "variability_model": bool(self.variability_model),
+            "variability_model": self.variability_model_entry is not None,
         }
 
 
-class Plugins(UserList[Plugin]):
+@dataclass
+class RegistryIndex:
+    """Hash indexes over a Plugins registry, so that every dispatch is a dictionary lookup."""
+
+    by_name: dict[str, Plugin] = field(default_factory=dict)
+    by_extension: dict[str, Plugin] = field(default_factory=dict)
+    # Qualified class name of each plugin's variability model -> plugin
+    by_model_class: dict[str, Plugin] = field(default_factory=dict)
+    # Class and interface names of operations -> plugins implementing them
+    by_operation: dict[str, list[Plugin]] = field(default_factory=dict)
+    # Source extension of t2m / destination extension of m2t transformations -> transformations
+    t2m_by_extension: dict[str, list[LazyTransformation]] = field(default_factory=dict)
+    m2t_by_extension: dict[str, list[LazyTransformation]] = field(default_factory=dict)
+    # M2M transformation for each (source, destination) extension pair
+    m2m_by_edge: dict[tuple[str, str], LazyTransformation] = field(default_factory=dict)
+    # Memoized resolution of model types (through their MRO) to plugins
+    by_model_type: dict[type, Plugin] = field(default_factory=dict)
+    # Planned transformation routes per (source extension, operation name)
+    routes: dict[tuple[str, str], list[LazyTransformation]] = field(default_factory=dict)
+    planner: TransformationPlanner = field(default_factory=lambda: TransformationPlanner(()))
+
+    @classmethod
+    def build(cls, plugins: Iterable[Plugin]) -> "RegistryIndex":
+        index = cls()
+        for plugin in plugins:
+            index.by_name.setdefault(plugin.name, plugin)
+            model = plugin.variability_model_entry
+            if model is not None:
+                index.by_extension.setdefault(model.get_extension(), plugin)
+                index.by_model_class.setdefault(model.qualified_name, plugin)
+            for name in plugin.operations.get_index():
+                index.by_operation.setdefault(name, []).append(plugin)
+            for transformation in plugin.transformations:
+                if transformation.kind == "t2m" and transformation.source is not None:
+                    index.t2m_by_extension.setdefault(transformation.source, []).append(
+                        transformation
+                    )
+                elif transformation.kind == "m2t" and transformation.destination is not None:
+                    index.m2t_by_extension.setdefault(transformation.destination, []).append(
+                        transformation
+                    )
+                elif transformation.kind == "m2m":
+                    index.m2m_by_edge.setdefault(
+                        (str(transformation.source), str(transformation.destination)),
+                        transformation,
+                    )
+        index.planner = TransformationPlanner(index.m2m_by_edge.values())
+        return index
+
+
+class Plugins(IndexedList[Plugin]):
+    """The plugin registry.
+
+    Lookups go through a :class:`RegistryIndex` that is rebuilt whenever the list of plugins
+    changes. Call :meth:`invalidate_index` after modifying a plugin that is already registered.
+    """
+
     data: list[Plugin]
 
-    def __get_plugin_by_filter(self, plugin_filter: Callable[[Plugin], bool]) -> Plugin:
-        candidates = filter(plugin_filter, self.data)
-        try:
-            plugin = next(candidates)
-        except StopIteration:
-            raise PluginNotFound from StopIteration
-        return plugin
+    def _build_index(self) -> RegistryIndex:
+        return RegistryIndex.build(self.data)
 
-    def get_plugin_by_name(self, name: str) -> Plugin:
-        def plugin_filter(plugin: Plugin) -> bool:
-            return plugin.name == name
+    def get_index(self) -> RegistryIndex:
+        index: RegistryIndex = super().get_index()
+        return index
 
-        return self.__get_plugin_by_filter(plugin_filter)
+    def get_plugin_by_name(self, name: str) -> Plugin:
+        try:
+            return self.get_index().by_name[name]
+        except KeyError:
+            raise PluginNotFound from None
 
     def get_plugin_by_variability_model(self, variability_model: VariabilityModel) -> Plugin:
-        def plugin_filter(plugin: Plugin) -> bool:
-            return isinstance(variability_model, plugin.variability_model)  # type: ignore
-            # TODO: Check if this error can be ignored
-
-        return self.__get_plugin_by_filter(plugin_filter)
+        index = self.get_index()
+        model_type = type(variability_model)
+        plugin = index.by_model_type.get(model_type)
+        if plugin is None:
+            for _class in model_type.__mro__:
+                plugin = index.by_model_class.get(f"{_class.__module__}.{_class.__qualname__}")
+                if plugin is not None:
+                    index.by_model_type[model_type] = plugin
+                    break
+            else:
+                raise PluginNotFound
+        return plugin
 
     def get_plugin_by_extension(self, extension: str) -> Plugin:
-        def plugin_filter(plugin: Plugin) -> bool:
-            return extension == plugin.get_extension()
-
-        return self.__get_plugin_by_filter(plugin_filter)
+        try:
+            return self.get_index().by_extension[extension]
+        except KeyError:
+            raise PluginNotFound from None
+
+    def get_plugins_with_operation(self, operation_name: str) -> list[Plugin]:
+        return list(self.get_index().by_operation.get(operation_name, ()))
+
+    def has_operation(self, operation_name: str) -> bool:
+        return operation_name in self.get_index().by_operation
+
+    def plan_route(self, source: str, operation_name: str) -> list[LazyTransformation]:
+        """Cheapest chain of m2m transformations from the ``source`` model extension to a plugin
+        implementing ``operation_name``; empty if the source plugin implements it already.
+
+        Routes are cached per (source extension, operation). Raises NotImplementedError when
+        no plugin implementing the operation is reachable.
+        """
+        index = self.get_index()
+        route = index.routes.get((source, operation_name))
+        if route is None:
+            targets = {
+                plugin.get_extension()
+                for plugin in index.by_operation.get(operation_name, ())
+                if plugin.variability_model_entry is not None
+            }
+            route = index.planner.plan(source, targets)
+            if route is None:
+                raise NotImplementedError("Way to execute operation not found")
+            index.routes[(source, operation_name)] = route
+        return route
+
+    def record_transformation_cost(self, source: str, destination: str, seconds: float) -> None:
+        """Feed a measured m2m duration to the planner (re-planning routes if needed)."""
+        index = self.get_index()
+        if index.planner.record_cost(source, destination, seconds):
+            index.routes.clear()
+
+    def get_m2m_transformation(self, source: str, destination: str) -> LazyTransformation:
+        try:
+            return self.get_index().m2m_by_edge[(source, destination)]
+        except KeyError:
+            raise TransformationNotFound from None
+
+    def get_t2m_transformations(self, filename: str) -> list[LazyTransformation]:
+        """T2M transformations able to read ``filename``, most specific extension first."""
+        index = self.get_index()
+        transformations: list[LazyTransformation] = []
+        for extension in filename_extensions(filename):
+            transformations += index.t2m_by_extension.get(extension, ())
+        return transformations
+
+    def get_m2t_transformations(self, filename: str) -> list[LazyTransformation]:
+        """M2T transformations able to write ``filename``, most specific extension first."""
+        index = self.get_index()
+        transformations: list[LazyTransformation] = []
+        for extension in filename_extensions(filename):
+            transformations += index.m2t_by_extension.get(extension, ())
+        return transformations
 
     def get_plugin_names(self) -> list[str]:
         return [plugin.name for plugin in self.data]
@@ -165,6 +396,10 @@ class Plugins(UserList[Plugin]):
         except PluginNotFound:
             return Operations()
 
+    def get_import_stats(self) -> dict[str, Any]:
+        """Imported vs still-lazy plugin modules, see :func:`flamapy.core.lazy.import_stats`."""
+        return import_stats([entry for plugin in self.data for entry in plugin.get_entries()])
+
     def get_stats(self) -> dict[str, Any]:
         stats: dict[str, Any] = {"amount_plugins": len(self.data)}
         for plugin in self.data:
@@ -0,0 +1,213 @@
+"""Model-affinity routing of analyses to worker processes.
+
+Each worker process keeps its own caches (parsed models, transformations, results; see
+:mod:`flamapy.core.cache`). If requests for the same model are spread over all workers, every
+worker pays for building its SAT/BDD representation. An :class:`AffinityPool` sends the
+requests for a model (by file path or ``VariabilityModel.fingerprint()``) to the same worker,
+chosen by consistent hashing, so those caches are actually hit. An overloaded preferred worker
+is bypassed in favour of the least loaded one. A worker that dies is restarted in its place;
+if that fails, consistent hashing moves only the dead worker's models to the others.
+"""
+import hashlib
+import logging
+import os
+import threading
+from bisect import bisect
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from flamapy.core.batch import Job, JobResult, run_chunk, spawn_executor
+from flamapy.core.models import VariabilityModel
+
+
+LOGGER = logging.getLogger("routing")
+
+
+def routing_key(source: Union[str, VariabilityModel]) -> str:
+    """Key of a model for routing: its absolute path, or its fingerprint."""
+    if isinstance(source, str):
+        return f"path:{os.path.abspath(source)}"
+    return f"model:{source.fingerprint()}"
+
+
+def _position(value: str) -> int:
+    # hash() is salted per process; the ring must be the same in every process and run.
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys to nodes, with ``replicas`` virtual points per node."""
+
+    def __init__(self, nodes: Iterable[int] = (), replicas: int = 64) -> None:
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: dict[int, int] = {}
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> set[int]:
+        return set(self._owners.values())
+
+    def add(self, node: int) -> None:
+        for replica in range(self.replicas):
+            point = _position(f"{node}:{replica}")
+            if point not in self._owners:
+                self._owners[point] = node
+        self._points = sorted(self._owners)
+
+    def remove(self, node: int) -> None:
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+        self._points = sorted(self._owners)
+
+    def preference(self, key: str) -> Iterator[int]:
+        """The nodes in the order the key prefers them (its owner first)."""
+        if not self._points:
+            return
+        seen: set[int] = set()
+        start = bisect(self._points, _position(key))
+        for offset in range(len(self._points)):
+            node = self._owners[self._points[(start + offset) % len(self._points)]]
+            if node not in seen:
+                seen.add(node)
+                yield node
+
+    def owner(self, key: str) -> Optional[int]:
+        return next(self.preference(key), None)
+
+
+class AffinityPool:
+    """Single-process workers addressed by model, with least-loaded fallback.
+
+    ``max_pending`` is the number of unfinished submissions from which a worker counts as
+    overloaded. ``executor_factory`` creates a one-process executor per worker; by default the
+    workers discover the plugins on startup (use ``WarmWorkerPool.executor`` for forked warm
+    workers, e.g. ``lambda: pool.executor(1)``). A job still running ``kill_grace`` seconds
+    after its timeout is killed with its worker (None: never), which is then restarted.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = 4,
+        executor_factory: Optional[Callable[[], ProcessPoolExecutor]] = None,
+        kill_grace: Optional[float] = 5.0,
+    ) -> None:
+        self.max_pending = max_pending
+        self.kill_grace = kill_grace
+        self.executor_factory = executor_factory or (lambda: spawn_executor(1))
+        self._lock = threading.Lock()
+        self._workers: dict[int, ProcessPoolExecutor] = {}
+        self._pending: dict[int, int] = {}
+        self.ring = HashRing()
+        self.routed = 0
+        self.fallbacks = 0
+        self.replaced = 0  # workers restarted after dying
+        for _ in range(max_workers or os.cpu_count() or 1):
+            self._add_worker()
+
+    def _add_worker(self) -> None:
+        worker = len(self._workers)
+        self._workers[worker] = self.executor_factory()
+        self._pending[worker] = 0
+        self.ring.add(worker)
+
+    def _replace_worker(self, worker: int, broken: ProcessPoolExecutor) -> None:
+        """Restart a dead worker under the same ring positions, so no model moves; if it
+        cannot be restarted, its models are rebalanced over the remaining workers.
+        """
+        with self._lock:
+            if self._workers.get(worker) is not broken:
+                return  # already replaced
+            try:
+                self._workers[worker] = self.executor_factory()
+                self.replaced += 1
+                LOGGER.warning("Worker %d died and was restarted", worker)
+            except (OSError, RuntimeError):
+                LOGGER.exception("Worker %d died and could not be restarted", worker)
+                del self._workers[worker]
+                self._pending.pop(worker, None)
+                self.ring.remove(worker)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _choose(self, key: str) -> tuple[int, ProcessPoolExecutor]:
+        with self._lock:
+            preferred = self.ring.owner(key)
+            if preferred is None:
+                raise RuntimeError("The pool has been shut down")
+            self.routed += 1
+            if self._pending[preferred] >= self.max_pending:
+                least_loaded = min(self._pending, key=self._pending.__getitem__)
+                if self._pending[least_loaded] < self._pending[preferred]:
+                    self.fallbacks += 1
+                    preferred = least_loaded
+            self._pending[preferred] += 1
+            return preferred, self._workers[preferred]
+
+    def _finished(self, worker: int, executor: ProcessPoolExecutor, future: Future[Any]) -> None:
+        with self._lock:
+            if worker in self._pending:
+                self._pending[worker] -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._replace_worker(worker, executor)
+
+    def submit(
+        self, key: Union[str, VariabilityModel], function: Callable[..., Any], *args: Any
+    ) -> Future[Any]:
+        """Run a picklable callable on the worker of ``key`` (a model or a model file)."""
+        worker, executor = self._choose(routing_key(key))
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            # The worker died while idle.
+            self._finished(worker, executor, _broken_future())
+            return self.submit(key, function, *args)
+        future.add_done_callback(lambda done: self._finished(worker, executor, done))
+        return future
+
+    def submit_job(
+        self, job: Job, timeout: Optional[float] = None, kill_grace: Optional[float] = None
+    ) -> Future[list[JobResult]]:
+        """Run a job on the worker of its model file; the result is a one-element list.
+
+        A job still running ``kill_grace`` seconds (default: the pool's) after its timeout is
+        killed with its worker; its future then fails with ``BrokenProcessPool``.
+        """
+        grace = kill_grace if kill_grace is not None else self.kill_grace
+        return self.submit(job.file, run_chunk, [job], timeout, grace)
+
+    def worker_of(self, key: Union[str, VariabilityModel]) -> Optional[int]:
+        """The worker preferred by a model or a model file."""
+        return self.ring.owner(routing_key(key))
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "pending": dict(self._pending),
+                "routed": self.routed,
+                "fallbacks": self.fallbacks,
+                "replaced": self.replaced,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+            self._pending.clear()
+            self.ring = HashRing()
+        for executor in workers:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> "AffinityPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+
+def _broken_future() -> Future[Any]:
+    future: Future[Any] = Future()
+    future.set_exception(BrokenProcessPool())
+    return future
@@ -0,0 +1,151 @@
+"""Analysis sessions that keep the backend representations of a model warm.
+
+``DiscoverMetamodels.use_operation_from_vm`` resolves a plugin, walks the transformation route
+and builds a fresh backend model for every call. An :class:`AnalysisSession` materialises each
+backend representation of its model (e.g. the SAT or BDD model of a feature model) the first
+time an operation needs it and reuses it for the following operations, until it is released
+explicitly or evicted to stay within the session's memory budget.
+"""
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from flamapy.core.cache import PARSE_CACHE, LRUCache
+from flamapy.core.discover import DiscoverMetamodels, OperationWithConfiguration
+from flamapy.core.exceptions import ConfigurationNotFound, TransformationNotFound
+from flamapy.core.lazy import LazyTransformation
+from flamapy.core.models import VariabilityModel
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+
+@dataclass
+class Timing:
+    """Duration of an operation or of a transformation run by a session."""
+
+    kind: str  # 'operation' | 'transformation'
+    name: str
+    seconds: float
+
+
+class AnalysisSession:
+    """Runs operations on a model, reusing its transformed backend representations.
+
+    ``memory_budget`` (bytes, approximate, see :func:`flamapy.core.cache.approximate_size`)
+    bounds the representations kept warm; the least recently used ones are released first.
+    The source model itself is never released.
+    """
+
+    def __init__(
+        self,
+        model: VariabilityModel,
+        discover: Optional[DiscoverMetamodels] = None,
+        memory_budget: Optional[int] = None,
+    ) -> None:
+        self.model = model
+        self.discover = discover if discover is not None else DiscoverMetamodels()
+        self.representations = LRUCache(max_entries=sys.maxsize, max_bytes=memory_budget)
+        self.timings: list[Timing] = []
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        discover: Optional[DiscoverMetamodels] = None,
+        memory_budget: Optional[int] = None,
+    ) -> "AnalysisSession":
+        discover = discover if discover is not None else DiscoverMetamodels()
+        candidates = discover.plugins.get_t2m_transformations(path)
+        if not candidates:
+            raise TransformationNotFound()
+        return cls(PARSE_CACHE.transform(candidates[0], path), discover, memory_budget)
+
+    def __enter__(self) -> "AnalysisSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def representation(self, extension: str) -> VariabilityModel:
+        """The model in the representation of the plugin with the given extension."""
+        source = self.model.get_extension()
+        if extension == source:
+            return self.model
+        route = self.discover.plugins.get_index().planner.plan(source, {extension})
+        if route is None:
+            raise NotImplementedError(f"No transformation route from {source} to {extension}")
+        return self.__materialize(route)
+
+    def run(
+        self,
+        operation_name: str,
+        plugin_name: Optional[str] = None,
+        configuration: Optional[Configuration] = None,
+    ) -> Any:
+        """Run an operation on the warm representation of the plugin implementing it.
+
+        Raises ConfigurationNotFound, as the facade does, if the operation needs a
+        configuration and none is given.
+        """
+        plugins = self.discover.plugins
+        if plugin_name is not None:
+            model = self.representation(plugins.get_plugin_by_name(plugin_name).get_extension())
+        else:
+            model = self.__materialize(
+                plugins.plan_route(self.model.get_extension(), operation_name)
+            )
+        operation = self.discover.get_operation(model, operation_name)
+        if isinstance(operation, OperationWithConfiguration):
+            if configuration is None:
+                raise ConfigurationNotFound()
+            operation.set_configuration(configuration)
+        start = time.perf_counter()
+        result = operation.execute(model).get_result()
+        self.timings.append(Timing("operation", operation_name, time.perf_counter() - start))
+        return result
+
+    def release(self, extension: Optional[str] = None) -> None:
+        """Drop one warm representation, or all of them."""
+        if extension is None:
+            self.representations.clear()
+        else:
+            self.representations.invalidate(extension)
+
+    def warm_extensions(self) -> list[str]:
+        return [str(extension) for extension in self.representations.keys()]
+
+    def get_timings(self) -> dict[str, dict[str, float]]:
+        """Total seconds per operation and per transformation ('source->destination')."""
+        totals: dict[str, dict[str, float]] = {"operation": {}, "transformation": {}}
+        for timing in self.timings:
+            kind = totals[timing.kind]
+            kind[timing.name] = kind.get(timing.name, 0.0) + timing.seconds
+        return totals
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = self.representations.get_stats()
+        return {
+            "representations": stats["entries"],
+            "bytes": stats["bytes"] if self.representations.max_bytes is not None else None,
+            "reused": stats["hits"],
+            "built": sum(1 for timing in self.timings if timing.kind == "transformation"),
+            "released_for_budget": stats["evictions"],
+        }
+
+    def __materialize(self, route: list[LazyTransformation]) -> VariabilityModel:
+        """Follow the route from the source model, starting from the last warm step."""
+        model = self.model
+        for position in range(len(route), 0, -1):
+            destination = str(route[position - 1].destination)
+            if destination in self.representations:
+                model, route = self.representations.get(destination), route[position:]
+                break
+        for m2m in route:
+            source, destination = str(m2m.source), str(m2m.destination)
+            start = time.perf_counter()
+            model = m2m(model).transform()
+            seconds = time.perf_counter() - start
+            self.timings.append(Timing("transformation", f"{source}->{destination}", seconds))
+            self.discover.plugins.record_transformation_cost(source, destination, seconds)
+            self.representations.put(destination, model)
+        return model
@@ -0,0 +1,225 @@
+"""Persistent store of analysis results, so corpus-scale runs can be resumed.
+
+:class:`AnalysisStore` records, in a local SQLite database, every result computed through
+``DiscoverMetamodels.use_operation_from_file`` together with the model path and fingerprint,
+the operation, backend and inputs, the elapsed time and (optionally) the peak memory. When the
+same analysis is requested again, e.g. after an interrupted run is restarted, the stored result
+is returned without parsing the model or running the operation.
+
+Results are stored losslessly as pickles, so a stored result has the type of the original one
+(sets, tuples, features...); only open stores you trust. A JSON summary of each result (objects
+without a JSON form by their ``str``) and its size are stored alongside for querying. Results
+that cannot be pickled are recorded without a payload, and are computed again when requested.
+"""
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import tracemalloc
+from collections.abc import Sized
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterator, Optional, Sequence, cast
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    model_path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    backend TEXT,
+    inputs TEXT NOT NULL,
+    result TEXT,
+    payload BLOB,
+    result_size INTEGER,
+    elapsed REAL NOT NULL,
+    peak_memory INTEGER,
+    created REAL NOT NULL,
+    UNIQUE (fingerprint, operation, backend, inputs)
+);
+CREATE INDEX IF NOT EXISTS results_by_operation ON results (operation, result_size);
+CREATE INDEX IF NOT EXISTS results_by_model ON results (model_path);
+"""
+
+
+@dataclass
+class Measurement:
+    """Elapsed seconds and peak traced memory (bytes, None if not tracked) of a computation."""
+
+    elapsed: float = 0.0
+    peak_memory: Optional[int] = None
+
+
+@contextmanager
+def measure(track_memory: bool = False) -> Iterator[Measurement]:
+    """Measure the wall time, and optionally the peak memory with tracemalloc, of a block."""
+    measurement = Measurement()
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if track_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield measurement
+    finally:
+        measurement.elapsed = time.perf_counter() - start
+        if track_memory:
+            measurement.peak_memory = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@dataclass
+class StoredResult:
+    """A row of the store."""
+
+    model_path: str
+    fingerprint: str
+    operation: str
+    backend: Optional[str]
+    inputs: Any
+    result: Any
+    elapsed: float
+    peak_memory: Optional[int]
+
+
+def _payload(result: Any) -> Optional[bytes]:
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _result_size(result: Any) -> Optional[int]:
+    if isinstance(result, Sized) and not isinstance(result, (str, bytes)):
+        return len(result)
+    return None
+
+
+class AnalysisStore:
+    """SQLite-backed record of analysis results keyed like the result cache.
+
+    Keys are those of :meth:`flamapy.core.cache.ResultCache.key`: (model fingerprint,
+    operation, backend, normalised inputs). ``track_memory`` records the peak memory of each
+    analysis with tracemalloc, which slows the analyses down noticeably.
+    """
+
+    def __init__(self, path: str, track_memory: bool = False) -> None:
+        self.path = path
+        self.track_memory = track_memory
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(results)")}
+            if "payload" not in columns:  # a store created before results were pickled
+                self._connection.execute("ALTER TABLE results ADD COLUMN payload BLOB")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _columns(key: Hashable) -> tuple[str, str, Optional[str], str]:
+        fingerprint, operation, backend, inputs = cast(tuple[str, str, Optional[str], Any], key)
+        return fingerprint, operation, backend, json.dumps(inputs, default=repr)
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """(True, result) if the analysis was stored with a payload, (False, None) otherwise."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM results"
+                " WHERE fingerprint = ? AND operation = ? AND backend IS ? AND inputs = ?",
+                self._columns(key),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def record(
+        self,
+        key: Hashable,
+        model_path: str,
+        result: Any,
+        measurement: Measurement,
+    ) -> None:
+        """Store (or replace) the result of an analysis; committed immediately."""
+        fingerprint, operation, backend, inputs = self._columns(key)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (model_path, fingerprint, operation, backend,"
+                " inputs, result, payload, result_size, elapsed, peak_memory, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    model_path, fingerprint, operation, backend, inputs,
+                    json.dumps(result, default=str), _payload(result), _result_size(result),
+                    measurement.elapsed, measurement.peak_memory, time.time(),
+                ),
+            )
+
+    def query(
+        self,
+        operation: Optional[str] = None,
+        backend: Optional[str] = None,
+        model_path: Optional[str] = None,
+        non_empty: Optional[bool] = None,
+    ) -> list[StoredResult]:
+        """Stored results matching every given criterion (their JSON summary for results that
+        could not be pickled).
+
+        ``non_empty`` filters collection results by whether they have any element (e.g. the
+        models with dead features); results that are not collections never match it.
+        """
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        for column, value in (("operation", operation), ("backend", backend),
+                              ("model_path", model_path)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if non_empty is not None:
+            conditions.append("result_size > 0" if non_empty else "result_size = 0")
+        sql = (
+            "SELECT model_path, fingerprint, operation, backend, inputs, result, payload,"
+            " elapsed, peak_memory FROM results"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows: Sequence[tuple[Any, ...]] = self._connection.execute(
+                sql + " ORDER BY id", parameters
+            ).fetchall()
+        return [
+            StoredResult(
+                path, fingerprint, op, backend_, json.loads(inputs),
+                pickle.loads(payload) if payload is not None else json.loads(summary),
+                elapsed, peak,
+            )
+            for path, fingerprint, op, backend_, inputs, summary, payload, elapsed, peak in rows
+        ]
+
+    def models_where(self, operation: str, non_empty: bool = True) -> list[str]:
+        """Paths of the models whose ``operation`` result is (non-)empty."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT model_path FROM results WHERE operation = ? AND "
+                + ("result_size > 0" if non_empty else "result_size = 0")
+                + " ORDER BY model_path",
+                (operation,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            count: int = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return count
@@ -0,0 +1,49 @@
+"""Command line tool streaming the result of an operation, one JSON line per item.
+
+Configurations and filtered products are printed as they are enumerated (see
+``DiscoverMetamodels.stream_operation``), so the first ones appear before the whole product
+space is computed and memory stays bounded::
+
+    python -m flamapy.core.stream Configurations model.uvl --offset 1000 --limit 100
+"""
+import argparse
+import json
+import sys
+from typing import Any, Optional, Sequence
+
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+
+def _jsonable(item: Any) -> Any:
+    if isinstance(item, Configuration):
+        return [str(element) for element in item.get_selected_elements()]
+    return item
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m flamapy.core.stream",
+        description="Run an operation on a model file; prints one JSON line per result item.",
+    )
+    parser.add_argument("operation")
+    parser.add_argument("file")
+    parser.add_argument("--plugin", help="plugin (backend) to run the operation with")
+    parser.add_argument("--configuration", help="configuration file for the operation")
+    parser.add_argument("--full", action="store_true", help="the configuration is full")
+    parser.add_argument("--limit", type=int, help="maximum number of items to print")
+    parser.add_argument("--offset", type=int, default=0, help="items to skip first")
+    parser.add_argument("--timeout", type=float, help="seconds allowed in total")
+    args = parser.parse_args(argv)
+
+    items = DiscoverMetamodels().stream_operation(
+        args.operation, args.file, args.plugin, args.configuration, args.full,
+        limit=args.limit, offset=args.offset, timeout=args.timeout,
+    )
+    for item in items:
+        print(json.dumps(_jsonable(item), default=str), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
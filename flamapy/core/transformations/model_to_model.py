@@ -5,6 +5,10 @@ from flamapy.core.transformations import Transformation
 
 
 class ModelToModel(Transformation):
+    # Estimated duration of the transformation (in seconds), used to plan transformation chains
+    # until its actual duration has been measured.
+    cost: float = 1.0
+
     @staticmethod
     @abstractmethod
     def get_source_extension() -> str:
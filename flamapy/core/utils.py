@@ -13,5 +13,14 @@ def filename_matches_extension(filename: str, extension: str) -> bool:
     return filename.endswith(f".{extension}")
 
 
+def filename_extensions(filename: str) -> list[str]:
+    """Every (possibly compound) extension of the filename, the most specific first.
+
+    For example, 'model.uvl.json' has the extensions 'uvl.json' and 'json'.
+    """
+    parts = os.path.basename(filename).split(".")[1:]
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
 def file_exists(filepath: str) -> bool:
     return os.path.isfile(filepath)
@@ -0,0 +1,135 @@
+"""Preforked worker pools that start warm.
+
+A worker spawned from scratch discovers the plugins, imports the solver libraries and builds
+the registry before it can run its first analysis. A :class:`WarmWorkerPool` does that work
+once, in the parent process (the "zygote"): it creates the ``DiscoverMetamodels``, optionally
+imports the modules of the backends that will be used, moves everything allocated so far out
+of the garbage collector's reach with ``gc.freeze()`` (so collections in the workers do not
+touch, and therefore copy, those pages) and then forks the workers, which share that state
+copy-on-write.
+
+Forking requires a POSIX platform. The pool can run batches (see :mod:`flamapy.core.batch`)
+and serve individual jobs, e.g. for a server front-end.
+"""
+import gc
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from flamapy.core.batch import BatchRunner, Job, JobResult, run_chunk, set_worker_discover
+from flamapy.core.discover import DiscoverMetamodels
+
+
+def warm_backends(discover: DiscoverMetamodels, plugin_names: Iterable[str]) -> None:
+    """Import the operations, transformations and model of the given plugins.
+
+    Lazily discovered plugins (see :mod:`flamapy.core.lazy`) import their modules, and the
+    solver libraries they depend on, only on first use; warming moves that cost to the parent.
+    """
+    for name in plugin_names:
+        for entry in discover.plugins.get_plugin_by_name(name).get_entries():
+            entry.load()
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class WarmWorkerPool:
+    """A pool of workers forked from a warm parent process."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        backends: Iterable[str] = (),
+        discover: Optional[DiscoverMetamodels] = None,
+        freeze: bool = True,
+    ) -> None:
+        """``backends`` names the plugins to warm before forking; ``discover`` reuses an
+        existing registry instead of discovering the plugins again.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.discover = discover if discover is not None else DiscoverMetamodels()
+        warm_backends(self.discover, backends)
+        set_worker_discover(self.discover)  # inherited by the forked workers
+        self.frozen = freeze
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        self._context = multiprocessing.get_context("fork")
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def executor(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """A new pool of ``max_workers`` processes forked from this warm parent."""
+        return ProcessPoolExecutor(
+            max_workers=max_workers or self.max_workers, mp_context=self._context
+        )
+
+    def start(self) -> "WarmWorkerPool":
+        """Fork the workers now rather than on the first submission."""
+        self._running_executor()
+        return self
+
+    def submit(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """Run a picklable callable in a worker.
+
+        If a worker died (e.g. killed after a timeout) and broke the pool, a new pool is
+        forked for this and the following submissions.
+        """
+        try:
+            return self._running_executor().submit(function, *args, **kwargs)
+        except BrokenProcessPool:
+            self._replace_executor()
+            return self._running_executor().submit(function, *args, **kwargs)
+
+    def submit_job(
+        self, job: Job, timeout: Optional[float] = None, kill_grace: Optional[float] = None
+    ) -> Future[list[JobResult]]:
+        """Run a job in a worker; the future's result is a one-element list.
+
+        A job still running ``kill_grace`` seconds after its timeout is killed with its worker
+        (None: never), as in :class:`BatchRunner`; its future then fails with
+        ``BrokenProcessPool``.
+        """
+        return self.submit(run_chunk, [job], timeout, kill_grace)
+
+    def run_batch(
+        self,
+        jobs: Iterable[Job],
+        chunksize: int = 8,
+        timeout: Optional[float] = None,
+        ordered: bool = True,
+        kill_grace: Optional[float] = 5.0,
+    ) -> Iterator[JobResult]:
+        """Run the jobs on workers forked from this parent; see :class:`BatchRunner`."""
+        runner = BatchRunner(self.max_workers, chunksize, timeout,
+                             executor_factory=self.executor, kill_grace=kill_grace)
+        return runner.run(jobs, ordered)
+
+    def _running_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self.executor()
+            # With fork, the whole pool is created on the first submission.
+            self._executor.submit(_noop).result()
+        return self._executor
+
+    def _replace_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+
+    def __enter__(self) -> "WarmWorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Any, Iterator
 
 from flamapy.core.models import VariabilityModel
@@ -38,6 +39,24 @@ class Configuration(VariabilityModel):
     def set_full(self, is_full: bool) -> None:
         self.is_full = is_full
 
+    def fingerprint(self) -> str:
+        """Computed on every call, not memoised: ``elements`` is a public dict that callers
+        modify in place, and configurations are small.
+        """
+        return self.compute_fingerprint()
+
+    def compute_fingerprint(self) -> str:
+        """Hash of the elements, their values and `is_full`, independent of insertion order.
+
+        Provenance is not part of the fingerprint.
+        """
+        items = sorted(f"{_canonical(e)}={_canonical(v)}" for e, v in self.elements.items())
+        digest = hashlib.sha256(f"configuration:{self.is_full}".encode())
+        for item in items:
+            digest.update(b"\0")
+            digest.update(item.encode())
+        return digest.hexdigest()
+
     def set_provenance(self, element: Any, source: str) -> None:
         """Record whether an element's value came from the user or from propagation."""
         self.provenance[element] = source
@@ -81,3 +100,19 @@ class Configuration(VariabilityModel):
 
     def __iter__(self) -> Iterator[Any]:
         return iter(self.elements)
+
+
+def _canonical(value: Any) -> str:
+    """Order-independent textual form of an element or value of a configuration."""
+    if isinstance(value, Configuration):
+        return f"Configuration({value.fingerprint()})"
+    if isinstance(value, (dict, set, frozenset)):
+        pairs = value.items() if isinstance(value, dict) else ((v, None) for v in value)
+        items = sorted(f"{_canonical(k)}:{_canonical(v)}" for k, v in pairs)
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(v) for v in value) + "]"
+    name = getattr(value, "name", None)  # e.g. features
+    if not isinstance(value, str) and isinstance(name, str):
+        return f"{type(value).__name__}:{name}"
+    return f"{type(value).__name__}:{value!r}"
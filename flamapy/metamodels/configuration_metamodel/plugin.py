@@ -0,0 +1,33 @@
+"""Plugin declaration registered under the ``flamapy.plugins`` entry point group.
+
+It lets discovery register the configuration metamodel without walking or importing its
+modules. ``tests/core/test_discover.py`` checks that it describes exactly the classes found
+by walking the package.
+"""
+
+_TRANSFORMATIONS = "flamapy.metamodels.configuration_metamodel.transformations"
+
+PLUGIN = {
+    "name": "configuration_metamodel",
+    "module": "flamapy.metamodels.configuration_metamodel",
+    "variability_model": {
+        "module": "flamapy.metamodels.configuration_metamodel.models.configuration",
+        "name": "Configuration",
+        "extension": "configuration",
+    },
+    "operations": [],
+    "transformations": [
+        {"module": f"{_TRANSFORMATIONS}.configuration_basic_reader",
+         "name": "ConfigurationBasicReader", "kind": "t2m", "source": "csvconf"},
+        {"module": f"{_TRANSFORMATIONS}.configuration_basic_writer",
+         "name": "ConfigurationBasicWriter", "kind": "m2t", "destination": "csvconf"},
+        {"module": f"{_TRANSFORMATIONS}.configuration_json_reader",
+         "name": "ConfigurationJSONReader", "kind": "t2m", "source": "json"},
+        {"module": f"{_TRANSFORMATIONS}.configuration_json_writer",
+         "name": "ConfigurationJSONWriter", "kind": "m2t", "destination": "json"},
+        {"module": f"{_TRANSFORMATIONS}.uvls_json_reader",
+         "name": "UVLSJSONReader", "kind": "t2m", "source": "uvl.json"},
+        {"module": f"{_TRANSFORMATIONS}.uvls_json_writer",
+         "name": "UVLSJSONWriter", "kind": "m2t", "destination": "uvl.json"},
+    ],
+}
@@ -0,0 +1,119 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from flamapy.core import discover
+from flamapy.core.aio import AsyncDiscoverMetamodels
+from flamapy.core.batch import set_worker_discover
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.exceptions import OperationCancelled
+
+import three_plugins
+from three_plugins.plugin1.operations import Operation1
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+class TestAsyncDiscover:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins]
+        self.discover = DiscoverMetamodels()
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def slow_execute(self, operation, model):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.1)
+        with self.lock:
+            self.running -= 1
+        return operation
+
+    def test_analyses_run_off_the_loop_with_per_backend_limits(self, tmp_path):
+        model = tmp_path / "model.xml"
+        model.write_text("<model/>")
+        facade = AsyncDiscoverMetamodels(self.discover, ThreadPoolExecutor(4),
+                                         backend_limits={"plugin1": 1})
+
+        async def analyse():
+            return await asyncio.gather(
+                *(facade.use_operation_from_file("Operation1", str(model)) for _ in range(3)),
+                facade.use_operation_from_vm("Operation1", ExampleModel()),
+            )
+
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=lambda op, model: self.slow_execute(op, model)):
+            assert asyncio.run(analyse()) == ["", "", "", ""]
+        assert self.peak == 1
+
+    def test_cancelled_calls_keep_their_slot_until_they_stop(self):
+        facade = AsyncDiscoverMetamodels(self.discover, ThreadPoolExecutor(4),
+                                         backend_limits={"plugin1": 1})
+
+        async def start_and_cancel():
+            for _ in range(4):
+                task = asyncio.ensure_future(facade.use_operation_from_vm("Operation1",
+                                                                          ExampleModel()))
+                await asyncio.sleep(0.02)
+                task.cancel()
+            return await facade.use_operation_from_vm("Operation1", ExampleModel())
+
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=lambda op, model: self.slow_execute(op, model)):
+            assert asyncio.run(start_and_cancel()) == ""
+        assert self.peak == 1
+
+    def test_cancellation_reaches_running_analyses(self):
+        stopped = []
+
+        def polling_execute(operation, model):
+            try:
+                for _ in range(200):
+                    operation.check_cancelled()
+                    time.sleep(0.01)
+            except OperationCancelled:
+                stopped.append(True)
+                raise
+            return operation
+
+        executor = ThreadPoolExecutor(1)
+        facade = AsyncDiscoverMetamodels(self.discover, executor)
+
+        async def cancel_running():
+            task = asyncio.ensure_future(facade.use_operation_from_vm("Operation1",
+                                                                      ExampleModel()))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        started = time.perf_counter()
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=polling_execute):
+            asyncio.run(cancel_running())
+            executor.shutdown(wait=True)  # the analysis is left to stop by itself
+        assert stopped == [True] and time.perf_counter() - started < 1
+
+    def test_timeouts(self):
+        facade = AsyncDiscoverMetamodels(self.discover, timeout=0.01)
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=lambda op, model: self.slow_execute(op, model)):
+            with pytest.raises(TimeoutError):
+                asyncio.run(facade.use_operation_from_vm("Operation1", ExampleModel()))
+            assert asyncio.run(facade.use_operation_from_vm(
+                "Operation1", ExampleModel(), timeout=5)) == ""
+
+    def test_process_executor(self):
+        set_worker_discover(self.discover)  # inherited by the forked worker
+        executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+        with executor:
+            facade = AsyncDiscoverMetamodels(self.discover, executor)
+            result = asyncio.run(facade.use_operation_from_vm("Operation1", ExampleModel()))
+        assert result == ""
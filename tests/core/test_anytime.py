@@ -0,0 +1,62 @@
+from unittest import mock
+
+from flamapy.core import discover
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.operations import AnytimeResult, Budget, EstimatedConfigurationsNumber
+
+import three_plugins
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+class CountingEstimate(EstimatedConfigurationsNumber):
+    """Narrows [0, 1024] by halving the interval once per iteration."""
+
+    def __init__(self) -> None:
+        self.estimate = 0
+
+    def execute(self, model):
+        lower, upper = 0, 1024
+        while upper - lower > 1:
+            if self.budget_exhausted():
+                return self
+            lower = (lower + upper) // 2
+            self.estimate = (lower + upper) // 2
+            self.report(self.estimate, lower_bound=lower, upper_bound=upper, confidence=0.9)
+        self.report(lower, complete=True)
+        return self
+
+    def get_configurations_number(self) -> int:
+        return self.estimate
+
+    def get_result(self) -> int:
+        return self.get_configurations_number()
+
+
+def test_iteration_budget_returns_best_so_far_with_bounds():
+    operation = CountingEstimate()
+    operation.set_budget(iterations=3)
+    best = operation.execute(ExampleModel()).get_best_result()
+    assert not best.complete
+    assert (best.lower_bound, best.upper_bound) == (896, 1024)
+    assert best.value == 960 and best.confidence == 0.9
+    assert best.gap == 128 / 1024
+
+
+def test_without_budget_the_search_completes():
+    best = CountingEstimate().execute(ExampleModel()).get_best_result()
+    assert best.complete and best.value == 1023 and best.gap == 0.0
+
+
+def test_expired_time_budget_stops_the_search():
+    operation = CountingEstimate()
+    operation.set_budget(seconds=0.0)
+    best = operation.execute(ExampleModel()).get_best_result()
+    assert best == AnytimeResult(0, complete=False, iterations=1)  # nothing reported
+
+
+@mock.patch.object(discover, "filter_modules_from_plugin_paths")
+def test_budget_on_an_operation_that_is_not_anytime(mocker):
+    mocker.return_value = [three_plugins]
+    dm = DiscoverMetamodels()
+    result = dm.use_operation_from_vm("Operation1", ExampleModel(), budget=Budget(seconds=1))
+    assert result == AnytimeResult("", complete=True)
@@ -1,10 +1,16 @@
 import itertools
+import pickle
+import sys
+
+import pytest
 
 from flamapy.core.models.ast import (
     AST,
     ASTOperation,
     Node,
+    NodeKind,
     convert_into_cnf,
+    get_clauses,
     simplify_formula,
     tseytin_cnf,
     TSEYTIN_AUX_PREFIX,
@@ -64,6 +70,63 @@ def test_simplify_implies() -> None:
     })
 
 
+def test_distributive_clauses_keep_their_order() -> None:
+    # (A => (B v (C ∧ D))) ∧ !(A XOR E)
+    implies = Node(ASTOperation.IMPLIES, Node('A'),
+                   Node(ASTOperation.OR, Node('B'), Node(ASTOperation.AND, Node('C'), Node('D'))))
+    not_xor = Node(ASTOperation.NOT, Node(ASTOperation.XOR, Node('A'), Node('E')))
+    ast = AST(Node(ASTOperation.AND, implies, not_xor))
+    expected = [['-A', 'B', 'C'], ['-A', 'B', 'D'], ['-A', 'E'], ['A', '-E']]
+    assert ast.get_clauses() == expected
+    assert get_clauses(convert_into_cnf(ast)) == expected
+    equivalence = AST(Node(ASTOperation.EQUIVALENCE, Node('A'), Node(ASTOperation.NOT, Node('B'))))
+    assert equivalence.get_clauses() == [['-A', '-B'], ['B', 'A']]
+
+
+def test_deep_formulas_do_not_hit_the_recursion_limit() -> None:
+    depth = sys.getrecursionlimit() * 2
+    disjunction = Node('F0')
+    for i in range(1, depth):
+        disjunction = Node(ASTOperation.OR, disjunction, Node(f'F{i}'))
+    assert AST(disjunction).get_clauses() == [[f'F{i}' for i in range(depth)]]
+
+    nested = Node('A')
+    for _ in range(depth):  # !!...!(A ∧ (A ∧ ...)) with an even number of negations
+        nested = Node(ASTOperation.NOT, Node(ASTOperation.NOT, Node(ASTOperation.AND, nested,
+                                                                    Node('B'))))
+    cnf = convert_into_cnf(AST(nested))
+    assert get_clauses(cnf) == [['A']] + [['B']] * depth
+    assert simplify_formula(AST(nested)).root.data == ASTOperation.NOT
+
+
+def test_nodes_are_interned_and_immutable() -> None:
+    first = Node(ASTOperation.AND, Node('A'), Node(ASTOperation.NOT, Node('B')))
+    second = Node(ASTOperation.AND, Node('A'), Node(ASTOperation.NOT, Node('B')))
+    assert first is second and hash(first) == hash(second)
+    assert Node(1) is not Node(True)  # equal payloads of different types stay apart
+    assert Node(ASTOperation.AND, Node('A'), Node('B')) != first
+    with pytest.raises(AttributeError):
+        first.left = Node('C')
+    assert pickle.loads(pickle.dumps(first)) is first
+
+
+def test_node_kinds() -> None:
+    assert Node('A').kind is NodeKind.TERM and Node('A').is_unique_term()
+    assert Node(ASTOperation.NOT, Node('A')).is_unary_op()
+    assert Node(ASTOperation.SUM, Node('price')).is_aggregate_op()
+    binary = Node(ASTOperation.EQUALS, Node('A'), Node(3))
+    assert binary.is_binary_op() and binary.is_op()
+    compound = Node('A', Node('B'))  # not an operation, but with an operand
+    assert compound.is_binary_op() and compound.is_term()
+
+
+def test_unhashable_payloads_compare_structurally() -> None:
+    first = Node(ASTOperation.NOT, Node(['A', 'B']))
+    second = Node(ASTOperation.NOT, Node(['A', 'B']))
+    assert first == second and hash(first) == hash(second)
+    assert first != Node(ASTOperation.NOT, Node(['A']))
+
+
 # --- Tseytin transformation ---------------------------------------------------
 
 def _eval_clauses(clauses: list, assignment: dict[str, bool]) -> bool:
@@ -93,9 +156,13 @@ def _feature_vars(clauses: list) -> list[str]:
     return sorted(names)
 
 
-def assert_model_preserving(ast: AST, variables: list[str]) -> None:
-    """Every original model extends to exactly one Tseytin model; non-models to zero."""
-    clauses, aux_names = tseytin_cnf(ast)
+def assert_model_preserving(
+    ast: AST, variables: list[str], satisfiability_only: bool = False, **options: bool
+) -> None:
+    """Every original model extends to exactly one Tseytin model (at least one, with
+    ``satisfiability_only``); non-models to zero.
+    """
+    clauses, aux_names = tseytin_cnf(ast, **options)
     reference = simplify_formula(ast).root
     for feat_bits in itertools.product([True, False], repeat=len(variables)):
         feat_assign = dict(zip(variables, feat_bits))
@@ -105,6 +172,8 @@ def assert_model_preserving(ast: AST, variables: list[str]) -> None:
             assignment = {**feat_assign, **dict(zip(aux_names, aux_bits))}
             if _eval_clauses(clauses, assignment):
                 extensions += 1
+        if satisfiability_only:
+            extensions = min(extensions, 1)
         assert extensions == (1 if expected else 0), (
             f"{feat_assign}: expected {int(expected)} extensions, got {extensions}"
         )
@@ -145,3 +214,39 @@ def test_tseytin_is_linear_where_distributive_explodes() -> None:
     assert len(tseytin) <= 6 * len(variables)
     assert len(tseytin) < len(distributive)
     assert _feature_vars(tseytin) == variables
+
+
+def _mixed_formula() -> AST:
+    # !(A ∧ B ∧ C) ∧ (D => (A v B v C)) ∧ (A <=> D)
+    group = Node(ASTOperation.OR, Node(ASTOperation.OR, Node('A'), Node('B')), Node('C'))
+    conjunction = Node(ASTOperation.AND, Node(ASTOperation.AND, Node('A'), Node('B')), Node('C'))
+    node = Node(ASTOperation.AND, Node(ASTOperation.NOT, conjunction),
+                Node(ASTOperation.IMPLIES, Node('D'), group))
+    return AST(Node(ASTOperation.AND, node, Node(ASTOperation.EQUIVALENCE, Node('A'), Node('D'))))
+
+
+def test_tseytin_flattened_gates_preserve_models() -> None:
+    ast = _mixed_formula()
+    assert_model_preserving(ast, ['A', 'B', 'C', 'D'], flatten=True)
+    flat, flat_aux = tseytin_cnf(ast, flatten=True)
+    binary, binary_aux = tseytin_cnf(ast)
+    assert len(flat) < len(binary) and len(flat_aux) < len(binary_aux)
+
+
+def test_plaisted_greenbaum_is_equisatisfiable_and_smaller() -> None:
+    ast = _mixed_formula()
+    assert_model_preserving(ast, ['A', 'B', 'C', 'D'], satisfiability_only=True,
+                            polarity_aware=True, flatten=True)
+    clauses, aux_names = ast.get_clauses_with_aux(method='plaisted_greenbaum')
+    full, full_aux = tseytin_cnf(ast)
+    assert len(clauses) * 2 <= len(full) and len(aux_names) < len(full_aux)
+    assert ast.get_clauses(method='plaisted_greenbaum') == clauses
+
+
+def test_plaisted_greenbaum_keeps_both_sides_under_equivalence() -> None:
+    ast = AST(Node(ASTOperation.XOR, Node(ASTOperation.AND, Node('A'), Node('B')), Node('C')))
+    assert_model_preserving(ast, ['A', 'B', 'C'], satisfiability_only=True, polarity_aware=True)
+    one_sided, _ = tseytin_cnf(ast, polarity_aware=True)
+    full, _ = tseytin_cnf(ast)
+    assert one_sided[:3] == full[:3]  # the AND below the XOR keeps both directions
+    assert len(one_sided) == len(full) - 2  # the root XOR gate only implies the XOR
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import signal
+import time
+from unittest import mock
+
+from flamapy.core.batch import BatchRunner, Job
+from flamapy.core.discover import DiscoverMetamodels
+
+
+EXECUTIONS = {"log": None}
+
+
+def fake_operation(self, operation_name, file, *args, timeout=None):
+    if EXECUTIONS["log"] is not None:
+        with open(EXECUTIONS["log"], "a") as log:
+            log.write(file + "\n")
+    if file == "crash":
+        time.sleep(0.3)
+        os._exit(1)
+    if file == "slow":
+        time.sleep(5)
+    if file == "stuck":
+        # Like native code that never returns to the interpreter: the alarm cannot fire.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(5)
+    if file == "bad":
+        raise ValueError("unreadable model")
+    return f"{operation_name}:{file}"
+
+
+def run(files, **kwargs):
+    # Forked workers inherit the patched method.
+    kwargs.setdefault("chunksize", 2)
+    runner = BatchRunner(max_workers=2, mp_context=multiprocessing.get_context("fork"), **kwargs)
+    with mock.patch.object(DiscoverMetamodels, "use_operation_from_file", fake_operation):
+        return list(runner.run([Job(file, "CoreFeatures") for file in files]))
+
+
+def test_results_are_streamed_in_job_order():
+    files = [f"model{i}" for i in range(7)]
+    results = run(files)
+    assert [result.result for result in results] == [f"CoreFeatures:{f}" for f in files]
+    assert all(result.ok for result in results)
+
+
+def test_failures_and_timeouts_do_not_abort_the_batch():
+    results = run(["a", "bad", "slow", "b"], timeout=0.2)
+    errors = {result.job.file: result.error for result in results}
+    assert errors["a"] is None and errors["b"] is None
+    assert errors["bad"] == "ValueError: unreadable model"
+    assert errors["slow"].startswith("Timed out")
+
+
+def test_a_crashing_worker_only_fails_its_job():
+    files = ["a", "b", "crash", "c", "d", "e"]
+    results = run(files)
+    assert [result.job.file for result in results] == files
+    assert [result.job.file for result in results if not result.ok] == ["crash"]
+    assert results[2].error == "The worker process crashed"
+
+
+def test_a_job_stuck_past_its_timeout_is_killed():
+    results = run(["a", "stuck", "b"], timeout=0.2, kill_grace=0.2)
+    assert [result.job.file for result in results if not result.ok] == ["stuck"]
+    assert results[1].error == "Timed out after 0.2s; the worker was killed"
+
+
+def test_a_crash_only_reruns_the_job_that_was_running(tmp_path):
+    EXECUTIONS["log"] = str(tmp_path / "executions")
+    try:
+        results = run(["a", "crash", "b", "c", "d", "e"], chunksize=3)
+    finally:
+        EXECUTIONS["log"] = None
+    assert [result.job.file for result in results if not result.ok] == ["crash"]
+    executions = (tmp_path / "executions").read_text().split()
+    assert sorted(executions) == ["a", "b", "c", "crash", "crash", "d", "e"]
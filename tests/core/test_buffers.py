@@ -0,0 +1,81 @@
+import itertools
+import pickle
+
+from flamapy.core import buffers
+from flamapy.core.buffers import ResultBuffer, collect
+from flamapy.core.operations import Configurations, Sampling
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+
+def configurations(count):
+    return [Configuration({f"F{i}": True, "root": True}) for i in range(count)]
+
+
+def test_items_stay_in_memory_within_the_budget():
+    buffer = ResultBuffer(configurations(3), memory_budget=10**9)
+    assert not buffer.spilled
+    assert buffer == configurations(3)
+
+
+def test_spilled_buffer_is_still_a_sequence(tmp_path):
+    items = configurations(200)
+    with ResultBuffer(memory_budget=2000, directory=str(tmp_path)) as buffer:
+        for item in items[:100]:
+            buffer.append(item)
+        assert buffer.spilled
+        buffer.extend(items[100:])  # appended to the file, read back through the map
+        assert len(buffer) == 200
+        assert buffer[0] == items[0] and buffer[-1] == items[-1]
+        assert buffer[10:13] == items[10:13]
+        assert list(buffer) == items
+        assert items[150] in buffer
+        assert buffer.get_stats()["disk_bytes"] > 0
+        assert pickle.loads(pickle.dumps(buffer)) == items  # travels as a plain list
+    assert len(buffer) == 0
+
+
+def test_collect_without_a_budget_is_a_list():
+    assert collect(iter([1, 2])) == [1, 2]
+    assert isinstance(collect(iter([1, 2]), memory_budget=1), ResultBuffer)
+
+
+class LazyConfigurations(Configurations):
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, model):
+        return self
+
+    def iter_configurations(self, limit=None, offset=0):
+        stop = None if limit is None else offset + limit
+        return itertools.islice(configurations(200), offset, stop)
+
+
+class LazySampling(Sampling):
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, model):
+        return self
+
+    def set_sample_size(self, sample_size):
+        pass
+
+    def set_with_replacement(self, with_replacement):
+        pass
+
+    def set_partial_configuration(self, partial_configuration):
+        pass
+
+    def iter_sample(self, limit=None, offset=0):
+        return LazyConfigurations().iter_configurations(limit, offset)
+
+
+def test_results_of_enumerating_operations_spill(monkeypatch, tmp_path):
+    monkeypatch.setattr(buffers, "RESULT_BUFFER_MAX_BYTES", 2000)
+    monkeypatch.setattr(buffers, "RESULT_BUFFER_DIR", str(tmp_path))
+    for operation in (LazyConfigurations(), LazySampling()):
+        result = operation.execute(None).get_result()
+        assert isinstance(result, ResultBuffer) and result.spilled
+        assert result == configurations(200)
+        result.close()
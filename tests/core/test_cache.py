@@ -0,0 +1,225 @@
+import dataclasses
+import os
+from importlib import import_module
+from unittest import mock
+
+from flamapy.core import discover
+from flamapy.core.cache import (
+    M2M_CACHE,
+    LRUCache,
+    ParseCache,
+    ResultCache,
+    approximate_size,
+    configure_m2m_cache,
+    configure_parse_cache,
+)
+from flamapy.core.discover import DiscoverMetamodels
+
+import three_plugins
+from three_plugins.plugin1.operations import Operation1
+from three_plugins.plugin1.variability_model import ExampleModel
+from three_plugins.plugin2.transformations import M2M as Ext1ToExt2
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+
+
+def test_lru_respects_memory_budget():
+    cache = LRUCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.put("a", "x" * 60)
+    cache.put("b", "x" * 30)
+    cache.put("c", "x" * 30)
+    assert "a" not in cache and len(cache) == 2
+    assert cache.current_bytes == 60
+
+    cache.put("huge", "x" * 101)
+    assert "huge" not in cache
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(max_entries=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+
+
+def test_approximate_size_follows_containers_and_attributes():
+    class Holder:
+        def __init__(self, payload):
+            self.payload = payload
+
+    payload = list(range(1000))
+    assert approximate_size(Holder(payload)) > approximate_size(payload) > approximate_size([])
+
+
+class TestTransformationCache:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins]
+        self.discover = DiscoverMetamodels()
+        configure_m2m_cache(max_entries=8)
+
+    def teardown_method(self, method):
+        configure_m2m_cache(max_entries=0)
+        M2M_CACHE.clear()
+
+    def test_repeated_operations_reuse_transformed_models(self):
+        model = ExampleModel()
+        with mock.patch.object(Ext1ToExt2, "transform", autospec=True,
+                               side_effect=lambda self: ExampleModel()) as transform:
+            self.discover.use_operation_from_vm("Operation2", model)
+            self.discover.use_operation_from_vm("Operation3", model)
+            self.discover.use_operation_from_vm("Operation2", ExampleModel())
+        assert transform.call_count == 2  # once per distinct source model
+        assert M2M_CACHE.get_stats()["hits"] >= 1
+
+
+class CountingParser:
+    calls = 0
+
+    def __init__(self, path):
+        self.path = path
+
+    def transform(self):
+        CountingParser.calls += 1
+        with open(self.path, encoding="utf-8") as file:
+            return file.read()
+
+
+class TestParseCache:
+    def setup_method(self, method):
+        CountingParser.calls = 0
+
+    def test_unchanged_files_are_parsed_once(self, tmp_path):
+        path = tmp_path / "model.txt"
+        path.write_text("A")
+        cache = ParseCache(max_entries=4)
+
+        assert cache.transform(CountingParser, str(path)) == "A"
+        assert cache.transform(CountingParser, str(path)) == "A"
+        assert CountingParser.calls == 1
+
+        path.write_text("AB")  # different size invalidates the entry
+        assert cache.transform(CountingParser, str(path)) == "AB"
+        assert CountingParser.calls == 2
+
+    def test_content_hash_catches_rewrites_with_same_stamp(self, tmp_path):
+        path = tmp_path / "model.txt"
+        path.write_text("A")
+        stat = os.stat(path)
+        cache = ParseCache(max_entries=4, verify_content=True)
+        cache.transform(CountingParser, str(path))
+
+        path.write_text("B")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert cache.transform(CountingParser, str(path)) == "B"
+        assert CountingParser.calls == 2
+
+    def test_invalidate_file_and_directories(self, tmp_path):
+        path = tmp_path / "model.txt"
+        path.write_text("A")
+        cache = ParseCache(max_entries=4)
+        cache.transform(CountingParser, str(path))
+        cache.invalidate_file(str(path))
+        assert len(cache) == 0
+
+        cache.store(CountingParser, str(tmp_path), "directory")
+        assert len(cache) == 0
+
+
+def test_result_cache_expires_entries_and_keeps_falsy_results():
+    cache = ResultCache(max_entries=4, ttl=10)
+    key = ResultCache.key("model", "core_features", "pysat", {"b": [1], "a": {"x"}})
+    assert key == ResultCache.key("model", "core_features", "pysat", {"a": {"x"}, "b": [1]})
+    with mock.patch("flamapy.core.cache.time.monotonic", return_value=100.0):
+        cache.store(key, None)
+        assert cache.lookup(key) == (True, None)
+    with mock.patch("flamapy.core.cache.time.monotonic", return_value=110.0):
+        assert cache.lookup(key) == (False, None)
+    assert cache.get_stats()["expirations"] == 1
+
+
+class TestDiscoverResultCache:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins]
+        self.discover = DiscoverMetamodels(result_cache=ResultCache(max_entries=8))
+
+    def test_repeated_analyses_of_a_file_are_served_from_the_cache(self, tmp_path):
+        model = tmp_path / "model.xml"
+        model.write_text("<model/>")
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=lambda self, model: self) as execute:
+            self.discover.use_operation_from_file("Operation1", str(model))
+            self.discover.use_operation_from_file("Satisfiable", str(model))
+            assert execute.call_count == 1
+
+            model.write_text("<model></model>")
+            self.discover.use_operation_from_file("Operation1", str(model))
+            assert execute.call_count == 2
+
+    def test_non_deterministic_operations_are_not_cached(self):
+        facade = dataclasses.replace(Operation1.facade, cacheable=False)
+        model = ExampleModel()
+        with mock.patch.object(Operation1, "facade", facade), \
+                mock.patch.object(Operation1, "execute", autospec=True,
+                                  side_effect=lambda self, model: self) as execute:
+            self.discover.use_operation_from_vm("Operation1", model)
+            self.discover.use_operation_from_vm("Operation1", model)
+        assert execute.call_count == 2
+
+    def test_operations_without_a_descriptor_can_opt_out(self):
+        model = ExampleModel()
+        with mock.patch.object(Operation1, "facade", None), \
+                mock.patch.object(Operation1, "cacheable", False), \
+                mock.patch.object(Operation1, "execute", autospec=True,
+                                  side_effect=lambda self, model: self) as execute:
+            self.discover.use_operation_from_vm("Operation1", model)
+            self.discover.use_operation_from_vm("Operation1", model)
+        assert execute.call_count == 2
+
+
+class TestSharedParsedConfigurations:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins, import_module("flamapy.metamodels")]
+        self.discover = DiscoverMetamodels(result_cache=ResultCache(max_entries=8))
+        configure_parse_cache(max_entries=8)
+
+    def teardown_method(self, method):
+        configure_parse_cache(max_entries=0)
+
+    def test_is_full_is_not_written_to_the_cached_configuration(self, tmp_path):
+        model = tmp_path / "model.xml"
+        model.write_text("<model/>")
+        configuration = tmp_path / "selection.csvconf"
+        configuration.write_text("A,True\n")
+        received = []
+
+        def set_configuration(self, value):
+            received.append(value)
+
+        def execute(self, model):
+            self.full = received[-1].is_full
+            return self
+
+        with mock.patch.object(Operation1, "set_configuration", set_configuration, create=True), \
+                mock.patch.object(Operation1, "execute", execute), \
+                mock.patch.object(Operation1, "get_result", lambda self: self.full):
+            full = self.discover.use_operation_from_file(
+                "Operation1", str(model), configuration_file=str(configuration), is_full=True)
+            partial = self.discover.use_operation_from_file(
+                "Operation1", str(model), configuration_file=str(configuration), is_full=False)
+        assert (full, partial) == (True, False)
+        assert received[0].is_full and not received[1].is_full
+        assert received[0].elements == received[1].elements == {"A": True}
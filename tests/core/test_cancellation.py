@@ -0,0 +1,64 @@
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from flamapy.core import discover
+from flamapy.core.cancellation import CancellationToken, call_with_hard_timeout
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.exceptions import OperationCancelled, OperationTimeout
+
+import three_plugins
+from three_plugins.plugin1.operations import Operation1
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+def polling_execute(self, model):
+    while True:
+        self.check_cancelled()
+        time.sleep(0.01)
+
+
+def test_token_expires_and_can_be_cancelled():
+    token = CancellationToken(0.05)
+    token.check()
+    assert not token.expired and token.remaining() > 0
+    time.sleep(0.06)
+    with pytest.raises(OperationTimeout):
+        token.check()
+
+    token = CancellationToken()
+    assert token.remaining() is None
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        token.check()
+
+
+def test_operation_check_cancelled():
+    operation = Operation1()
+    operation.check_cancelled()  # no token: no limit
+    operation.set_timeout(0.0)
+    with pytest.raises(OperationTimeout):
+        operation.check_cancelled()
+
+
+@mock.patch.object(discover, "filter_modules_from_plugin_paths")
+def test_use_operation_timeout_is_cooperative(mocker):
+    mocker.return_value = [three_plugins]
+    dm = DiscoverMetamodels()
+    with mock.patch.object(Operation1, "execute", polling_execute):
+        start = time.monotonic()
+        with pytest.raises(OperationTimeout):
+            dm.use_operation_from_vm("Operation1", ExampleModel(), timeout=0.1)
+        assert time.monotonic() - start < 2
+
+
+def test_hard_timeout_kills_code_that_does_not_poll():
+    assert call_with_hard_timeout(os.getpid, timeout=1) != os.getpid()
+    start = time.monotonic()
+    with pytest.raises(OperationTimeout):
+        call_with_hard_timeout(time.sleep, 10, timeout=0.1, grace=0.1)
+    assert time.monotonic() - start < 5
+    with pytest.raises(ValueError):
+        call_with_hard_timeout(int, "x", timeout=1)
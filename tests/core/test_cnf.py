@@ -0,0 +1,133 @@
+import itertools
+
+import pytest
+
+from flamapy.core.exceptions import FlamaException
+from flamapy.core.models.ast import AST, ASTOperation, Node, TSEYTIN_AUX_PREFIX, tseytin_cnf
+from flamapy.core.models.cnf import CNFBuilder, IntCNF, VariableMap, int_cnf
+
+
+def _constraints() -> list[AST]:
+    return [
+        AST(Node(ASTOperation.IMPLIES, Node('A'), Node(ASTOperation.OR, Node('B'), Node('C')))),
+        AST(Node(ASTOperation.EQUIVALENCE, Node('B'), Node(ASTOperation.NOT, Node('A')))),
+        AST(Node(ASTOperation.XOR, Node(ASTOperation.AND, Node('A'), Node('C')), Node('D'))),
+    ]
+
+
+def _satisfied(clauses: list[list[int]], assignment: dict[int, bool]) -> bool:
+    return all(any(assignment[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+
+def test_distributive_int_cnf_matches_named_clauses() -> None:
+    cnf = IntCNF()
+    expected = []
+    for ast in _constraints():
+        int_cnf(ast, cnf=cnf)
+        expected.extend(ast.get_clauses())
+    assert cnf.to_names() == expected
+    assert cnf.variables.names() == {'A': 1, 'B': 2, 'C': 3, 'D': 4}
+    assert cnf.to_lists()[0] == [-1, 2, 3]
+    assert len(cnf.literals) == cnf.offsets[-1] == sum(len(clause) for clause in expected)
+
+
+def test_tseytin_int_cnf_allocates_numbered_auxiliaries() -> None:
+    ast = _constraints()[2]
+    cnf = int_cnf(ast, method='tseytin', variables=VariableMap(['A', 'B', 'C', 'D']))
+    named, aux_names = tseytin_cnf(ast)
+    aux_ids = cnf.variables.aux_ids()
+    assert len(aux_ids) == len(aux_names)
+    renamed = {name: f"{TSEYTIN_AUX_PREFIX}{var}" for name, var in zip(aux_names, aux_ids)}
+
+    def rename(literal: str) -> str:
+        if literal.startswith('-'):
+            return '-' + renamed.get(literal[1:], literal[1:])
+        return renamed.get(literal, literal)
+
+    assert cnf.to_names() == [[rename(literal) for literal in clause] for clause in named]
+    assert all(cnf.variables.name_of(var) is None for var in aux_ids)
+
+
+def test_tseytin_int_cnf_preserves_models() -> None:
+    ast = _constraints()[1]
+    cnf = int_cnf(ast, method='tseytin')
+    features = [cnf.variables.id_of(name) for name in ('A', 'B')]
+    aux = cnf.variables.aux_ids()
+    for bits in itertools.product([True, False], repeat=len(features)):
+        extensions = sum(
+            _satisfied(cnf.to_lists(), {**dict(zip(features, bits)), **dict(zip(aux, aux_bits))})
+            for aux_bits in itertools.product([True, False], repeat=len(aux))
+        )
+        assert extensions == (1 if bits[0] != bits[1] else 0)
+
+
+def test_dimacs_and_clause_access() -> None:
+    cnf = int_cnf(_constraints()[0])
+    assert cnf.to_dimacs() == "p cnf 3 1\n-1 2 3 0\n"
+    assert cnf.clause(-1).tolist() == [-1, 2, 3]
+    assert cnf.variables.literal('-C') == -3
+    with pytest.raises(IndexError):
+        cnf.clause(1)
+
+
+def test_non_propositional_formulas_are_rejected() -> None:
+    ast = AST(Node(ASTOperation.AND, Node('A'), Node(ASTOperation.GREATER, Node('B'), Node(3))))
+    with pytest.raises(FlamaException):
+        int_cnf(ast)
+    with pytest.raises(FlamaException):
+        int_cnf(ast, method='tseytin')
+
+
+def test_builder_shares_gates_across_constraints() -> None:
+    shared = Node(ASTOperation.OR, Node('B'), Node('C'))
+    constraints = [
+        AST(Node(ASTOperation.IMPLIES, Node('A'), shared)),
+        AST(Node(ASTOperation.AND, Node('D'), Node(ASTOperation.OR, Node('B'), Node('C')))),
+        AST(Node(ASTOperation.NOT, shared)),
+    ]
+    builder = CNFBuilder()
+    assert builder.add_all(constraints) == [0, 1, 2]
+    # Gates: B v C once, A => (B v C), D ∧ (B v C); the negation needs no gate.
+    assert builder.get_stats()["gates"] == 3
+    assert len(builder.variables.aux_ids()) == 3
+    separate = sum(len(int_cnf(ast, method='tseytin')) for ast in constraints)
+    assert len(builder.cnf) < separate
+    assert builder.cnf.clause(-1).tolist() == [-builder.cnf.clause(0)[0]]
+    # The last constraint only negates the shared gate, whose definition comes first.
+    assert builder.gate_clauses_of(2) == [0, 1, 2]
+    assert builder.clauses_of(2) == [0, 1, 2, len(builder.cnf) - 1]
+    for constraint, ast in enumerate(constraints):
+        clauses = builder.clauses_of(constraint)
+        assert len(clauses) == len(int_cnf(ast, method='tseytin'))
+        assert builder.constraint_of(clauses[-1]) == constraint
+        assert all(builder.constraint_of(clause) is None for clause in clauses[:-1])
+
+
+def test_builder_rolls_back_rejected_constraints() -> None:
+    builder = CNFBuilder()
+    builder.add(_constraints()[0], label="first")
+    clauses, variables = builder.cnf.to_lists(), builder.variables.names()
+    bad = Node(ASTOperation.AND, Node(ASTOperation.OR, Node('E'), Node('F')),
+               Node(ASTOperation.GREATER, Node('G'), Node(3)))
+    with pytest.raises(FlamaException):
+        builder.add(AST(bad), label="bad")
+    assert builder.cnf.to_lists() == clauses
+    assert builder.variables.names() == variables and 'E' not in builder.variables
+    assert len(builder.variables) == len(variables) + 2  # the gates of the first constraint
+    assert builder.labels == ["first"]
+    builder.add(AST(Node(ASTOperation.OR, Node('E'), Node('F'))), label="second")
+    assert builder.labels == ["first", "second"]
+    assert builder.variables.get('E') == len(variables) + 3
+    assert len(builder.clauses_of(1)) == 4
+
+
+def test_builder_plaisted_greenbaum_mode() -> None:
+    builder = CNFBuilder(method='plaisted_greenbaum')
+    builder.add_all(_constraints())
+    full = CNFBuilder()
+    full.add_all(_constraints())
+    assert len(builder.cnf) < len(full.cnf)
+    assert builder.cnf.to_names()[:2] == int_cnf(
+        _constraints()[0], method='plaisted_greenbaum').to_names()[:2]
+    with pytest.raises(ValueError):
+        CNFBuilder(method='distributive')
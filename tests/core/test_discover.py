@@ -118,3 +118,107 @@ class TestDiscoverUseOperationFromFile(TestCase):
         filename = tempfile.NamedTemporaryFile(suffix=".xml2").name
         with raises(NotImplementedError):
             self.discover.use_operation_from_file("Operation1", filename)
+
+
+class TestDiscoverManifest:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def test_warm_start_reads_manifest(self, mocker, tmp_path):
+        mocker.return_value = [two_plugins]
+        manifest_path = str(tmp_path / "manifest.json")
+        cold = DiscoverMetamodels(manifest_path=manifest_path)
+
+        with mock.patch.object(DiscoverMetamodels, "discover_from_modules") as walk:
+            warm = DiscoverMetamodels(manifest_path=manifest_path)
+            walk.assert_not_called()
+        assert warm.plugins.get_stats() == cold.plugins.get_stats()
+        assert warm.get_name_operations() == cold.get_name_operations()
+
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def test_manifest_is_rebuilt_when_signature_changes(self, mocker, tmp_path):
+        mocker.return_value = [one_plugin]
+        manifest_path = str(tmp_path / "manifest.json")
+        DiscoverMetamodels(manifest_path=manifest_path)
+
+        with mock.patch.object(discover.manifest, "plugin_signature", return_value="changed"):
+            search = DiscoverMetamodels(manifest_path=manifest_path)
+        assert search.plugins.get_stats().get("amount_plugins") == 1
+        assert '"signature": "changed"' in (tmp_path / "manifest.json").read_text()
+
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def test_stale_manifest_entry_falls_back_to_walk(self, mocker, tmp_path):
+        mocker.return_value = [one_plugin]
+        manifest_path = tmp_path / "manifest.json"
+        DiscoverMetamodels(manifest_path=str(manifest_path))
+        manifest_path.write_text(manifest_path.read_text().replace('"one_plugin.plugin1"', '"one_plugin.removed"'))
+
+        search = DiscoverMetamodels(manifest_path=str(manifest_path))
+        assert search.get_name_operations() == ["Operation1", "Operation"]
+
+
+class TestDiscoverLazyLoading:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def test_entries_from_manifest_load_on_first_use(self, mocker, tmp_path):
+        mocker.return_value = [one_plugin]
+        manifest_path = str(tmp_path / "manifest.json")
+        DiscoverMetamodels(manifest_path=manifest_path)
+        search = DiscoverMetamodels(manifest_path=manifest_path)
+
+        plugin = search.plugins.get_plugin_by_name("plugin1")
+        assert not any(entry.loaded for entry in plugin.get_entries())
+        assert search.get_import_stats()["loaded_modules"] == 0
+
+        model = search.use_transformation_t2m(src="file.ext", dst="ext")
+        operation = search.use_operation(src=model, operation_name="Operation1")
+
+        assert operation.get_result() == "123456"
+        assert all(entry.loaded for entry in plugin.operations)
+        assert not any(t.loaded for t in plugin.transformations if t.kind != "t2m")
+        stats = search.get_import_stats()
+        assert stats["loaded_modules"] == 2  # operations and transformations
+        assert stats["pending_modules"] == 1  # the variability model class was never needed
+
+
+class TestDiscoverEntryPoints:
+    @mock.patch.object(discover, "filter_plugins_from_entry_points")
+    def test_declared_plugin_is_not_walked(self, mocker):
+        from flamapy.metamodels.configuration_metamodel.plugin import PLUGIN
+
+        mocker.return_value = [PLUGIN]
+        with mock.patch.object(DiscoverMetamodels, "discover_plugin") as walk:
+            search = DiscoverMetamodels()
+            walk.assert_not_called()
+        assert search.get_plugins() == ["configuration_metamodel"]
+        configuration = search.plugins.get_plugin_by_extension("configuration")
+        assert configuration.get_stats().get("amount_transformations") == 6
+
+    @mock.patch.object(discover, "filter_plugins_from_entry_points")
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def test_plugin_package_entry_point_is_walked(self, modules, registered):
+        import one_plugin.plugin1
+
+        modules.return_value = []
+        registered.return_value = [one_plugin.plugin1]
+        search = DiscoverMetamodels()
+        assert search.get_plugins() == ["plugin1"]
+        assert search.get_name_operations() == ["Operation1", "Operation"]
+
+    def test_configuration_declaration_matches_its_package(self):
+        from flamapy.core import manifest
+        from flamapy.metamodels.configuration_metamodel.plugin import PLUGIN
+
+        def without_import_times(description):
+            if isinstance(description, dict):
+                return {
+                    key: without_import_times(value)
+                    for key, value in description.items()
+                    if key != "import_time"
+                }
+            if isinstance(description, list):
+                return sorted((without_import_times(value) for value in description), key=repr)
+            return description
+
+        walked = {plugin.name: plugin for plugin in DiscoverMetamodels().discover_from_modules()}
+        declared = manifest.load_plugin(PLUGIN)
+        assert without_import_times(manifest.describe_plugin(declared)) == without_import_times(
+            manifest.describe_plugin(walked[PLUGIN["name"]])
+        )
@@ -0,0 +1,33 @@
+import copy
+
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+def test_default_fingerprint_is_memoised_per_instance():
+    model = ExampleModel()
+    assert model.fingerprint() == model.fingerprint()
+    assert model.fingerprint() != ExampleModel().fingerprint()
+    assert copy.copy(model).fingerprint() != model.fingerprint()
+
+
+def test_configuration_fingerprint_ignores_element_order():
+    first = Configuration({"A": True, "B": False, "C": {"x": 1, "y": [1, 2]}})
+    second = Configuration({"C": {"y": [1, 2], "x": 1}, "B": False, "A": True})
+    second.set_provenance("A", "user")
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint() != Configuration({"A": True, "B": True}).fingerprint()
+
+
+def test_configuration_fingerprint_follows_changes():
+    configuration = Configuration({"A": True})
+    partial = configuration.fingerprint()
+    configuration.set_full(True)
+    assert configuration.fingerprint() != partial
+
+    full = configuration.fingerprint()
+    configuration.elements["B"] = True
+    assert configuration.fingerprint() != full
+    del configuration.elements["B"]
+    assert configuration.fingerprint() == full
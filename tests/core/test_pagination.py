@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from flamapy.core.exceptions import InvalidCursor
+from flamapy.core.operations import Configurations, Page, Sampling
+from flamapy.core.operations.pagination import decode_cursor, encode_cursor
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+from test_streaming import EndlessConfigurations, ListFilter
+
+
+def browse(operation_class, page_size):
+    pages, cursor = [], None
+    while True:
+        operation = operation_class()
+        operation.set_cursor(cursor)
+        page = operation.execute(None).get_page(page_size)
+        pages.append(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+class SeededSampling(Sampling):
+    def __init__(self) -> None:
+        self.size = 0
+
+    def execute(self, model):
+        return self
+
+    def set_sample_size(self, sample_size):
+        self.size = sample_size
+
+    def set_with_replacement(self, with_replacement):
+        pass
+
+    def set_partial_configuration(self, partial_configuration):
+        pass
+
+    def get_sample(self):
+        return random.Random(self.seed).sample(range(100), self.size)
+
+
+class TenConfigurations(Configurations):
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, model):
+        return self
+
+    def iter_configurations(self, limit=None, offset=0):
+        stop = 10 if limit is None else min(10, offset + limit)
+        return (Configuration({f"F{i}": True}) for i in range(offset, stop))
+
+
+def run_facade(operation_class, **values):
+    """Run an operation as the facade does: call each input's setter, execute, get_result."""
+    operation = operation_class()
+    for spec in operation.facade.inputs:
+        getattr(operation, spec.setter)(values.get(spec.name, spec.default))
+    return operation.execute(None).get_result()
+
+
+def test_pages_resume_from_their_cursor():
+    assert browse(ListFilter, 3) == [["a", "b", "c"], ["d"]]
+    assert browse(ListFilter, 4) == [["a", "b", "c", "d"]]
+
+
+def test_lazy_enumerations_are_paged_without_materialising():
+    operation = EndlessConfigurations()
+    operation.set_page_size(2)
+    page = operation.get_page()
+    assert [str(configuration) for configuration in page.items] == ["F0", "F1"]
+    resumed = EndlessConfigurations()
+    resumed.set_cursor(page.next_cursor)
+    assert [str(configuration) for configuration in resumed.get_page(1).items] == ["F2"]
+
+
+def test_cursors_are_opaque_and_checked():
+    cursor = encode_cursor("Filter", {"offset": 3})
+    assert decode_cursor("Filter", cursor) == {"offset": 3}
+    with pytest.raises(InvalidCursor):
+        decode_cursor("Configurations", cursor)  # replayed on another operation
+    with pytest.raises(InvalidCursor):
+        ListFilter().set_cursor("not a cursor")
+    assert Page() == Page([], None)
+
+
+def test_sample_pages_are_drawn_from_the_seed_in_the_cursor():
+    pages, cursor = [], None
+    while True:
+        operation = SeededSampling()
+        operation.set_sample_size(5)
+        operation.set_cursor(cursor)
+        page = operation.execute(None).get_page(2)
+        pages.append(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    sample = SeededSampling()
+    sample.set_sample_size(5)
+    sample.set_seed(operation.seed)
+    assert [item for page in pages for item in page] == sample.get_sample()
+    with pytest.raises(InvalidCursor):
+        SeededSampling().set_cursor(encode_cursor("Sampling", {"offset": 2}))
+
+
+def test_facade_inputs_page_the_result():
+    assert len(run_facade(TenConfigurations)) == 10
+    first = run_facade(TenConfigurations, page_size=3)
+    assert [str(configuration) for configuration in first.items] == ["F0", "F1", "F2"]
+    second = run_facade(TenConfigurations, page_size=3, cursor=first.next_cursor)
+    assert [str(configuration) for configuration in second.items] == ["F3", "F4", "F5"]
+
+    items, cursors = [], [None]
+    while True:
+        page = run_facade(SeededSampling, size=5, page_size=2, cursor=cursors[-1])
+        assert len(page.items) <= 2
+        items.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursors.append(page.next_cursor)
+    seed = decode_cursor("Sampling", cursors[1])["seed"]
+    assert items == run_facade(SeededSampling, size=5, seed=seed)
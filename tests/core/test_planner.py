@@ -0,0 +1,67 @@
+from unittest import mock
+
+from pytest import raises
+
+from flamapy.core import discover
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.lazy import LazyTransformation
+from flamapy.core.planner import TransformationPlanner
+
+import three_plugins
+
+
+def _m2m(source, destination, cost=1.0):
+    return LazyTransformation("m2m", f"{source}_to_{destination}", "m2m", source, destination,
+                              cost=cost)
+
+
+def _extensions(route):
+    return [(step.source, step.destination) for step in route]
+
+
+def test_finds_chain_a_greedy_backward_search_misses():
+    planner = TransformationPlanner([_m2m("y", "t"), _m2m("a", "x"), _m2m("x", "t")])
+    assert _extensions(planner.plan("a", {"t"})) == [("a", "x"), ("x", "t")]
+
+
+def test_prefers_the_cheapest_route_and_the_closest_target():
+    planner = TransformationPlanner(
+        [_m2m("a", "t", cost=10.0), _m2m("a", "b"), _m2m("b", "t"), _m2m("b", "u", cost=0.5)]
+    )
+    assert _extensions(planner.plan("a", {"t"})) == [("a", "b"), ("b", "t")]
+    assert _extensions(planner.plan("a", {"t", "u"})) == [("a", "b"), ("b", "u")]
+    assert planner.plan("a", {"a"}) == []
+    assert planner.plan("t", {"a"}) is None
+
+
+def test_measured_costs_override_declared_costs():
+    planner = TransformationPlanner([_m2m("a", "t", cost=10.0), _m2m("a", "b"), _m2m("b", "t")])
+    assert planner.record_cost("a", "t", 0.01) is True
+    assert planner.record_cost("a", "t", 0.02) is False
+    planner.record_cost("a", "b", 0.02)
+    planner.record_cost("b", "t", 0.02)
+    assert _extensions(planner.plan("a", {"t"})) == [("a", "t")]
+
+
+def test_declared_costs_are_scaled_to_seconds():
+    planner = TransformationPlanner([_m2m("a", "t", cost=10.0), _m2m("a", "b"), _m2m("b", "t")])
+    planner.record_cost("a", "t", 0.01)
+    # 0.01s for 10 declared units: each unmeasured hop is estimated at 0.001s.
+    assert planner.seconds_per_cost_unit() == 0.001
+    assert _extensions(planner.plan("a", {"t"})) == [("a", "b"), ("b", "t")]
+
+
+class TestDiscoverPlanning:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins]
+        self.discover = DiscoverMetamodels()
+
+    def test_plan_route_is_exposed_and_cached(self):
+        assert self.discover.plan_route("Operation3", "ext1") == [("ext1", "ext2"), ("ext2", "ext3")]
+        assert self.discover.plan_route("Operation1", "ext1") == []
+        assert ("ext1", "Operation3") in self.discover.plugins.get_index().routes
+
+    def test_unreachable_operation(self):
+        with raises(NotImplementedError):
+            self.discover.plan_route("Operation1", "ext3")
@@ -0,0 +1,113 @@
+from types import ModuleType
+
+from pytest import raises
+
+from flamapy.core.exceptions import OperationNotFound, PluginNotFound
+from flamapy.core.models import VariabilityModel
+from flamapy.core.operations import Operation, Satisfiable
+from flamapy.core.plugins import Plugin, Plugins
+from flamapy.core.transformations import TextToModel
+
+
+class _Model(VariabilityModel):
+    @staticmethod
+    def get_extension() -> str:
+        return "mdl"
+
+
+class _SubModel(_Model):
+    pass
+
+
+class _Sat(Satisfiable):
+    def __init__(self):
+        pass
+
+    def execute(self, model):
+        return self
+
+    def is_satisfiable(self):
+        return True
+
+    def get_result(self):
+        return True
+
+
+class _Other(Operation):
+    def execute(self, model):
+        return self
+
+    def get_result(self):
+        return None
+
+
+def _reader(extension):
+    class _Reader(TextToModel):
+        @staticmethod
+        def get_source_extension() -> str:
+            return extension
+
+        def __init__(self, path):
+            pass
+
+        def transform(self):
+            return _Model()
+
+    return _Reader
+
+
+def _plugin(name, model=None, operations=(), transformations=()):
+    plugin = Plugin(module=ModuleType(f"flamapy.metamodels.{name}"))
+    if model is not None:
+        plugin.variability_model = model
+    for operation in operations:
+        plugin.append_operation(operation)
+    for transformation in transformations:
+        plugin.append_transformations(transformation)
+    return plugin
+
+
+def test_lookups_by_name_extension_and_model():
+    plugins = Plugins([_plugin("first", _Model, [_Sat]), _plugin("second", None, [_Other])])
+
+    assert plugins.get_plugin_by_name("second").name == "second"
+    assert plugins.get_plugin_by_extension("mdl").name == "first"
+    assert plugins.get_plugin_by_variability_model(_SubModel()).name == "first"
+    with raises(PluginNotFound):
+        plugins.get_plugin_by_extension("unknown")
+    with raises(PluginNotFound):
+        plugins.get_plugin_by_variability_model(object())
+
+
+def test_operations_are_indexed_by_class_and_interface_name():
+    plugins = Plugins([_plugin("first", _Model, [_Sat]), _plugin("second", None, [_Other])])
+
+    assert [p.name for p in plugins.get_plugins_with_operation("Satisfiable")] == ["first"]
+    assert plugins.has_operation("_Other")
+    assert not plugins.has_operation("Unknown")
+    assert plugins.get_plugin_by_name("first").operations.search_by_name("Satisfiable").load() is _Sat
+    with raises(OperationNotFound):
+        plugins.get_plugin_by_name("second").operations.search_by_name("Satisfiable")
+
+
+def test_index_is_rebuilt_when_the_registry_changes():
+    plugins = Plugins([_plugin("first", _Model)])
+    assert not plugins.has_operation("_Other")
+
+    plugins.append(_plugin("second", None, [_Other]))
+    assert plugins.has_operation("_Other")
+
+    del plugins[1]
+    assert not plugins.has_operation("_Other")
+
+
+def test_t2m_lookup_prefers_most_specific_extension():
+    json_reader, uvl_json_reader = _reader("json"), _reader("uvl.json")
+    plugins = Plugins([_plugin("first", _Model, transformations=[json_reader, uvl_json_reader])])
+
+    assert [t.load() for t in plugins.get_t2m_transformations("dir/conf.uvl.json")] == [
+        uvl_json_reader,
+        json_reader,
+    ]
+    assert [t.load() for t in plugins.get_t2m_transformations("conf.json")] == [json_reader]
+    assert plugins.get_t2m_transformations("conf.xml") == []
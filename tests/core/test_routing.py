@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import pytest
+
+from flamapy.core import batch, discover
+from flamapy.core.batch import Job
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.routing import AffinityPool, HashRing
+
+import three_plugins
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+def forked_worker():
+    return ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+
+
+def crash():
+    os._exit(1)
+
+
+def slow_pid():
+    time.sleep(0.2)
+    return os.getpid()
+
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(range(4))
+    keys = [f"path:/models/{i}.uvl" for i in range(200)]
+    before = {key: ring.owner(key) for key in keys}
+    assert len(set(before.values())) == 4
+    ring.remove(2)
+    after = {key: ring.owner(key) for key in keys}
+    assert all(after[key] == owner for key, owner in before.items() if owner != 2)
+    assert 2 not in after.values()
+
+
+def test_requests_for_a_model_reach_the_same_worker():
+    with AffinityPool(3, executor_factory=forked_worker) as pool:
+        model = ExampleModel()
+        pids = {pool.submit("a.uvl", os.getpid).result() for _ in range(5)}
+        assert len(pids) == 1
+        assert {pool.submit(model, os.getpid).result() for _ in range(3)} == {
+            pool.submit(model, os.getpid).result()
+        }
+        assert pool.worker_of("a.uvl") == pool.worker_of(os.path.abspath("a.uvl"))
+
+
+def test_overloaded_workers_are_bypassed():
+    with AffinityPool(2, max_pending=1, executor_factory=forked_worker) as pool:
+        futures = [pool.submit("a.uvl", slow_pid) for _ in range(2)]
+        assert len({future.result() for future in futures}) == 2
+        assert pool.get_stats()["fallbacks"] == 1
+
+
+def test_dead_workers_are_restarted_in_place():
+    with AffinityPool(2, executor_factory=forked_worker) as pool:
+        worker = pool.worker_of("a.uvl")
+        before = pool.submit("a.uvl", os.getpid).result()
+        with pytest.raises(BrokenProcessPool):
+            pool.submit("a.uvl", crash).result()
+        after = pool.submit("a.uvl", os.getpid).result()
+        assert after != before and pool.worker_of("a.uvl") == worker
+        assert pool.get_stats()["replaced"] == 1
+
+
+def hanging_operation(self, operation_name, file, *args, timeout=None):
+    if operation_name == "hang":
+        # Like native code that never returns to the interpreter: the alarm cannot fire.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(5)
+    return os.getpid()
+
+
+@mock.patch.object(discover, "filter_modules_from_plugin_paths")
+def test_a_hanging_job_does_not_pin_its_worker(modules):
+    modules.return_value = [three_plugins]
+    with mock.patch.dict(batch._WORKER, {"discover": DiscoverMetamodels()}), \
+            mock.patch.object(DiscoverMetamodels, "use_operation_from_file", hanging_operation):
+        with AffinityPool(2, executor_factory=forked_worker, kill_grace=0.2) as pool:
+            worker = pool.worker_of("a.uvl")
+            started = time.perf_counter()
+            with pytest.raises(BrokenProcessPool):
+                pool.submit_job(Job("a.uvl", "hang"), timeout=0.2).result()
+            assert time.perf_counter() - started < 3
+            [result] = pool.submit_job(Job("a.uvl", "Operation1"), timeout=0.2).result()
+            assert result.ok and pool.worker_of("a.uvl") == worker
+            assert pool.get_stats()["replaced"] == 1
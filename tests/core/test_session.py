@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+
+from flamapy.core import discover
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.exceptions import ConfigurationNotFound
+from flamapy.core.session import AnalysisSession
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+import three_plugins
+from three_plugins.plugin1.operations import Operation1
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+class TestAnalysisSession:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def setup_method(self, method, mocker):
+        mocker.return_value = [three_plugins]
+        self.discover = DiscoverMetamodels()
+
+    def test_representations_are_built_once_and_reused(self):
+        with AnalysisSession(ExampleModel(), self.discover) as session:
+            session.run("Operation3")
+            session.run("Operation2")
+            session.run("Operation3")
+            assert session.get_stats()["built"] == 2  # ext1 -> ext2 -> ext3
+            assert session.warm_extensions() == ["ext2", "ext3"]
+
+            session.release("ext3")
+            session.run("Operation3")  # only ext2 -> ext3 again
+            assert session.get_stats()["built"] == 3
+
+            timings = session.get_timings()
+            assert set(timings["transformation"]) == {"ext1->ext2", "ext2->ext3"}
+            assert set(timings["operation"]) == {"Operation2", "Operation3"}
+        assert session.warm_extensions() == []
+
+    def test_memory_budget_releases_representations(self):
+        session = AnalysisSession(ExampleModel(), self.discover, memory_budget=1)
+        session.run("Operation2")
+        session.run("Operation2")
+        assert session.warm_extensions() == []
+        assert session.get_stats()["built"] == 2
+
+    def test_operations_with_a_configuration_require_one(self):
+        received = []
+        with mock.patch.object(Operation1, "set_configuration", create=True,
+                               side_effect=received.append):
+            session = AnalysisSession(ExampleModel(), self.discover)
+            with pytest.raises(ConfigurationNotFound):
+                session.run("Operation1")
+            configuration = Configuration({"A": True})
+            session.run("Operation1", configuration=configuration)
+        assert received == [configuration]
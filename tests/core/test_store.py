@@ -0,0 +1,97 @@
+import sqlite3
+from unittest import mock
+
+from flamapy.core import discover
+from flamapy.core.cache import ResultCache
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.store import SCHEMA, AnalysisStore, Measurement
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+import three_plugins
+from three_plugins.plugin1.operations import Operation1
+
+
+def test_store_records_and_queries_results(tmp_path):
+    with AnalysisStore(str(tmp_path / "results.db")) as store:
+        dead = ResultCache.key("fp1", "dead_features", "pysat", {"is_full": False})
+        none = ResultCache.key("fp2", "dead_features", "pysat", {"is_full": False})
+        store.record(dead, "a.uvl", ["B", "C"], Measurement(0.5))
+        store.record(none, "b.uvl", [], Measurement(0.1))
+        store.record(dead, "a.uvl", ["B"], Measurement(0.2))  # replaces the previous row
+
+        assert len(store) == 2
+        assert store.lookup(dead) == (True, ["B"])
+        assert store.lookup(ResultCache.key("fp3", "dead_features", "pysat")) == (False, None)
+        assert store.models_where("dead_features") == ["a.uvl"]
+        assert store.models_where("dead_features", non_empty=False) == ["b.uvl"]
+        assert [row.elapsed for row in store.query(model_path="a.uvl")] == [0.2]
+
+
+class TestDiscoverStore:
+    @mock.patch.object(discover, "filter_modules_from_plugin_paths")
+    def discover(self, store, mocker):
+        mocker.return_value = [three_plugins]
+        return DiscoverMetamodels(store=store)
+
+    def test_restarted_runs_skip_stored_analyses(self, tmp_path):
+        model = tmp_path / "model.xml"
+        model.write_text("<model/>")
+        path = str(tmp_path / "results.db")
+        with mock.patch.object(Operation1, "execute", autospec=True,
+                               side_effect=lambda self, model: self) as execute:
+            with AnalysisStore(path, track_memory=True) as store:
+                assert self.discover(store).use_operation_from_file("Operation1", str(model)) == ""
+            with AnalysisStore(path) as store:
+                assert self.discover(store).use_operation_from_file("Operation1", str(model)) == ""
+                [row] = store.query(operation="satisfiable")
+        assert execute.call_count == 1
+        assert row.model_path == str(model) and row.peak_memory is not None
+
+    def test_stored_hits_return_the_original_type(self, tmp_path):
+        model = tmp_path / "model.xml"
+        model.write_text("<model/>")
+        path = str(tmp_path / "results.db")
+        with mock.patch.object(Operation1, "get_result", return_value={"A", "B"}):
+            with AnalysisStore(path) as store:
+                computed = self.discover(store).use_operation_from_file("Operation1", str(model))
+            with AnalysisStore(path) as store:
+                discover_ = self.discover(store)
+                stored = discover_.use_operation_from_file("Operation1", str(model))
+                cached = discover_.use_operation_from_file("Operation1", str(model))
+        assert computed == stored == cached == {"A", "B"}
+        assert isinstance(stored, set) and isinstance(cached, set)
+
+
+def test_store_keeps_result_types(tmp_path):
+    configuration = Configuration({"A": True, "B": False})
+    result = ({"A", "B"}, ("C", 1), configuration)
+    key = ResultCache.key("fp1", "core_features", "pysat")
+    with AnalysisStore(str(tmp_path / "results.db")) as store:
+        store.record(key, "a.uvl", result, Measurement(0.1))
+    with AnalysisStore(str(tmp_path / "results.db")) as store:
+        found, stored = store.lookup(key)
+        [row] = store.query(operation="core_features")
+    assert found and stored == result
+    assert isinstance(stored[0], set) and isinstance(stored[1], tuple)
+    assert isinstance(stored[2], Configuration)
+    assert row.result == result
+
+
+def test_unpicklable_results_are_computed_again(tmp_path):
+    key = ResultCache.key("fp1", "dead_features", "pysat")
+    with AnalysisStore(str(tmp_path / "results.db")) as store:
+        store.record(key, "a.uvl", [lambda: None], Measurement(0.1))
+        assert store.lookup(key) == (False, None)
+        assert len(store.query(operation="dead_features")[0].result) == 1
+
+
+
+def test_stores_without_payloads_are_upgraded(tmp_path):
+    path = str(tmp_path / "results.db")
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA.replace("    payload BLOB,\n", ""))
+    key = ResultCache.key("fp1", "dead_features", "pysat")
+    with AnalysisStore(path) as store:
+        assert store.lookup(key) == (False, None)
+        store.record(key, "a.uvl", {"B"}, Measurement(0.1))
+        assert store.lookup(key) == (True, {"B"})
@@ -0,0 +1,77 @@
+import itertools
+from unittest import mock
+
+import pytest
+
+from flamapy.core import discover
+from flamapy.core.discover import DiscoverMetamodels, iter_result
+from flamapy.core.operations import Configurations, Filter
+from flamapy.metamodels.configuration_metamodel.models.configuration import Configuration
+
+import three_plugins
+from three_plugins.plugin1.variability_model import ExampleModel
+
+
+class EndlessConfigurations(Configurations):
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, model):
+        return self
+
+    def iter_configurations(self, limit=None, offset=0):
+        products = (Configuration({f"F{i}": True}) for i in itertools.count())
+        return itertools.islice(products, offset, None if limit is None else offset + limit)
+
+    def get_result(self):
+        return self.get_configurations()
+
+
+class ListFilter(Filter):
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, model):
+        return self
+
+    def set_configuration(self, configuration):
+        pass
+
+    def get_filter_products(self):
+        return ["a", "b", "c", "d"]
+
+    def get_result(self):
+        return self.get_filter_products()
+
+
+def test_configurations_stream_lazily():
+    configurations = EndlessConfigurations().iter_configurations(limit=2, offset=5)
+    assert [str(configuration) for configuration in configurations] == ["F5", "F6"]
+
+
+def test_materialising_implementations_are_sliced():
+    assert list(ListFilter().iter_filter_products(limit=2, offset=1)) == ["b", "c"]
+    assert list(iter_result(ListFilter(), offset=3)) == ["d"]
+
+
+def test_an_implementation_must_override_one_of_the_methods():
+    class Incomplete(Configurations):
+        def __init__(self) -> None:
+            pass
+
+        def execute(self, model):
+            return self
+
+        def get_result(self):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Incomplete().get_configurations()
+
+
+@mock.patch.object(discover, "filter_modules_from_plugin_paths")
+def test_stream_operation_of_a_single_result(mocker):
+    mocker.return_value = [three_plugins]
+    dm = DiscoverMetamodels()
+    assert list(dm.stream_operation("Operation1", ExampleModel())) == [""]
+    assert list(dm.stream_operation("Operation1", ExampleModel(), limit=0)) == []
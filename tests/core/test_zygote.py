@@ -0,0 +1,63 @@
+import gc
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import pytest
+
+from flamapy.core import batch, discover
+from flamapy.core.batch import Job
+from flamapy.core.discover import DiscoverMetamodels
+from flamapy.core.zygote import WarmWorkerPool
+
+import three_plugins
+
+
+def worker_state():
+    plugin = batch._WORKER["discover"].plugins.get_plugin_by_name("plugin1")
+    return os.getpid(), all(entry.loaded for entry in plugin.get_entries())
+
+
+@mock.patch.object(discover, "filter_modules_from_plugin_paths")
+def make_pool(mocker, **kwargs):
+    mocker.return_value = [three_plugins]
+    return WarmWorkerPool(max_workers=2, discover=DiscoverMetamodels(), **kwargs)
+
+
+def test_workers_inherit_the_warm_registry():
+    with make_pool(backends=["plugin1"]) as pool:
+        assert gc.get_freeze_count() > 0
+        pid, warm = pool.submit(worker_state).result()
+        assert pid != os.getpid() and warm
+    assert gc.get_freeze_count() == 0
+
+
+def test_pool_runs_jobs_and_batches(tmp_path):
+    model = tmp_path / "model.xml"
+    model.write_text("<model/>")
+    with make_pool(freeze=False) as pool:
+        [result] = pool.submit_job(Job(str(model), "Operation1")).result()
+        assert result.ok and result.result == ""
+        results = list(pool.run_batch([Job(str(model), "Operation1")] * 5, chunksize=2))
+        assert [result.ok for result in results] == [True] * 5
+
+
+def stuck_operation(self, operation_name, file, *args, timeout=None):
+    if file == "stuck":
+        # Like native code that never returns to the interpreter: the alarm cannot fire.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(5)
+    return file
+
+
+def test_submitted_jobs_are_killed_after_the_grace_period():
+    with mock.patch.object(DiscoverMetamodels, "use_operation_from_file", stuck_operation):
+        with make_pool(freeze=False) as pool:
+            started = time.perf_counter()
+            with pytest.raises(BrokenProcessPool):
+                pool.submit_job(Job("stuck", "Operation1"), timeout=0.2, kill_grace=0.2).result()
+            assert time.perf_counter() - started < 3
+            [result] = pool.submit_job(Job("model", "Operation1")).result()
+            assert result.result == "model"